@@ -0,0 +1,353 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import redis.asyncio as aioredis
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+class LocalCache:
+    """
+    Süreç içi sınırlı LRU + TTL önbellek (L1)
+    
+    Tek event loop'tan kullanılır, kilit gerektirmez. Kayıtlar TTL dolunca
+    okunurken düşer; kapasite aşılınca en uzun süredir kullanılmayan atılır.
+    """
+    
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+    
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+
+class CacheManager:
+    """
+    asyncio Redis istemcisi üzerinde iki katmanlı kullanıcı cache'i
+    
+    L1 süreç içi LRU/TTL önbellektir; sıcak kullanıcılar ağa çıkmadan döner.
+    L2 Redis'tir: bağlantılar sınırlı bir havuzdan alınır, havuz doluysa istek
+    REDIS_OPERATION_TIMEOUT kadar bekler. Her işlem aynı süreyle sınırlıdır,
+    Redis yavaşladığında ya da düştüğünde istekler beklemez, cache atlanır.
+    Çoklu anahtar işlemleri tek round trip'te (MGET / pipeline) yapılır.
+    
+    Bir kullanıcı güncellenip silindiğinde anahtar Redis pub/sub kanalına
+    yayınlanır ve tüm replikalar L1'den düşürür. Abonelik koparsa L1
+    temizlenir; kaçan mesajlar için L1_CACHE_TTL üst sınırdır.
+    
+    load_user cache'te olmayan bir anahtar için veritabanına tek bir yükleyici
+    gönderir (single-flight); aynı anahtarı isteyen diğer istekler onun
+    sonucunu bekler. USER_CACHE_REFRESH_AHEAD > 0 ise Redis'teki kaydın kalan
+    süresi bu değerin altına indiğinde eski değer dönülür ve kayıt arka planda
+    yenilenir (stale-while-revalidate).
+    """
+    
+    def __init__(self):
+        self.client = None
+        self.pool = None
+        self.redis_url = os.getenv("REDIS_URL", "redis://cache:6379")
+        self.max_connections = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+        self.operation_timeout = float(os.getenv("REDIS_OPERATION_TIMEOUT", "0.5"))
+        self.connect_timeout = float(os.getenv("REDIS_CONNECT_TIMEOUT", "2.0"))
+        self.user_ttl = int(os.getenv("USER_CACHE_TTL", "3600"))
+        self.refresh_ahead = float(os.getenv("USER_CACHE_REFRESH_AHEAD", "0"))
+        
+        # Anahtar başına süren veritabanı yüklemeleri: anahtar -> Task
+        self._inflight = {}
+        
+        # L1 ve replikalar arası geçersiz kılma
+        self.local = LocalCache(
+            max_size=int(os.getenv("L1_CACHE_SIZE", "10000")),
+            ttl=float(os.getenv("L1_CACHE_TTL", "30"))
+        )
+        self.invalidation_channel = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache:invalidate")
+        self.instance_id = uuid.uuid4().hex
+        self._listener = None
+        
+        # Katman başına istatistikler
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.invalidations_received = 0
+        self.coalesced = 0
+        self.refreshes = 0
+    
+    async def connect(self):
+        """Bağlantı havuzunu kur, Redis'e ping at ve geçersiz kılma kanalını dinle"""
+        try:
+            self.pool = aioredis.BlockingConnectionPool.from_url(
+                self.redis_url,
+                max_connections=self.max_connections,
+                timeout=self.operation_timeout,
+                socket_timeout=self.operation_timeout,
+                socket_connect_timeout=self.connect_timeout,
+                health_check_interval=30
+            )
+            self.client = aioredis.Redis(connection_pool=self.pool)
+            await asyncio.wait_for(self.client.ping(), self.connect_timeout)
+            logger.info("Redis connection established")
+        except Exception as e:
+            logger.warning(f"Redis connection failed: {e}")
+            await self.disconnect()
+            return
+        
+        if self.local.enabled:
+            self._listener = asyncio.create_task(self._listen_invalidations())
+    
+    async def disconnect(self):
+        """Dinleyiciyi durdur ve havuzdaki bağlantıları kapat"""
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self.local.clear()
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+        if self.pool:
+            await self.pool.disconnect()
+            self.pool = None
+    
+    async def _run(self, operation):
+        return await asyncio.wait_for(operation, self.operation_timeout)
+    
+    async def ping(self) -> bool:
+        """Redis erişilebilir mi"""
+        if not self.client:
+            return False
+        try:
+            return bool(await self._run(self.client.ping()))
+        except Exception:
+            return False
+    
+    @staticmethod
+    def user_key(user_id: int) -> str:
+        return f"user:{user_id}"
+    
+    async def get_user(self, user_id: int) -> Optional[User]:
+        """Kullanıcıyı önce L1'den, sonra Redis'ten getir (yoksa ya da hata olursa None)"""
+        user, _ = await self._lookup(user_id)
+        return user
+    
+    async def _lookup(self, user_id: int) -> Tuple[Optional[User], bool]:
+        """(kullanıcı, yenilenmeli mi) döndür; Redis kaydının kalan süresi refresh_ahead altındaysa yenilenmeli"""
+        if not self.client:
+            return None, False
+        key = self.user_key(user_id)
+        user = self.local.get(key)
+        if user is not None:
+            self.l1_hits += 1
+            return user, False
+        
+        try:
+            if self.refresh_ahead > 0:
+                async with self.client.pipeline(transaction=False) as pipe:
+                    pipe.get(key)
+                    pipe.ttl(key)
+                    cached, ttl = await self._run(pipe.execute())
+            else:
+                cached, ttl = await self._run(self.client.get(key)), None
+        except Exception as e:
+            logger.warning(f"Cache read failed for user {user_id}: {e}")
+            cached, ttl = None, None
+        if not cached:
+            self.misses += 1
+            return None, False
+        
+        self.l2_hits += 1
+        user = User.model_validate_json(cached)
+        self.local.put(key, user)
+        return user, ttl is not None and 0 <= ttl < self.refresh_ahead
+    
+    async def load_user(self, user_id: int, loader: Callable[[int], Awaitable[Optional[User]]]) -> Optional[User]:
+        """
+        Kullanıcıyı cache'ten getir, yoksa loader ile yükleyip cache'e yaz
+        
+        Aynı anahtar için aynı anda yalnızca bir loader çalışır.
+        """
+        key = self.user_key(user_id)
+        user, stale = await self._lookup(user_id)
+        if user is not None:
+            if stale and key not in self._inflight:
+                self.refreshes += 1
+                self._start_load(key, user_id, loader)
+            return user
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start_load(key, user_id, loader)
+        else:
+            self.coalesced += 1
+        # Bekleyen istek iptal edilse de yükleme diğerleri için sürsün
+        return await asyncio.shield(task)
+    
+    def _start_load(self, key: str, user_id: int, loader) -> asyncio.Task:
+        task = asyncio.create_task(self._load(key, user_id, loader))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._finish_load(key, done))
+        return task
+    
+    async def _load(self, key: str, user_id: int, loader) -> Optional[User]:
+        user = await loader(user_id)
+        # Yükleme sürerken kullanıcı güncellendi/silindiyse eski değeri cache'e yazma
+        if user is not None and self._inflight.get(key) is asyncio.current_task():
+            await self.set_user(user)
+        return user
+    
+    def _finish_load(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Loading {key} failed: {task.exception()}")
+    
+    def _forget(self, key: str):
+        """Anahtarı L1'den düşür ve süren yüklemesinin sonucunu cache'e yazdırma"""
+        self.local.invalidate(key)
+        self._inflight.pop(key, None)
+    
+    async def set_user(self, user: User):
+        """Kullanıcıyı L1'e ve TTL ile Redis'e yaz"""
+        await self.set_users([user])
+    
+    async def delete_user(self, user_id: int):
+        """Kullanıcıyı iki katmandan sil ve diğer replikalara bildir"""
+        await self.invalidate_users([user_id])
+    
+    async def invalidate_users(self, user_ids: List[int]):
+        """Kullanıcıları L1 ve Redis'ten sil, geçersiz kılmayı pub/sub ile yayınla"""
+        if not self.client or not user_ids:
+            return
+        keys = [self.user_key(user_id) for user_id in user_ids]
+        for key in keys:
+            self._forget(key)
+        message = json.dumps({"origin": self.instance_id, "keys": keys})
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.delete(*keys)
+                pipe.publish(self.invalidation_channel, message)
+                await self._run(pipe.execute())
+        except Exception as e:
+            logger.warning(f"Cache invalidation failed for users {user_ids}: {e}")
+    
+    async def get_users(self, user_ids: List[int]) -> Dict[int, User]:
+        """Birden fazla kullanıcıyı L1 + tek MGET ile getir; yalnızca bulunanlar döner"""
+        if not self.client or not user_ids:
+            return {}
+        found = {}
+        remote_ids = []
+        for user_id in user_ids:
+            user = self.local.get(self.user_key(user_id))
+            if user is not None:
+                self.l1_hits += 1
+                found[user_id] = user
+            else:
+                remote_ids.append(user_id)
+        if not remote_ids:
+            return found
+        
+        try:
+            values = await self._run(self.client.mget([self.user_key(user_id) for user_id in remote_ids]))
+        except Exception as e:
+            logger.warning(f"Cache multi-read failed: {e}")
+            values = [None] * len(remote_ids)
+        for user_id, value in zip(remote_ids, values):
+            if value:
+                self.l2_hits += 1
+                found[user_id] = User.model_validate_json(value)
+                self.local.put(self.user_key(user_id), found[user_id])
+            else:
+                self.misses += 1
+        return found
+    
+    async def set_users(self, users: List[User]):
+        """Kullanıcıları L1'e ve tek pipeline (tek round trip) ile Redis'e yaz"""
+        if not self.client or not users:
+            return
+        for user in users:
+            self.local.put(self.user_key(user.id), user)
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for user in users:
+                    pipe.setex(self.user_key(user.id), self.user_ttl, user.model_dump_json())
+                await self._run(pipe.execute())
+        except Exception as e:
+            logger.warning(f"Cache write failed for {len(users)} users: {e}")
+    
+    async def _listen_invalidations(self):
+        """Diğer replikaların geçersiz kılma mesajlarıyla L1'i güncel tut"""
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(self.invalidation_channel)
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is None:
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload.get("origin") == self.instance_id:
+                        continue
+                    for key in payload.get("keys", []):
+                        self._forget(key)
+                    self.invalidations_received += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Abonelik koptu: kaçan mesajlar olabilir, L1'e güvenme
+                logger.warning(f"Cache invalidation listener error: {e}")
+                self.local.clear()
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.aclose()
+    
+    def stats(self) -> dict:
+        """Katman başına isabet oranları"""
+        lookups = self.l1_hits + self.l2_hits + self.misses
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "l1_hit_rate": self.l1_hits / lookups if lookups else 0.0,
+            "l2_hit_rate": self.l2_hits / lookups if lookups else 0.0,
+            "l1_size": len(self.local),
+            "invalidations_received": self.invalidations_received,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes
+        }
@@ -1,16 +1,38 @@
+import asyncio
 import asyncpg
+import base64
 import os
 import logging
-from typing import List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from .models import User, UserCreate, UserUpdate
 
 logger = logging.getLogger(__name__)
 
+def encode_cursor(created_at: datetime, user_id: int) -> str:
+    """Sayfanın son satırını (created_at, id) opak bir imlece çevir"""
+    raw = f"{created_at.isoformat()}|{user_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """İmleci (created_at, id) çiftine çevir; geçersizse ValueError"""
+    try:
+        created_at, user_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(user_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
 class DatabaseManager:
     def __init__(self):
         self.pool = None
         self.database_url = os.getenv("DATABASE_URL", "postgresql://user:password@db:5432/docker_learning")
+        
+        # /metrics için kısa süreli önbelleklenen kullanıcı sayısı
+        self.user_count_ttl = float(os.getenv("USER_COUNT_CACHE_TTL", "5"))
+        self._user_count = None
+        self._user_count_at = 0.0
+        self._user_count_lock = asyncio.Lock()
     
     async def connect(self):
         """Veritabanı bağlantısını kur"""
@@ -58,6 +80,11 @@ class DatabaseManager:
                         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     )
                 """)
+                # Sayfalı listeleme (created_at DESC, id DESC) için
+                await conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_users_created_at_id
+                    ON users (created_at DESC, id DESC)
+                """)
             logger.info("Database tables created successfully")
         except Exception as e:
             logger.error(f"Error creating tables: {e}")
@@ -88,6 +115,80 @@ class DatabaseManager:
             logger.error(f"Error getting all users: {e}")
             raise
     
+    async def get_users_page(
+        self, limit: int, cursor: Optional[Tuple[datetime, int]] = None
+    ) -> Tuple[List[User], Optional[Tuple[datetime, int]]]:
+        """
+        Kullanıcıları (created_at, id) üzerinden keyset sayfalama ile getir
+        
+        Index üzerinde imleçten sonraki limit + 1 satır okunur; maliyet tablo
+        boyutuna değil sayfa boyutuna bağlıdır. Sonraki sayfa yoksa imleç None döner.
+        """
+        try:
+            async with self.pool.acquire() as conn:
+                if cursor is None:
+                    rows = await conn.fetch("""
+                        SELECT id, email, name, is_active, created_at, updated_at
+                        FROM users
+                        ORDER BY created_at DESC, id DESC
+                        LIMIT $1
+                    """, limit + 1)
+                else:
+                    rows = await conn.fetch("""
+                        SELECT id, email, name, is_active, created_at, updated_at
+                        FROM users
+                        WHERE (created_at, id) < ($1, $2)
+                        ORDER BY created_at DESC, id DESC
+                        LIMIT $3
+                    """, cursor[0], cursor[1], limit + 1)
+                
+                users = [
+                    User(
+                        id=row['id'],
+                        email=row['email'],
+                        name=row['name'],
+                        is_active=row['is_active'],
+                        created_at=row['created_at'],
+                        updated_at=row['updated_at']
+                    )
+                    for row in rows[:limit]
+                ]
+                next_cursor = None
+                if len(rows) > limit:
+                    last = rows[limit - 1]
+                    next_cursor = (last['created_at'], last['id'])
+                return users, next_cursor
+        except Exception as e:
+            logger.error(f"Error getting users page: {e}")
+            raise
+    
+    async def count_users(self) -> int:
+        """
+        Kullanıcı sayısı (USER_COUNT_CACHE_TTL saniye önbellekli)
+        
+        Süre dolduğunda tek bir COUNT(*) çalışır; aynı anda gelen istekler
+        onun sonucunu bekler. Bu süreçteki ekleme/silmeler sayıya anında yansır.
+        """
+        if self._user_count is not None and time.monotonic() - self._user_count_at < self.user_count_ttl:
+            return self._user_count
+        
+        async with self._user_count_lock:
+            if self._user_count is not None and time.monotonic() - self._user_count_at < self.user_count_ttl:
+                return self._user_count
+            try:
+                async with self.pool.acquire() as conn:
+                    count = await conn.fetchval("SELECT COUNT(*) FROM users")
+                self._user_count = count
+                self._user_count_at = time.monotonic()
+                return count
+            except Exception as e:
+                logger.error(f"Error counting users: {e}")
+                raise
+    
+    def _adjust_user_count(self, delta: int):
+        if self._user_count is not None:
+            self._user_count += delta
+    
     async def get_user_by_id(self, user_id: int) -> Optional[User]:
         """ID'ye göre kullanıcı getir"""
         try:
@@ -112,6 +213,31 @@ class DatabaseManager:
             logger.error(f"Error getting user by id {user_id}: {e}")
             raise
     
+    async def get_users_by_ids(self, user_ids: List[int]) -> Dict[int, User]:
+        """ID listesindeki kullanıcıları tek sorguyla getir; yalnızca bulunanlar döner"""
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch("""
+                    SELECT id, email, name, is_active, created_at, updated_at
+                    FROM users
+                    WHERE id = ANY($1::int[])
+                """, user_ids)
+                
+                return {
+                    row['id']: User(
+                        id=row['id'],
+                        email=row['email'],
+                        name=row['name'],
+                        is_active=row['is_active'],
+                        created_at=row['created_at'],
+                        updated_at=row['updated_at']
+                    )
+                    for row in rows
+                }
+        except Exception as e:
+            logger.error(f"Error getting users by ids: {e}")
+            raise
+    
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Email'e göre kullanıcı getir"""
         try:
@@ -136,18 +262,23 @@ class DatabaseManager:
             logger.error(f"Error getting user by email {email}: {e}")
             raise
     
-    async def create_user(self, user: UserCreate) -> User:
-        """Yeni kullanıcı oluştur"""
+    async def create_user(self, user: UserCreate) -> Optional[User]:
+        """Yeni kullanıcı oluştur; email zaten kayıtlıysa None"""
         try:
             async with self.pool.acquire() as conn:
                 # Basit password hash (production'da bcrypt kullanın)
                 password_hash = f"hashed_{user.password}"
                 
+                # Email kontrolü ve ekleme tek ifadede (eşzamanlı kayıtlarda da tutarlı)
                 row = await conn.fetchrow("""
                     INSERT INTO users (email, name, password_hash, is_active)
                     VALUES ($1, $2, $3, $4)
+                    ON CONFLICT (email) DO NOTHING
                     RETURNING id, email, name, is_active, created_at, updated_at
                 """, user.email, user.name, password_hash, True)
+                if not row:
+                    return None
+                self._adjust_user_count(1)
                 
                 return User(
                     id=row['id'],
@@ -161,8 +292,51 @@ class DatabaseManager:
             logger.error(f"Error creating user: {e}")
             raise
     
-    async def update_user(self, user_id: int, user_update: UserUpdate) -> User:
-        """Kullanıcı bilgilerini güncelle"""
+    async def create_users(self, users: List[UserCreate]) -> List[Optional[User]]:
+        """
+        Birden fazla kullanıcıyı tek INSERT ile oluştur
+        
+        Satırlar dizi parametrelerinden (unnest) tek round trip'te eklenir.
+        Email'i zaten kayıtlı olanlar (ya da listede daha önce geçenler) atlanır.
+        Sonuç girdi sırasındadır; oluşturulamayan kullanıcılar için None.
+        """
+        try:
+            async with self.pool.acquire() as conn:
+                # Basit password hash (production'da bcrypt kullanın)
+                rows = await conn.fetch("""
+                    INSERT INTO users (email, name, password_hash, is_active)
+                    SELECT email, name, password_hash, TRUE
+                    FROM unnest($1::varchar[], $2::varchar[], $3::varchar[])
+                        WITH ORDINALITY AS input(email, name, password_hash, position)
+                    ORDER BY position
+                    ON CONFLICT (email) DO NOTHING
+                    RETURNING id, email, name, is_active, created_at, updated_at
+                """,
+                    [user.email for user in users],
+                    [user.name for user in users],
+                    [f"hashed_{user.password}" for user in users]
+                )
+                self._adjust_user_count(len(rows))
+                
+                created = {
+                    row['email']: User(
+                        id=row['id'],
+                        email=row['email'],
+                        name=row['name'],
+                        is_active=row['is_active'],
+                        created_at=row['created_at'],
+                        updated_at=row['updated_at']
+                    )
+                    for row in rows
+                }
+                # Aynı email listede birden fazla geçiyorsa yalnızca ilki oluşturulmuştur
+                return [created.pop(user.email, None) for user in users]
+        except Exception as e:
+            logger.error(f"Error creating {len(users)} users: {e}")
+            raise
+    
+    async def update_user(self, user_id: int, user_update: UserUpdate) -> Optional[User]:
+        """Kullanıcı bilgilerini güncelle; kullanıcı yoksa None"""
         try:
             async with self.pool.acquire() as conn:
                 # Güncellenecek alanları belirle
@@ -195,13 +369,15 @@ class DatabaseManager:
                 values.append(user_id)
                 
                 query = f"""
-                    UPDATE users 
+                    UPDATE users
                     SET {', '.join(update_fields)}
                     WHERE id = ${param_count}
                     RETURNING id, email, name, is_active, created_at, updated_at
                 """
                 
                 row = await conn.fetchrow(query, *values)
+                if not row:
+                    return None
                 
                 return User(
                     id=row['id'],
@@ -215,19 +391,22 @@ class DatabaseManager:
             logger.error(f"Error updating user {user_id}: {e}")
             raise
     
-    async def delete_user(self, user_id: int):
-        """Kullanıcıyı sil"""
+    async def delete_user(self, user_id: int) -> bool:
+        """Kullanıcıyı sil; kullanıcı yoksa False"""
         try:
             async with self.pool.acquire() as conn:
-                result = await conn.execute("""
+                deleted_id = await conn.fetchval("""
                     DELETE FROM users
                     WHERE id = $1
+                    RETURNING id
                 """, user_id)
                 
-                if result == "DELETE 0":
-                    raise ValueError("User not found")
+                if deleted_id is None:
+                    return False
+                self._adjust_user_count(-1)
                 
                 logger.info(f"User {user_id} deleted successfully")
+                return True
         except Exception as e:
             logger.error(f"Error deleting user {user_id}: {e}")
-            raise 
\ No newline at end of file
+            raise
\ No newline at end of file
@@ -1,15 +1,14 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import os
 import logging
 from datetime import datetime
 from typing import List, Optional
-import redis
-import json
 
-from .models import User, UserCreate, UserUpdate, HealthCheck, ServiceInfo, MetricsResponse
-from .database import DatabaseManager
+from .models import User, UserCreate, UserUpdate, BulkUserResult, HealthCheck, ServiceInfo, MetricsResponse
+from .database import DatabaseManager, encode_cursor, decode_cursor
+from .cache import CacheManager
 
 # Logging konfigürasyonu
 logging.basicConfig(level=logging.INFO)
@@ -29,32 +28,35 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Tarayıcı istemcileri sayfalama imlecini okuyabilsin
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Global değişkenler
 db_manager = DatabaseManager()
-redis_client = None
+cache = CacheManager()
+
+# GET /users sayfa boyutu (limit parametresi verilmezse) ve üst sınırı
+USERS_PAGE_SIZE = int(os.getenv("USERS_PAGE_SIZE", "50"))
+USERS_MAX_PAGE_SIZE = int(os.getenv("USERS_MAX_PAGE_SIZE", "500"))
+
+# Toplu okuma/yazma isteklerinde en fazla kullanıcı sayısı
+USERS_BULK_MAX_SIZE = int(os.getenv("USERS_BULK_MAX_SIZE", "1000"))
+
+# users.id SERIAL (int4) aralığı
+MAX_USER_ID = 2 ** 31 - 1
 
 @app.on_event("startup")
 async def startup_event():
     """Uygulama başlangıcında çalışacak fonksiyonlar"""
-    global redis_client
-    
     logger.info("Starting Docker Learning API v1.0.0")
     
     # Veritabanı bağlantısı
     await db_manager.connect()
     await db_manager.create_tables()
     
-    # Redis bağlantısı
-    try:
-        redis_url = os.getenv("REDIS_URL", "redis://cache:6379")
-        redis_client = redis.from_url(redis_url)
-        redis_client.ping()  # Bağlantı testi
-        logger.info("Redis connection established")
-    except Exception as e:
-        logger.warning(f"Redis connection failed: {e}")
-        redis_client = None
+    # Redis bağlantı havuzu (bağlanamazsa cache devre dışı kalır)
+    await cache.connect()
     
     logger.info("Application started successfully!")
 
@@ -62,8 +64,7 @@ async def startup_event():
 async def shutdown_event():
     """Uygulama kapanışında çalışacak fonksiyonlar"""
     await db_manager.disconnect()
-    if redis_client:
-        redis_client.close()
+    await cache.disconnect()
     logger.info("Application shutdown complete")
 
 @app.get("/", response_model=dict)
@@ -90,13 +91,7 @@ async def health_check():
         db_status = await db_manager.check_connection()
         
         # Redis bağlantı kontrolü
-        redis_status = False
-        if redis_client:
-            try:
-                redis_client.ping()
-                redis_status = True
-            except:
-                pass
+        redis_status = await cache.ping()
         
         return HealthCheck(
             status="healthy" if db_status and redis_status else "unhealthy",
@@ -115,38 +110,85 @@ async def health_check():
             version="1.0.0"
         )
 
+def parse_user_ids(ids: str) -> List[int]:
+    """Virgülle ayrılmış ID listesini çözümle; geçersizse 400"""
+    try:
+        user_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid ids")
+    if not user_ids:
+        raise HTTPException(status_code=400, detail="Invalid ids")
+    if len(user_ids) > USERS_BULK_MAX_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {USERS_BULK_MAX_SIZE} ids allowed")
+    if any(user_id < 1 or user_id > MAX_USER_ID for user_id in user_ids):
+        raise HTTPException(status_code=400, detail="Invalid ids")
+    return user_ids
+
+async def get_users_by_ids(user_ids: List[int]) -> List[Optional[User]]:
+    """Kullanıcıları tek MGET + eksikler için tek sorguyla getir, cache'i tek pipeline ile doldur"""
+    unique_ids = list(dict.fromkeys(user_ids))
+    users = await cache.get_users(unique_ids)
+    
+    missing_ids = [user_id for user_id in unique_ids if user_id not in users]
+    if missing_ids:
+        loaded = await db_manager.get_users_by_ids(missing_ids)
+        await cache.set_users(list(loaded.values()))
+        users.update(loaded)
+    
+    return [users.get(user_id) for user_id in user_ids]
+
 @app.get("/users", response_model=List[User])
-async def get_users():
-    """Tüm kullanıcıları getir"""
+async def get_users(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, description="Sayfa boyutu"),
+    cursor: Optional[str] = Query(None, description="Önceki yanıttaki X-Next-Cursor değeri")
+):
+    """
+    Kullanıcıları en yeniden eskiye sayfa sayfa getir
+    
+    Sonraki sayfa varsa imleci X-Next-Cursor başlığında döner.
+    """
     try:
-        users = await db_manager.get_all_users()
+        page_size = min(limit or USERS_PAGE_SIZE, USERS_MAX_PAGE_SIZE)
+        try:
+            position = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        
+        users, next_position = await db_manager.get_users_page(page_size, position)
+        if next_position:
+            response.headers["X-Next-Cursor"] = encode_cursor(*next_position)
         return users
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting users: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@app.get("/users/batch", response_model=List[Optional[User]])
+async def get_users_batch(
+    ids: str = Query(..., description="Virgülle ayrılmış kullanıcı ID'leri (ör. 1,2,3)")
+):
+    """Birden fazla kullanıcıyı girdi sırasında getir; bulunamayanlar null"""
+    try:
+        return await get_users_by_ids(parse_user_ids(ids))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting users by ids: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @app.post("/users", response_model=User)
 async def create_user(user: UserCreate):
     """Yeni kullanıcı oluştur"""
     try:
-        # Email kontrolü
-        existing_user = await db_manager.get_user_by_email(user.email)
-        if existing_user:
-            raise HTTPException(status_code=400, detail="Email already registered")
-        
-        # Kullanıcı oluştur
+        # Kullanıcı oluştur (email kayıtlıysa satır eklenmez)
         new_user = await db_manager.create_user(user)
+        if not new_user:
+            raise HTTPException(status_code=400, detail="Email already registered")
         
         # Cache'e kaydet
-        if redis_client:
-            try:
-                redis_client.setex(
-                    f"user:{new_user.id}",
-                    3600,  # 1 saat
-                    json.dumps(new_user.dict())
-                )
-            except:
-                pass
+        await cache.set_user(new_user)
         
         return new_user
     except HTTPException:
@@ -155,35 +197,43 @@ async def create_user(user: UserCreate):
         logger.error(f"Error creating user: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@app.post("/users/bulk", response_model=List[BulkUserResult])
+async def create_users_bulk(users: List[UserCreate]):
+    """
+    Birden fazla kullanıcıyı tek istekte oluştur
+    
+    Sonuçlar girdi sırasındadır; email'i kayıtlı olanlar oluşturulmaz ve
+    hata mesajıyla döner, diğerleri yine de oluşturulur.
+    """
+    if not users:
+        raise HTTPException(status_code=400, detail="No users given")
+    if len(users) > USERS_BULK_MAX_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {USERS_BULK_MAX_SIZE} users allowed")
+    try:
+        created = await db_manager.create_users(users)
+        
+        # Cache'e tek pipeline ile kaydet
+        await cache.set_users([user for user in created if user])
+        
+        return [
+            BulkUserResult(email=user.email, created=True, user=new_user)
+            if new_user else
+            BulkUserResult(email=user.email, created=False, error="Email already registered")
+            for user, new_user in zip(users, created)
+        ]
+    except Exception as e:
+        logger.error(f"Error creating users in bulk: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @app.get("/users/{user_id}", response_model=User)
 async def get_user(user_id: int):
     """Belirli bir kullanıcıyı getir"""
     try:
-        # Önce cache'den kontrol et
-        if redis_client:
-            try:
-                cached_user = redis_client.get(f"user:{user_id}")
-                if cached_user:
-                    return User(**json.loads(cached_user))
-            except:
-                pass
-        
-        # Veritabanından getir
-        user = await db_manager.get_user_by_id(user_id)
+        # Cache'de yoksa veritabanından yükle (anahtar başına tek sorgu)
+        user = await cache.load_user(user_id, db_manager.get_user_by_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Cache'e kaydet
-        if redis_client:
-            try:
-                redis_client.setex(
-                    f"user:{user_id}",
-                    3600,
-                    json.dumps(user.dict())
-                )
-            except:
-                pass
-        
         return user
     except HTTPException:
         raise
@@ -195,20 +245,13 @@ async def get_user(user_id: int):
 async def update_user(user_id: int, user_update: UserUpdate):
     """Kullanıcı bilgilerini güncelle"""
     try:
-        # Kullanıcının var olup olmadığını kontrol et
-        existing_user = await db_manager.get_user_by_id(user_id)
-        if not existing_user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        # Güncelle
+        # Güncelle (kullanıcı yoksa satır dönmez)
         updated_user = await db_manager.update_user(user_id, user_update)
+        if not updated_user:
+            raise HTTPException(status_code=404, detail="User not found")
         
         # Cache'i temizle
-        if redis_client:
-            try:
-                redis_client.delete(f"user:{user_id}")
-            except:
-                pass
+        await cache.delete_user(user_id)
         
         return updated_user
     except HTTPException:
@@ -221,20 +264,12 @@ async def update_user(user_id: int, user_update: UserUpdate):
 async def delete_user(user_id: int):
     """Kullanıcıyı sil"""
     try:
-        # Kullanıcının var olup olmadığını kontrol et
-        existing_user = await db_manager.get_user_by_id(user_id)
-        if not existing_user:
+        # Sil (kullanıcı yoksa satır silinmez)
+        if not await db_manager.delete_user(user_id):
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Sil
-        await db_manager.delete_user(user_id)
-        
         # Cache'i temizle
-        if redis_client:
-            try:
-                redis_client.delete(f"user:{user_id}")
-            except:
-                pass
+        await cache.delete_user(user_id)
         
         return {"message": "User deleted successfully"}
     except HTTPException:
@@ -247,24 +282,18 @@ async def delete_user(user_id: int):
 async def get_metrics():
     """Sistem metriklerini getir"""
     try:
-        # Kullanıcı sayısı
-        users = await db_manager.get_all_users()
-        user_count = len(users)
+        # Kullanıcı sayısı (kısa süreli önbellekli COUNT(*))
+        user_count = await db_manager.count_users()
         
         # Redis durumu
-        cache_status = False
-        if redis_client:
-            try:
-                redis_client.ping()
-                cache_status = True
-            except:
-                pass
+        cache_status = await cache.ping()
         
         return MetricsResponse(
             timestamp=datetime.now(),
             user_count=user_count,
             cache_status=cache_status,
-            uptime="running"
+            uptime="running",
+            cache_stats=cache.stats()
         )
     except Exception as e:
         logger.error(f"Error getting metrics: {e}")
@@ -288,4 +317,4 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True
-    ) 
\ No newline at end of file
+    )
\ No newline at end of file
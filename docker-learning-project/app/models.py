@@ -29,6 +29,12 @@ class UserUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=2, max_length=100, description="Kullanıcı adı")
     is_active: Optional[bool] = Field(None, description="Kullanıcı aktif durumu")
 
+class BulkUserResult(BaseModel):
+    email: str
+    created: bool
+    user: Optional[User] = None
+    error: Optional[str] = None
+
 class HealthCheck(BaseModel):
     status: str
     timestamp: datetime
@@ -44,8 +50,20 @@ class ServiceInfo(BaseModel):
     database_url: str
     redis_url: str
 
+class CacheStats(BaseModel):
+    l1_hits: int
+    l2_hits: int
+    misses: int
+    l1_hit_rate: float
+    l2_hit_rate: float
+    l1_size: int
+    invalidations_received: int
+    coalesced: int
+    refreshes: int
+
 class MetricsResponse(BaseModel):
     timestamp: datetime
     user_count: int
     cache_status: bool
-    uptime: str 
\ No newline at end of file
+    uptime: str
+    cache_stats: Optional[CacheStats] = None
\ No newline at end of file
@@ -4,6 +4,9 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 import logging
 import os
+import glob
+import json
+from datetime import datetime
 from typing import Tuple
 
 logger = logging.getLogger(__name__)
@@ -13,18 +16,22 @@ def load_iris_data(file_path: str = "data/raw/iris.csv") -> pd.DataFrame:
     Iris veri setini yükle
     
     Args:
-        file_path: CSV dosya yolu
+        file_path: CSV dosya yolu, tahmin kaydı dizini ya da Parquet segmenti
         
     Returns:
         DataFrame: Iris veri seti
     """
     try:
+        if os.path.isdir(file_path) or file_path.endswith('.parquet'):
+            # Tahmin kaydı segmentlerinden yükle (yeniden eğitim için)
+            return load_prediction_log(file_path)
+        
         if not os.path.exists(file_path):
             logger.warning(f"Dosya bulunamadı: {file_path}")
             # Sklearn'dan iris dataset'ini yükle
             from sklearn.datasets import load_iris
             iris = load_iris()
-            df = pd.DataFrame(iris.data, columns=iris.feature_names)
+            df = pd.DataFrame(iris.data, columns=get_feature_names())
             df['target'] = iris.target
             df['target_name'] = iris.target_names[iris.target]
             
@@ -42,6 +49,36 @@ def load_iris_data(file_path: str = "data/raw/iris.csv") -> pd.DataFrame:
         logger.error(f"Veri yükleme hatası: {e}")
         raise
 
+def load_prediction_log(path: str = "data/predictions") -> pd.DataFrame:
+    """
+    Tahmin kaydı segmentlerini tek bir DataFrame olarak yükle
+    
+    Segmentler preprocess_data'nın beklediği kolonları (özellikler ve
+    'target') içerir; 'target' burada modelin tahminidir.
+    
+    Args:
+        path: Segment dizini ya da tek bir Parquet dosyası
+        
+    Returns:
+        DataFrame: Kaydedilmiş tahminler
+    """
+    try:
+        if os.path.isdir(path):
+            files = sorted(glob.glob(os.path.join(path, "predictions-*.parquet")))
+        else:
+            files = [path]
+        
+        if not files:
+            raise FileNotFoundError(f"Tahmin segmenti bulunamadı: {path}")
+        
+        df = pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+        logger.info(f"Tahmin kaydı yüklendi: {len(files)} segment, {len(df)} satır")
+        return df
+        
+    except Exception as e:
+        logger.error(f"Tahmin kaydı yükleme hatası: {e}")
+        raise
+
 def preprocess_data(data: pd.DataFrame, test_size: float = 0.2, random_state: int = 42) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
     Veriyi ön işleme
@@ -118,6 +155,111 @@ def analyze_data(data: pd.DataFrame) -> dict:
         logger.error(f"Veri analizi hatası: {e}")
         raise
 
+def compute_reference_stats(data: pd.DataFrame, n_bins: int = 10,
+                            quantile_levels: Tuple[float, ...] = (0.1, 0.5, 0.9)) -> dict:
+    """
+    Eğitim verisinden drift izleme için referans istatistikleri çıkar
+    
+    Histogram sınırları eğitim verisinin kantillerinden seçilir, böylece
+    canlı trafik aynı kutulara düşürülüp PSI ile karşılaştırılabilir.
+    
+    Args:
+        data: Ham (ölçeklenmemiş) veri seti
+        n_bins: Özellik başına histogram kutu sayısı
+        quantile_levels: Takip edilecek kantil seviyeleri
+        
+    Returns:
+        dict: JSON'a yazılabilir referans istatistikleri
+    """
+    try:
+        feature_names = get_feature_names()
+        class_names = get_target_names()
+        X = data[feature_names].values.astype(np.float64)
+        y = data['target'].values.astype(np.int64)
+        
+        # İç kutu sınırları: uç kutular açık uçludur
+        cut_levels = np.linspace(0, 1, n_bins + 1)[1:-1]
+        bin_edges = np.quantile(X, cut_levels, axis=0).T
+        
+        def group_stats(X_group: np.ndarray) -> dict:
+            histogram = []
+            for j in range(X_group.shape[1]):
+                idx = np.searchsorted(bin_edges[j], X_group[:, j], side='right')
+                counts = np.bincount(idx, minlength=n_bins)
+                histogram.append((counts / max(len(X_group), 1)).tolist())
+            return {
+                'count': int(len(X_group)),
+                'mean': X_group.mean(axis=0).tolist(),
+                'std': X_group.std(axis=0).tolist(),
+                'quantiles': np.quantile(X_group, quantile_levels, axis=0).T.tolist(),
+                'histogram': histogram
+            }
+        
+        groups = {'all': group_stats(X)}
+        for class_idx, class_name in enumerate(class_names):
+            X_class = X[y == class_idx]
+            if len(X_class):
+                groups[class_name] = group_stats(X_class)
+        
+        class_counts = np.bincount(y, minlength=len(class_names))
+        
+        stats = {
+            'feature_names': feature_names,
+            'class_names': class_names,
+            'quantile_levels': list(quantile_levels),
+            'bin_edges': bin_edges.tolist(),
+            'class_distribution': (class_counts / class_counts.sum()).tolist(),
+            'groups': groups,
+            'created_at': datetime.now().isoformat()
+        }
+        
+        logger.info("Referans istatistikleri hesaplandı")
+        return stats
+        
+    except Exception as e:
+        logger.error(f"Referans istatistik hatası: {e}")
+        raise
+
+def save_reference_stats(stats: dict, file_path: str = "data/processed/reference_stats.json") -> None:
+    """
+    Referans istatistiklerini kaydet
+    
+    Args:
+        stats: compute_reference_stats çıktısı
+        file_path: JSON dosya yolu
+    """
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w') as f:
+            json.dump(stats, f)
+        
+        logger.info(f"Referans istatistikleri kaydedildi: {file_path}")
+        
+    except Exception as e:
+        logger.error(f"Referans istatistik kaydetme hatası: {e}")
+        raise
+
+def load_reference_stats(file_path: str = "data/processed/reference_stats.json") -> dict:
+    """
+    Referans istatistiklerini yükle
+    
+    Args:
+        file_path: JSON dosya yolu
+        
+    Returns:
+        dict: Referans istatistikleri
+    """
+    try:
+        with open(file_path) as f:
+            stats = json.load(f)
+        
+        logger.info(f"Referans istatistikleri yüklendi: {file_path}")
+        return stats
+        
+    except Exception as e:
+        logger.error(f"Referans istatistik yükleme hatası: {e}")
+        raise
+
 def save_processed_data(X_train: np.ndarray, X_test: np.ndarray, 
                        y_train: np.ndarray, y_test: np.ndarray,
                        output_dir: str = "data/processed") -> None:
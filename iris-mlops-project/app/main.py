@@ -1,7 +1,9 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 import uvicorn
 import os
+import asyncio
 import logging
 from datetime import datetime
 from typing import List, Optional
@@ -11,9 +13,16 @@ import pandas as pd
 import numpy as np
 from sklearn.metrics import accuracy_score, classification_report
 import json
+import orjson
 
-from .models import IrisFeatures, PredictionResponse, ModelInfo, HealthCheck
-from .data_processor import load_iris_data, preprocess_data
+from .models import IrisFeatures, PredictionResponse, CompactBatchPredictionResponse, ModelInfo, HealthCheck
+from .data_processor import (
+    load_iris_data, preprocess_data,
+    compute_reference_stats, save_reference_stats, load_reference_stats
+)
+from .monitoring import DriftMonitor
+from .prediction_logger import PredictionLogger
+from .model_store import ModelStore
 from .training import train_models, get_best_model
 
 # Logging setup
@@ -43,14 +52,48 @@ mlflow.set_tracking_uri(MLFLOW_TRACKING_URI)
 # Global variables
 current_model = None
 model_info = None
+drift_monitor = None
+
+REFERENCE_STATS_PATH = os.getenv("REFERENCE_STATS_PATH", "data/processed/reference_stats.json")
+
+# Çoklu worker modunda paylaşılan model deposu (app/serve.py ayarlar)
+MODEL_STORE_DIR = os.getenv("MODEL_STORE_DIR")
+MODEL_STORE_POLL_INTERVAL = float(os.getenv("MODEL_STORE_POLL_INTERVAL", "1.0"))
+model_store = ModelStore(MODEL_STORE_DIR) if MODEL_STORE_DIR else None
+_store_version = None
+_store_poller = None
+
+# Tahmin kaydı (yeniden eğitim verisi için)
+PREDICTION_LOG_ENABLED = os.getenv("PREDICTION_LOG_ENABLED", "true").lower() == "true"
+prediction_logger = PredictionLogger(
+    log_dir=os.getenv("PREDICTION_LOG_DIR", "data/predictions"),
+    max_queue_size=int(os.getenv("PREDICTION_LOG_QUEUE_SIZE", "1000")),
+    segment_rows=int(os.getenv("PREDICTION_LOG_SEGMENT_ROWS", "50000")),
+    flush_interval=float(os.getenv("PREDICTION_LOG_FLUSH_INTERVAL", "30")),
+    max_segments=int(os.getenv("PREDICTION_LOG_MAX_SEGMENTS", "0")) or None
+)
 
 @app.on_event("startup")
 async def startup_event():
     """Uygulama başlatıldığında çalışır"""
-    global current_model, model_info
+    global _store_poller
     
     logger.info("Iris Classification API başlatılıyor...")
     
+    if PREDICTION_LOG_ENABLED:
+        prediction_logger.start()
+    
+    if model_store is not None:
+        await prepare_model_store()
+        await sync_model_from_store()
+        _store_poller = asyncio.create_task(poll_model_store())
+    else:
+        await load_or_train_model()
+
+async def load_or_train_model():
+    """En iyi modeli MLflow'dan yükle, bulunamazsa eğit"""
+    global current_model, model_info
+    
     try:
         # MLflow bağlantısını kontrol et
         mlflow.get_tracking_uri()
@@ -61,14 +104,118 @@ async def startup_event():
         
         if current_model:
             logger.info(f"Model yüklendi: {model_info['model_name']} v{model_info['version']}")
+            setup_drift_monitor()
         else:
             logger.warning("Model bulunamadı, yeni model eğitilecek...")
             await train_initial_model()
-            
+    
     except Exception as e:
         logger.error(f"Startup hatası: {e}")
         await train_initial_model()
 
+def setup_drift_monitor(data: Optional[pd.DataFrame] = None):
+    """Drift izleyiciyi referans istatistikleriyle (yeniden) başlat"""
+    global drift_monitor
+    
+    try:
+        if data is not None:
+            # Eğitim anı: referansı bu veriden çıkar ve kaydet
+            reference = compute_reference_stats(data)
+            save_reference_stats(reference, REFERENCE_STATS_PATH)
+        elif os.path.exists(REFERENCE_STATS_PATH):
+            reference = load_reference_stats(REFERENCE_STATS_PATH)
+        else:
+            reference = compute_reference_stats(load_iris_data("data/raw/iris.csv"))
+            save_reference_stats(reference, REFERENCE_STATS_PATH)
+        
+        drift_monitor = DriftMonitor(reference)
+        logger.info("Drift izleyici başlatıldı")
+    
+    except Exception as e:
+        logger.warning(f"Drift izleyici başlatılamadı: {e}")
+        drift_monitor = None
+
+def track_predictions(input_data: np.ndarray, predictions: np.ndarray, probabilities: np.ndarray):
+    """Tahmin edilen satırları drift izleyiciye ve tahmin kaydına aktar"""
+    if PREDICTION_LOG_ENABLED:
+        prediction_logger.log(
+            input_data, predictions, probabilities,
+            model_info['version'] if model_info else "unknown"
+        )
+    
+    if drift_monitor is None:
+        return
+    try:
+        drift_monitor.update(input_data, predictions)
+    except Exception as e:
+        logger.warning(f"Drift istatistik güncelleme hatası: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Uygulama kapanırken çalışır"""
+    if _store_poller is not None:
+        _store_poller.cancel()
+    
+    # Kuyrukta kalan tahminleri diske yaz
+    prediction_logger.stop()
+    logger.info("Iris Classification API kapatıldı")
+
+async def prepare_model_store():
+    """Depoda aktif model yoksa bir kez yükle/eğit ve yayınla"""
+    if model_store.current_version() is None:
+        await load_or_train_model()
+        publish_model()
+
+def release_model():
+    """
+    Bellekteki modeli bırak (app/serve.py master'ı fork etmeden önce çağırır)
+    
+    Worker'lar master'ın heap'teki kopyasını devralırsa referans sayacı
+    yazmaları copy-on-write sayfalarını kirletir; bunun yerine başlangıçta
+    modeli depodan bellek eşlemeli açarlar.
+    """
+    global current_model, model_info, _store_version
+    current_model = None
+    model_info = None
+    _store_version = None
+
+def publish_model():
+    """Mevcut modeli paylaşılan depoya yayınla (diğer worker'lar da geçer)"""
+    global _store_version
+    
+    if model_store is None or current_model is None:
+        return
+    _store_version = model_store.publish(current_model, model_info or {})
+
+async def sync_model_from_store():
+    """Depodaki aktif versiyon değiştiyse modeli bellek eşlemeli olarak yeniden aç"""
+    global current_model, model_info, _store_version
+    
+    try:
+        version = model_store.current_version()
+        if version is None or (version == _store_version and current_model is not None):
+            return
+        
+        # Dosya okuma ve referans istatistikleri event loop'u bloklamasın
+        previous = _store_version
+        loop = asyncio.get_running_loop()
+        model, info = await loop.run_in_executor(None, model_store.load, version)
+        if _store_version != previous:
+            # Yükleme sürerken bu worker yeni bir versiyon yayınladı
+            return
+        current_model, model_info = model, info
+        _store_version = version
+        await loop.run_in_executor(None, setup_drift_monitor)
+        logger.info(f"Model versiyonu değişti: {version}")
+    except Exception as e:
+        logger.error(f"Model deposu senkronizasyon hatası: {e}")
+
+async def poll_model_store():
+    """Diğer worker'ların yayınladığı versiyonları arka planda takip et"""
+    while True:
+        await asyncio.sleep(MODEL_STORE_POLL_INTERVAL)
+        await sync_model_from_store()
+
 async def train_initial_model():
     """İlk model eğitimi"""
     global current_model, model_info
@@ -93,8 +240,10 @@ async def train_initial_model():
             'training_date': datetime.now().isoformat()
         }
         
-        logger.info(f"İlk model eğitimi tamamlandı: {best_model_name}")
+        setup_drift_monitor(data)
         
+        logger.info(f"İlk model eğitimi tamamlandı: {best_model_name}")
+    
     except Exception as e:
         logger.error(f"Model eğitimi hatası: {e}")
         raise
@@ -122,7 +271,7 @@ async def load_best_model():
         }
         
         return model, model_info
-        
+    
     except Exception as e:
         logger.warning(f"Model yükleme hatası: {e}")
         return None, None
@@ -139,8 +288,10 @@ async def root():
             "health": "/health",
             "predict": "/predict",
             "predict_batch": "/predict/batch",
+            "predict_batch_compact": "/predict/batch/compact",
             "model_info": "/model/info",
             "retrain": "/model/retrain",
+            "drift": "/monitoring/drift",
             "docs": "/docs",
             "redoc": "/redoc"
         }
@@ -189,6 +340,8 @@ async def predict_iris(features: IrisFeatures):
         prediction = current_model.predict(input_data)[0]
         probabilities = current_model.predict_proba(input_data)[0]
         
+        track_predictions(input_data, np.array([prediction]), probabilities.reshape(1, -1))
+        
         # Sınıf isimlerini al
         class_names = ['setosa', 'versicolor', 'virginica']
         predicted_class = class_names[prediction]
@@ -207,7 +360,7 @@ async def predict_iris(features: IrisFeatures):
             model_version=model_info['version'] if model_info else "unknown",
             timestamp=datetime.now()
         )
-        
+    
     except Exception as e:
         logger.error(f"Tahmin hatası: {e}")
         raise HTTPException(status_code=500, detail=f"Tahmin hatası: {str(e)}")
@@ -220,6 +373,8 @@ async def predict_batch(features_list: List[IrisFeatures]):
             raise HTTPException(status_code=503, detail="Model yüklenemedi")
         
         predictions = []
+        predicted_indices = []
+        predicted_probabilities = []
         
         for features in features_list:
             input_data = np.array([[
@@ -231,6 +386,8 @@ async def predict_batch(features_list: List[IrisFeatures]):
             
             prediction = current_model.predict(input_data)[0]
             probabilities = current_model.predict_proba(input_data)[0]
+            predicted_indices.append(prediction)
+            predicted_probabilities.append(probabilities)
             
             class_names = ['setosa', 'versicolor', 'virginica']
             predicted_class = class_names[prediction]
@@ -249,12 +406,62 @@ async def predict_batch(features_list: List[IrisFeatures]):
                 timestamp=datetime.now()
             ))
         
-        return predictions
+        if features_list:
+            track_predictions(
+                np.array([[f.sepal_length, f.sepal_width, f.petal_length, f.petal_width]
+                          for f in features_list]),
+                np.array(predicted_indices),
+                np.array(predicted_probabilities)
+            )
         
+        return predictions
+    
     except Exception as e:
         logger.error(f"Toplu tahmin hatası: {e}")
         raise HTTPException(status_code=500, detail=f"Toplu tahmin hatası: {str(e)}")
 
+@app.post("/predict/batch/compact", response_model=CompactBatchPredictionResponse)
+async def predict_batch_compact(features_list: List[IrisFeatures]):
+    """Kompakt toplu tahmin - tek matris çağrısı, paralel diziler"""
+    try:
+        if current_model is None:
+            raise HTTPException(status_code=503, detail="Model yüklenemedi")
+        
+        # Tüm satırları tek bir matriste topla
+        input_data = np.array([
+            [f.sepal_length, f.sepal_width, f.petal_length, f.petal_width]
+            for f in features_list
+        ], dtype=np.float64).reshape(-1, 4)
+        
+        if len(input_data):
+            predictions = current_model.predict(input_data).astype(np.int64)
+            probabilities = current_model.predict_proba(input_data)
+        else:
+            predictions = np.empty(0, dtype=np.int64)
+            probabilities = np.empty((0, len(current_model.classes_)))
+        
+        track_predictions(input_data, predictions, probabilities)
+        
+        # Pydantic'i atla, numpy dizilerini doğrudan orjson ile serileştir
+        payload = {
+            "model_version": model_info['version'] if model_info else "unknown",
+            "timestamp": datetime.now(),
+            "classes": ['setosa', 'versicolor', 'virginica'],
+            "predictions": predictions,
+            "probabilities": probabilities
+        }
+        
+        return Response(
+            content=orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+            media_type="application/json"
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Kompakt toplu tahmin hatası: {e}")
+        raise HTTPException(status_code=500, detail=f"Kompakt toplu tahmin hatası: {str(e)}")
+
 @app.get("/model/info", response_model=ModelInfo)
 async def get_model_info():
     """Model bilgilerini getir"""
@@ -281,7 +488,7 @@ async def retrain_model():
         
         # Yeni experiment ile eğit
         experiment_name = f"iris_retrain_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        models = train_models(X_train, y_train, experiment_name=experiment_name)
+        models = train_models(X_train, y_train, X_test, y_test, experiment_name=experiment_name)
         
         # En iyi modeli seç
         best_model_name = max(models.keys(), key=lambda k: models[k]['accuracy'])
@@ -296,6 +503,9 @@ async def retrain_model():
             'experiment_name': experiment_name
         }
         
+        setup_drift_monitor(data)
+        publish_model()
+        
         logger.info(f"Model yeniden eğitimi tamamlandı: {best_model_name}")
         
         return {
@@ -304,11 +514,28 @@ async def retrain_model():
             "accuracy": models[best_model_name]['accuracy'],
             "experiment_name": experiment_name
         }
-        
+    
     except Exception as e:
         logger.error(f"Model yeniden eğitimi hatası: {e}")
         raise HTTPException(status_code=500, detail=f"Model yeniden eğitimi hatası: {str(e)}")
 
+@app.get("/monitoring/drift")
+async def get_drift_report():
+    """Canlı trafik için özellik drift raporu"""
+    if drift_monitor is None:
+        raise HTTPException(status_code=404, detail="Drift izleyici başlatılmadı (referans istatistik yok)")
+    
+    try:
+        return drift_monitor.report()
+    except Exception as e:
+        logger.error(f"Drift raporu hatası: {e}")
+        raise HTTPException(status_code=500, detail=f"Drift raporu hatası: {str(e)}")
+
+@app.get("/monitoring/prediction-log")
+async def get_prediction_log_stats():
+    """Tahmin kaydı istatistikleri"""
+    return {"enabled": PREDICTION_LOG_ENABLED, **prediction_logger.stats()}
+
 @app.get("/experiments")
 async def list_experiments():
     """MLflow deneylerini listele"""
@@ -325,7 +552,7 @@ async def list_experiments():
                 for exp in experiments
             ]
         }
-        
+    
     except Exception as e:
         logger.error(f"Deney listesi hatası: {e}")
         raise HTTPException(status_code=500, detail=f"Deney listesi hatası: {str(e)}")
@@ -336,4 +563,4 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True
-    ) 
\ No newline at end of file
+    )
\ No newline at end of file
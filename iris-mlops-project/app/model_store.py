@@ -0,0 +1,152 @@
+import joblib
+import json
+import logging
+import os
+import shutil
+from typing import Any, Optional, Tuple
+import numpy as np
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+logger = logging.getLogger(__name__)
+
+class FlatForest:
+    """
+    Karar ağacı (topluluğu) sınıflandırıcısının bellek eşlemeye uygun hali
+    
+    sklearn ağaçları unpickle sırasında düğüm dizilerini kendi belleğine
+    kopyalar, bu yüzden mmap ile açılsalar da her worker kendi kopyasını
+    tutar. Burada tüm ağaçların düğümleri birkaç düz ndarray'de birleştirilir;
+    tahmin tüm satırlar ve ağaçlar için numpy ile seviye seviye ilerler ve
+    sklearn'ün predict/predict_proba sonuçlarıyla aynıdır.
+    """
+    
+    def __init__(self, model: Any):
+        trees = [estimator.tree_ for estimator in getattr(model, "estimators_", [model])]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+        
+        def children(attr):
+            # Yaprak (-1) korunur, diğer indeksler birleşik diziye kaydırılır
+            return np.concatenate([
+                np.where(getattr(tree, attr) == -1, -1, getattr(tree, attr) + offset)
+                for tree, offset in zip(trees, offsets)
+            ]).astype(np.int64)
+        
+        self.roots = offsets.astype(np.int64)
+        self.left = children("children_left")
+        self.right = children("children_right")
+        self.feature = np.concatenate([tree.feature for tree in trees]).astype(np.int64)
+        self.threshold = np.concatenate([tree.threshold for tree in trees])
+        value = np.concatenate([tree.value[:, 0, :] for tree in trees])
+        self.value = value / value.sum(axis=1, keepdims=True)
+        self.max_depth = max(tree.max_depth for tree in trees)
+        self.classes_ = np.asarray(model.classes_)
+        self.n_features_in_ = model.n_features_in_
+        self.source_class = type(model).__name__
+    
+    @staticmethod
+    def supports(model: Any) -> bool:
+        return (isinstance(model, (RandomForestClassifier, ExtraTreesClassifier, DecisionTreeClassifier))
+                and getattr(model, "n_outputs_", 1) == 1)
+    
+    def predict_proba(self, X) -> np.ndarray:
+        # sklearn ağaçları gibi float32 girdiyle karşılaştır
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.tile(self.roots, (len(X), 1))
+        for _ in range(self.max_depth):
+            left = self.left[nodes]
+            internal = left != -1
+            if not internal.any():
+                break
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(internal, np.where(go_left, left, self.right[nodes]), nodes)
+        return self.value[nodes].mean(axis=1)
+    
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(self.predict_proba(X).argmax(axis=1))
+
+class ModelStore:
+    """
+    Worker'lar arasında paylaşılan, versiyonlu model deposu
+    
+    Her versiyon ayrı bir dizine sıkıştırılmamış joblib dosyası olarak yazılır
+    ve worker'lar onu mmap_mode='r' ile açar. Böylece numpy dizileri işletim
+    sisteminin sayfa önbelleğinden paylaşılır, her worker kendi kopyasını
+    tutmaz. Ağaç tabanlı modeller bu yüzden FlatForest olarak yazılır. Aktif versiyon CURRENT dosyasıyla gösterilir ve atomik olarak
+    değiştirilir; tüm worker'lar aynı dosyayı okuyarak aynı modele geçer.
+    """
+    
+    def __init__(self, root: str, keep_versions: int = 3):
+        self.root = root
+        self.keep_versions = keep_versions
+        self.pointer_path = os.path.join(root, "CURRENT")
+        os.makedirs(root, exist_ok=True)
+    
+    def current_version(self) -> Optional[str]:
+        """Aktif versiyon adını oku"""
+        try:
+            with open(self.pointer_path) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+    
+    def publish(self, model: Any, info: dict) -> str:
+        """Modeli yeni bir versiyon olarak yaz ve aktif yap"""
+        while True:
+            version = f"v{self._latest_number() + 1}"
+            tmp_dir = os.path.join(self.root, f".{version}.{os.getpid()}.tmp")
+            os.makedirs(tmp_dir, exist_ok=True)
+            
+            # mmap ile açılabilmesi için sıkıştırma kullanılmaz
+            stored = FlatForest(model) if FlatForest.supports(model) else model
+            joblib.dump(stored, os.path.join(tmp_dir, "model.joblib"), compress=0)
+            with open(os.path.join(tmp_dir, "info.json"), "w") as f:
+                json.dump({**info, 'store_version': version, 'store_layout': type(stored).__name__}, f, default=str)
+            
+            try:
+                os.rename(tmp_dir, os.path.join(self.root, version))
+                break
+            except OSError:
+                # Başka bir worker aynı versiyonu yayınladı, tekrar dene
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        
+        tmp_pointer = f"{self.pointer_path}.{os.getpid()}.tmp"
+        with open(tmp_pointer, "w") as f:
+            f.write(version)
+        os.replace(tmp_pointer, self.pointer_path)
+        
+        self._cleanup()
+        logger.info(f"Model depoya yayınlandı: {version}")
+        return version
+    
+    def load(self, version: Optional[str] = None) -> Tuple[Any, dict]:
+        """Bir versiyonu bellek eşlemeli olarak yükle"""
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"Model deposunda aktif versiyon yok: {self.root}")
+        
+        version_dir = os.path.join(self.root, version)
+        model = joblib.load(os.path.join(version_dir, "model.joblib"), mmap_mode="r")
+        with open(os.path.join(version_dir, "info.json")) as f:
+            info = json.load(f)
+        
+        logger.info(f"Model depodan yüklendi: {version}")
+        return model, info
+    
+    def _versions(self) -> list:
+        return sorted(
+            (d for d in os.listdir(self.root) if d.startswith("v") and d[1:].isdigit()),
+            key=lambda d: int(d[1:])
+        )
+    
+    def _latest_number(self) -> int:
+        versions = self._versions()
+        return int(versions[-1][1:]) if versions else 0
+    
+    def _cleanup(self):
+        # Eski versiyonları sil; açık mmap'ler Linux'ta inode silinse de geçerli kalır
+        current = self.current_version()
+        for version in self._versions()[:-self.keep_versions]:
+            if version != current:
+                shutil.rmtree(os.path.join(self.root, version), ignore_errors=True)
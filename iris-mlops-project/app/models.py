@@ -49,6 +49,28 @@ class PredictionResponse(BaseModel):
             }
         }
 
+class CompactBatchPredictionResponse(BaseModel):
+    """Kompakt toplu tahmin sonucu (satır başına nesne yerine paralel diziler)"""
+    model_version: str = Field(..., description="Model versiyonu")
+    timestamp: datetime = Field(..., description="Tahmin zamanı")
+    classes: List[str] = Field(..., description="Sınıf isimleri (indeks sırasıyla)")
+    predictions: List[int] = Field(..., description="Her satır için tahmin edilen sınıf indeksi")
+    probabilities: List[List[float]] = Field(..., description="Satır x sınıf olasılık matrisi")
+    
+    class Config:
+        schema_extra = {
+            "example": {
+                "model_version": "1.0.0",
+                "timestamp": "2024-01-15T10:30:00",
+                "classes": ["setosa", "versicolor", "virginica"],
+                "predictions": [0, 1],
+                "probabilities": [
+                    [0.95, 0.03, 0.02],
+                    [0.01, 0.87, 0.12]
+                ]
+            }
+        }
+
 class ModelInfo(BaseModel):
     """Model bilgileri"""
     name: str = Field(..., description="Model adı")
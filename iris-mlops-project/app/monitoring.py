@@ -0,0 +1,293 @@
+import numpy as np
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# PSI eşikleri (yaygın kullanılan değerler)
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+
+class RunningStats:
+    """Welford algoritması ile özellik vektörü için akan ortalama/varyans"""
+    
+    def __init__(self, n_features: int):
+        self.count = 0
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+    
+    def update(self, X: np.ndarray):
+        """Bir grup satırı Chan birleştirme formülü ile ekle"""
+        n_b = len(X)
+        if n_b == 0:
+            return
+        mean_b = X.mean(axis=0)
+        m2_b = ((X - mean_b) ** 2).sum(axis=0)
+        
+        n_a = self.count
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * (n_b / n)
+        self.m2 = self.m2 + m2_b + delta ** 2 * (n_a * n_b / n)
+        self.count = n
+    
+    @property
+    def std(self) -> np.ndarray:
+        if self.count == 0:
+            return np.zeros_like(self.mean)
+        return np.sqrt(self.m2 / self.count)
+
+class QuantileSketch:
+    """
+    Sabit bellekli, toplu güncellenen kantil taslağı
+    
+    Her özellik için [low, high] aralığı n_bins eşit kutuya bölünür; aralık
+    dışındaki değerler uç kutulara düşer ve gözlenen min/max ayrıca tutulur.
+    Güncelleme özellik başına tek searchsorted + bincount'tur (satır başına
+    Python döngüsü yok). Kantil, kümülatif sayımlar üzerinde kutu içi doğrusal
+    enterpolasyonla okunur; aralık içindeki hata en fazla bir kutu genişliğidir.
+    """
+    
+    def __init__(self, low: np.ndarray, high: np.ndarray, n_bins: int = 2048):
+        self.edges = np.linspace(low, high, n_bins + 1).T
+        self.counts = np.zeros((len(low), n_bins + 2), dtype=np.int64)
+        self.minimum = np.full(len(low), np.inf)
+        self.maximum = np.full(len(low), -np.inf)
+    
+    def update(self, X: np.ndarray):
+        if len(X) == 0:
+            return
+        for j in range(X.shape[1]):
+            idx = np.searchsorted(self.edges[j], X[:, j], side='right')
+            self.counts[j] += np.bincount(idx, minlength=self.counts.shape[1])
+        self.minimum = np.minimum(self.minimum, X.min(axis=0))
+        self.maximum = np.maximum(self.maximum, X.max(axis=0))
+    
+    def quantiles(self, levels: List[float]) -> Optional[np.ndarray]:
+        """(seviye x özellik) kantil tahminleri; veri yoksa None"""
+        total = self.counts[0].sum()
+        if total == 0:
+            return None
+        result = np.empty((len(levels), self.counts.shape[0]))
+        for j, counts in enumerate(self.counts):
+            cumulative = np.cumsum(counts)
+            # Kutu sınırları: uç kutular gözlenen min/max'a kadar uzanır
+            lower = np.concatenate([[self.minimum[j]], self.edges[j]])
+            upper = np.concatenate([self.edges[j], [self.maximum[j]]])
+            for i, p in enumerate(levels):
+                rank = p * total
+                b = min(int(np.searchsorted(cumulative, rank, side='left')), len(counts) - 1)
+                before = cumulative[b - 1] if b > 0 else 0
+                fraction = (rank - before) / counts[b] if counts[b] else 0.0
+                value = lower[b] + fraction * (upper[b] - lower[b])
+                result[i, j] = min(max(value, self.minimum[j]), self.maximum[j])
+        return result
+
+class RollingWindow:
+    """
+    Son N satırı tutan sabit boyutlu halka tampon
+    
+    Ekleme tek bir dilim kopyasıdır; histogram rapor anında tampon üzerinden
+    vektörel hesaplanır, tahmin yolunda satır başına iş yapılmaz.
+    """
+    
+    def __init__(self, n_columns: int, size: int):
+        self.size = size
+        self.buffer = np.empty((size, n_columns), dtype=np.float64)
+        self.filled = 0
+        self.next = 0
+    
+    def update(self, X: np.ndarray):
+        n = len(X)
+        if n >= self.size:
+            self.buffer[:] = X[-self.size:]
+            self.filled = self.size
+            self.next = 0
+            return
+        
+        end = self.next + n
+        if end <= self.size:
+            self.buffer[self.next:end] = X
+        else:
+            first = self.size - self.next
+            self.buffer[self.next:] = X[:first]
+            self.buffer[:n - first] = X[first:]
+        self.next = end % self.size
+        self.filled = min(self.filled + n, self.size)
+    
+    def rows(self) -> np.ndarray:
+        return self.buffer[:self.filled]
+
+class GroupStats:
+    """
+    Bir grup (tüm trafik ya da tek bir tahmin sınıfı) için istatistikler
+    
+    Ortalama/varyans ve kantiller başlangıçtan beri birikimlidir (O(1)
+    bellek); PSI histogramı son window_size satırlık pencereden hesaplanır.
+    """
+    
+    def __init__(self, low: np.ndarray, high: np.ndarray, window_size: int):
+        self.running = RunningStats(len(low))
+        self.quantiles = QuantileSketch(low, high)
+        self.window = RollingWindow(len(low), window_size)
+    
+    @property
+    def count(self) -> int:
+        return self.running.count
+    
+    def update(self, X: np.ndarray):
+        self.running.update(X)
+        self.quantiles.update(X)
+        self.window.update(X)
+
+def histogram_proportions(X: np.ndarray, bin_edges: np.ndarray) -> np.ndarray:
+    """Her özelliğin sabit kutulardaki oranları (özellik x kutu)"""
+    n_bins = bin_edges.shape[1] + 1
+    counts = np.stack([
+        np.bincount(np.searchsorted(bin_edges[j], X[:, j], side='right'), minlength=n_bins)
+        for j in range(bin_edges.shape[0])
+    ])
+    return counts / max(len(X), 1)
+
+def population_stability_index(actual: np.ndarray, expected: np.ndarray, eps: float = 1e-4) -> np.ndarray:
+    """Son eksende PSI hesapla"""
+    actual = np.clip(actual, eps, None)
+    expected = np.clip(np.asarray(expected, dtype=np.float64), eps, None)
+    return ((actual - expected) * np.log(actual / expected)).sum(axis=-1)
+
+def drift_status(score: float) -> str:
+    """PSI skorunu etikete çevir"""
+    if score >= PSI_SIGNIFICANT:
+        return "drift"
+    if score >= PSI_MODERATE:
+        return "moderate"
+    return "stable"
+
+class DriftMonitor:
+    """
+    Canlı tahmin trafiği için sabit bellekli drift izleyici
+    
+    Tahmin yolundan gelen özellik vektörlerini tüm trafik ve tahmin edilen
+    sınıf bazında toplar ve eğitim anında alınan referans istatistikleriyle
+    karşılaştırır. Ortalama/standart sapma (Welford/Chan) ve kantiller
+    (QuantileSketch) başlangıçtan beri birikimlidir; PSI ve tahmin dağılımı
+    son window_size satırlık pencereden hesaplanır. Rapordaki
+    statistics_scope alanı hangisinin hangisi olduğunu belirtir.
+    
+    Tüm güncellemeler toplu numpy işlemleridir. İzleyici yalnızca event
+    loop'taki async handler'lardan kullanılır, bu yüzden kilit tutulmaz.
+    """
+    
+    def __init__(self, reference: dict, window_size: int = 2000):
+        self.reference = reference
+        self.feature_names = reference['feature_names']
+        self.class_names = reference['class_names']
+        self.quantile_levels = reference['quantile_levels']
+        self.bin_edges = np.asarray(reference['bin_edges'], dtype=np.float64)
+        self.window_size = window_size
+        self.started_at = datetime.now()
+        
+        # Kantil taslağı aralığı: referans ortalamasının ±6 standart sapması
+        ref_all = reference['groups']['all']
+        spread = 6 * np.maximum(np.asarray(ref_all['std']), 1e-6)
+        low = np.asarray(ref_all['mean']) - spread
+        high = np.asarray(ref_all['mean']) + spread
+        
+        self.groups: Dict[str, GroupStats] = {'all': GroupStats(low, high, window_size)}
+        for class_name in self.class_names:
+            self.groups[class_name] = GroupStats(low, high, window_size)
+        self.predictions = RollingWindow(1, window_size)
+    
+    def update(self, X: np.ndarray, predictions: np.ndarray):
+        """Tahmin edilen satırları ve sınıf indekslerini ekle"""
+        X = np.asarray(X, dtype=np.float64)
+        predictions = np.asarray(predictions, dtype=np.int64)
+        if len(X) == 0:
+            return
+        
+        self.groups['all'].update(X)
+        for class_idx, class_name in enumerate(self.class_names):
+            mask = predictions == class_idx
+            if mask.any():
+                self.groups[class_name].update(X[mask])
+        self.predictions.update(predictions.reshape(-1, 1))
+    
+    def _group_report(self, name: str, group: GroupStats) -> dict:
+        ref = self.reference['groups'].get(name)
+        window = group.window.rows()
+        live_hist = histogram_proportions(window, self.bin_edges)
+        psi = population_stability_index(live_hist, ref['histogram']) if ref else None
+        live_mean = group.running.mean
+        live_std = group.running.std
+        live_quantiles = group.quantiles.quantiles(self.quantile_levels)
+        
+        features = {}
+        for j, feature in enumerate(self.feature_names):
+            entry = {
+                'live_mean': float(live_mean[j]),
+                'live_std': float(live_std[j]),
+                'live_quantiles': {
+                    f"p{int(p * 100)}": float(q)
+                    for p, q in zip(self.quantile_levels, live_quantiles[:, j])
+                }
+            }
+            if ref:
+                ref_std = ref['std'][j]
+                entry.update({
+                    'ref_mean': ref['mean'][j],
+                    'ref_std': ref_std,
+                    'ref_quantiles': {
+                        f"p{int(p * 100)}": q
+                        for p, q in zip(self.quantile_levels, ref['quantiles'][j])
+                    },
+                    'mean_shift': abs(entry['live_mean'] - ref['mean'][j]) / ref_std if ref_std > 0 else 0.0,
+                    'psi': float(psi[j])
+                })
+            features[feature] = entry
+        
+        drift_score = float(psi.max()) if psi is not None else None
+        return {
+            'count': group.count,
+            'window_count': len(window),
+            'drift_score': drift_score,
+            'status': drift_status(drift_score) if drift_score is not None else "no_reference",
+            'features': features
+        }
+    
+    def report(self) -> dict:
+        """Drift raporunu üret"""
+        groups = {
+            name: self._group_report(name, group)
+            for name, group in self.groups.items()
+            if group.count > 0
+        }
+        predictions = self.predictions.rows()[:, 0].astype(np.int64)
+        total = len(predictions)
+        live_distribution = np.bincount(predictions, minlength=len(self.class_names)) / max(total, 1)
+        prediction_psi = float(population_stability_index(
+            live_distribution, self.reference['class_distribution']
+        )) if total else None
+        
+        overall = groups.get('all', {}).get('drift_score')
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'monitoring_since': self.started_at.isoformat(),
+            'window_size': self.window_size,
+            'statistics_scope': {
+                'live_mean': 'cumulative',
+                'live_std': 'cumulative',
+                'live_quantiles': 'cumulative',
+                'psi': 'window',
+                'prediction_distribution': 'window'
+            },
+            'reference_created_at': self.reference.get('created_at'),
+            'drift_score': overall,
+            'status': drift_status(overall) if overall is not None else "no_data",
+            'prediction_distribution': {
+                'live': dict(zip(self.class_names, live_distribution.tolist())),
+                'reference': dict(zip(self.class_names, self.reference['class_distribution'])),
+                'psi': prediction_psi
+            },
+            'groups': groups
+        }
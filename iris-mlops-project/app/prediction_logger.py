@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+import logging
+import os
+import glob
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from .data_processor import get_feature_names, get_target_names
+
+logger = logging.getLogger(__name__)
+
+class PredictionLogger:
+    """
+    Tahminleri yeniden eğitim için diske yazan bloklamayan kayıtçı
+    
+    İstek yolu yalnızca sınırlı bir kuyruğa ekleme yapar; diske yazma işini
+    arka plandaki tek bir thread üstlenir. Kayıtlar sıkıştırılmış Parquet
+    segmentlerine yazılır ve segmentler satır sayısı ya da süreye göre döner.
+    Kuyruk doluysa istek beklemez, kayıt düşürülür ve sayılır.
+    """
+    
+    def __init__(self, log_dir: str = "data/predictions", max_queue_size: int = 1000,
+                 segment_rows: int = 50000, flush_interval: float = 30.0,
+                 max_segments: Optional[int] = None, compression: str = "zstd"):
+        self.log_dir = log_dir
+        self.segment_rows = segment_rows
+        self.flush_interval = flush_interval
+        self.max_segments = max_segments
+        self.compression = compression
+        
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = None
+        self._stop = threading.Event()
+        self._buffer = []
+        self._buffered_rows = 0
+        self._segment_seq = 0
+        
+        self.logged_rows = 0
+        self.dropped_rows = 0
+        self.written_segments = 0
+    
+    def start(self):
+        """Arka plan yazıcıyı başlat"""
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="prediction-logger", daemon=True)
+        self._thread.start()
+        logger.info(f"Tahmin kaydı başlatıldı: {self.log_dir}")
+    
+    def stop(self, timeout: float = 10.0):
+        """Kuyruğu boşalt, kalan kayıtları yaz ve thread'i durdur"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info("Tahmin kaydı durduruldu")
+    
+    def log(self, input_data: np.ndarray, predictions: np.ndarray,
+            probabilities: np.ndarray, model_version: str):
+        """Bir grup tahmini kuyruğa ekle (asla bloklamaz)"""
+        n_rows = len(input_data)
+        if n_rows == 0:
+            return
+        record = (datetime.now(), model_version,
+                  np.asarray(input_data, dtype=np.float64),
+                  np.asarray(predictions, dtype=np.int64),
+                  np.asarray(probabilities, dtype=np.float64))
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_rows += n_rows
+    
+    def stats(self) -> dict:
+        """Kayıt istatistikleri"""
+        return {
+            'log_dir': self.log_dir,
+            'queued_batches': self._queue.qsize(),
+            'buffered_rows': self._buffered_rows,
+            'logged_rows': self.logged_rows,
+            'dropped_rows': self.dropped_rows,
+            'written_segments': self.written_segments
+        }
+    
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            try:
+                record = self._queue.get(timeout=0.5)
+                self._buffer.append(record)
+                self._buffered_rows += len(record[2])
+            except queue.Empty:
+                if self._stop.is_set():
+                    break
+            
+            elapsed = time.monotonic() - last_flush
+            if self._buffered_rows >= self.segment_rows or (
+                    self._buffered_rows and elapsed >= self.flush_interval):
+                self._flush()
+                last_flush = time.monotonic()
+        
+        self._flush()
+    
+    def _flush(self):
+        """Tamponu tek bir Parquet segmentine yaz"""
+        if not self._buffer:
+            return
+        
+        records, self._buffer = self._buffer, []
+        n_rows, self._buffered_rows = self._buffered_rows, 0
+        
+        try:
+            frame = self._to_frame(records)
+            self._segment_seq += 1
+            name = f"predictions-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._segment_seq:05d}.parquet"
+            path = os.path.join(self.log_dir, name)
+            
+            # Önce gizli geçici dosyaya yaz, sonra atomik olarak yeniden adlandır
+            tmp_path = os.path.join(self.log_dir, f".{name}.tmp")
+            frame.to_parquet(tmp_path, index=False, compression=self.compression)
+            os.replace(tmp_path, path)
+            
+            self.logged_rows += n_rows
+            self.written_segments += 1
+            self._enforce_retention()
+        except Exception as e:
+            self.dropped_rows += n_rows
+            logger.error(f"Tahmin segmenti yazma hatası: {e}")
+    
+    def _to_frame(self, records) -> pd.DataFrame:
+        feature_names = get_feature_names()
+        class_names = np.array(get_target_names())
+        
+        X = np.concatenate([r[2] for r in records])
+        y = np.concatenate([r[3] for r in records])
+        proba = np.concatenate([r[4] for r in records])
+        counts = [len(r[2]) for r in records]
+        
+        frame = pd.DataFrame(X, columns=feature_names)
+        # preprocess_data ile uyumlu olması için tahmin 'target' olarak yazılır
+        frame['target'] = y
+        frame['target_name'] = class_names[y]
+        frame['confidence'] = proba.max(axis=1)
+        for j, class_name in enumerate(class_names):
+            frame[f'proba_{class_name}'] = proba[:, j]
+        frame['model_version'] = np.repeat([str(r[1]) for r in records], counts)
+        frame['timestamp'] = np.repeat(np.array([r[0] for r in records], dtype='datetime64[us]'), counts)
+        return frame
+    
+    def _enforce_retention(self):
+        if not self.max_segments:
+            return
+        segments = sorted(glob.glob(os.path.join(self.log_dir, "predictions-*.parquet")), key=os.path.getmtime)
+        for path in segments[:-self.max_segments]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Eski segment silinemedi {path}: {e}")
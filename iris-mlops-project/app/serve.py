@@ -0,0 +1,70 @@
+"""
+Production başlatıcı: modeli bir kez hazırla, N worker fork et
+
+Kullanım:
+    python -m app.serve --workers 4 --port 8006
+
+Master süreç modeli (MLflow'dan ya da eğiterek) bir kez hazırlar ve
+paylaşılan model deposuna yazar. Uygulama master'da önceden import edilir
+(preload), worker'lar fork ile kütüphane belleğini paylaşır ve modeli
+depodan bellek eşlemeli olarak açar. Bir worker'da /model/retrain
+çağrıldığında yeni versiyon depoya yayınlanır, diğer worker'lar
+MODEL_STORE_POLL_INTERVAL içinde aynı versiyona geçer.
+"""
+import argparse
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Iris Classification API production başlatıcı")
+    parser.add_argument("--host", default=os.getenv("API_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8006")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WORKERS", os.cpu_count() or 1)))
+    parser.add_argument("--model-store", default=os.getenv("MODEL_STORE_DIR", "models/store"))
+    parser.add_argument("--timeout", type=int, default=int(os.getenv("WORKER_TIMEOUT", "120")))
+    return parser.parse_args()
+
+async def prepare_master(api):
+    """Modeli master'da bir kez hazırla; worker'lar devralmasın, depodan açsın"""
+    await api.prepare_model_store()
+    api.release_model()
+
+def main():
+    args = parse_args()
+    
+    # app.main import edilmeden önce ayarlanmalı
+    os.environ["MODEL_STORE_DIR"] = args.model_store
+    
+    from gunicorn.app.base import BaseApplication
+    from . import main as api
+    
+    # Modeli master'da bir kez hazırla; worker'lar depodan açar
+    asyncio.run(prepare_master(api))
+    logger.info(f"Model deposu hazır: {args.model_store} ({api.model_store.current_version()})")
+    
+    class IrisApplication(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+        
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            return self.application
+    
+    IrisApplication(api.app, {
+        "bind": f"{args.host}:{args.port}",
+        "workers": args.workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "timeout": args.timeout
+    }).run()
+
+if __name__ == "__main__":
+    main()
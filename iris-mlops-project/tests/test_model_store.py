@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from sklearn.datasets import load_iris
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from app.model_store import FlatForest, ModelStore
+
+@pytest.fixture(scope="module")
+def iris():
+    X, y = load_iris(return_X_y=True)
+    # Eğitim verisi dışındaki bölgeleri de kapsayan rastgele satırlar
+    rng = np.random.default_rng(0)
+    X_eval = np.vstack([X, rng.uniform(0, 8, size=(1000, 4))])
+    return X, y, X_eval
+
+@pytest.mark.parametrize("model", [
+    RandomForestClassifier(n_estimators=100, random_state=42),
+    ExtraTreesClassifier(n_estimators=50, random_state=0),
+    DecisionTreeClassifier(random_state=0)
+])
+def test_flat_forest_matches_sklearn(iris, model):
+    """Düzleştirilmiş ağaçlar sklearn ile aynı olasılıkları ve sınıfları üretir"""
+    X, y, X_eval = iris
+    model.fit(X, y)
+    flat = FlatForest(model)
+    
+    assert np.allclose(flat.predict_proba(X_eval), model.predict_proba(X_eval))
+    assert (flat.predict(X_eval) == model.predict(X_eval)).all()
+
+def test_publish_load_round_trip(iris, tmp_path):
+    """Ağaç modeli FlatForest olarak yazılır ve bellek eşlemeli açılır"""
+    X, y, X_eval = iris
+    model = RandomForestClassifier(n_estimators=100, random_state=42).fit(X, y)
+    store = ModelStore(str(tmp_path))
+    
+    version = store.publish(model, {'model_name': 'random_forest', 'version': '1.0.0'})
+    loaded, info = store.load()
+    
+    assert store.current_version() == version
+    assert info['store_layout'] == "FlatForest"
+    assert info['model_name'] == "random_forest"
+    assert isinstance(loaded, FlatForest)
+    assert isinstance(loaded.left, np.memmap)
+    assert np.allclose(loaded.predict_proba(X_eval), model.predict_proba(X_eval))
+
+def test_non_tree_model_stored_as_is(iris, tmp_path):
+    """Ağaç olmayan modeller olduğu gibi yazılır"""
+    X, y, X_eval = iris
+    model = LogisticRegression(max_iter=500).fit(X, y)
+    store = ModelStore(str(tmp_path))
+    
+    store.publish(model, {})
+    loaded, info = store.load()
+    
+    assert info['store_layout'] == "LogisticRegression"
+    assert np.allclose(loaded.predict_proba(X_eval), model.predict_proba(X_eval))
@@ -0,0 +1,45 @@
+import asyncio
+import importlib
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier
+
+from app.model_store import FlatForest
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """Model deposu açık, geçici dizinlerle yeniden import edilmiş app.main"""
+    monkeypatch.setenv("MODEL_STORE_DIR", str(tmp_path / "store"))
+    monkeypatch.setenv("REFERENCE_STATS_PATH", str(tmp_path / "reference_stats.json"))
+    monkeypatch.setenv("PREDICTION_LOG_ENABLED", "false")
+    from app import main
+    main = importlib.reload(main)
+    
+    async def train_without_mlflow():
+        X, y = load_iris(return_X_y=True)
+        main.current_model = RandomForestClassifier(n_estimators=50, random_state=42).fit(X, y)
+        main.model_info = {'model_name': 'random_forest', 'version': '1.0.0'}
+    
+    monkeypatch.setattr(main, "load_or_train_model", train_without_mlflow)
+    return main
+
+def test_worker_serves_mmap_model_from_store(api):
+    """Master boş depoda eğitip yayınlar; worker master'ın heap modelini değil depodaki mmap modeli kullanır"""
+    from app.serve import prepare_master
+    
+    asyncio.run(prepare_master(api))
+    assert api.model_store.current_version() == "v1"
+    assert api.current_model is None
+    
+    # Fork edilen worker'ın başlangıcı
+    with TestClient(api.app) as client:
+        assert isinstance(api.current_model, FlatForest)
+        assert isinstance(api.current_model.threshold, np.memmap)
+        
+        response = client.post("/predict", json={
+            "sepal_length": 5.1, "sepal_width": 3.5, "petal_length": 1.4, "petal_width": 0.2
+        })
+        assert response.status_code == 200
+        assert response.json()["prediction"] == "setosa"
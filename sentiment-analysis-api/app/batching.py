@@ -0,0 +1,126 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+class MicroBatcher:
+    """
+    Eşzamanlı tekil istekleri kısa pencerelerde toplayıp tek seferde skorlar
+    
+    Her /predict isteği bir kuyruğa eklenir. Arka plandaki görev, ilk isteği
+    aldıktan sonra en fazla max_wait_ms kadar (ya da max_batch_size dolana
+    kadar) bekleyip gelen metinleri tek bir predict_batch çağrısında toplar.
+    Skorlama bir thread havuzunda çalışır, event loop bloklanmaz.
+    """
+    
+    def __init__(self, predict_batch_fn, max_batch_size=64, max_wait_ms=5.0, max_workers=2):
+        self.predict_batch_fn = predict_batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_workers = max_workers
+        self.executor = None
+        self._queue = None
+        self._task = None
+        self._slots = None
+        self._inflight = set()
+        
+        # İstatistikler
+        self.batches = 0
+        self.items = 0
+    
+    async def start(self):
+        """Toplama görevini başlat"""
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scoring")
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_workers)
+        self._task = asyncio.create_task(self._collect())
+    
+    async def stop(self):
+        """
+        Toplama görevini ve thread havuzunu durdur
+        
+        Skorlanmakta olan batch'ler tamamlanana kadar beklenir; kuyrukta kalan
+        istekler hata ile sonuçlandırılır, hiçbir bekleyen future askıda kalmaz.
+        """
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        if self._queue:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                self._fail([future])
+        if self.executor:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+    
+    async def submit(self, text):
+        """Tek bir metni sıraya koy ve sonucunu bekle"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+    
+    async def run(self, fn, *args):
+        """Bir fonksiyonu skorlama havuzunda çalıştır (toplu istekler için)"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+    
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+            "queued": self._queue.qsize() if self._queue else 0
+        }
+    
+    def _fail(self, futures):
+        """Servis kapanırken bekleyen future'ları hata ile sonuçlandır"""
+        for future in futures:
+            if not future.done():
+                future.set_exception(RuntimeError("Skorlama servisi kapatıldı"))
+    
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                deadline = loop.time() + self.max_wait
+                
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                
+                # Havuzda boş yer yoksa burada bekle; bu arada yeni istekler kuyrukta birikir
+                await self._slots.acquire()
+            except asyncio.CancelledError:
+                # Toplanmış ama skorlanmamış istekler durdurma sırasında kaybolmasın
+                self._fail([future for _, future in batch])
+                raise
+            
+            # Görev referansı tutulur; aksi halde çöp toplayıcı bitmemiş görevi silebilir
+            task = asyncio.create_task(self._score(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    async def _score(self, batch):
+        try:
+            texts = [text for text, _ in batch]
+            results = await self.run(self.predict_batch_fn, texts)
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
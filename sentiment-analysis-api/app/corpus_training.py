@@ -0,0 +1,331 @@
+"""
+Diskteki büyük etiketli korpuslarla bellek sınırlı (out-of-core) eğitim
+
+Kullanım:
+    python -m app.corpus_training data/reviews.jsonl --epochs 3 --n-jobs 4
+
+JSONL (her satır {"text": ..., "label": ...}) ya da CSV (text, label
+sütunları) dosyası parça parça okunur; dosya hiçbir zaman tamamen belleğe
+alınmaz. Önce tek geçişte doküman frekansları sayılıp IDF hesaplanır, ardından
+her epoch'ta parçalar hashing featurizer ile paralel vektörleştirilip
+SGDClassifier(log_loss).partial_fit ile öğrenilir. Her epoch sonunda kontrol
+noktası yazılır ve ayrılmış örneklerde doğruluk ile işlem hızı raporlanır.
+"""
+import argparse
+import json
+import os
+import time
+import zlib
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.linear_model import SGDClassifier
+from app.fast_scorer import LinearScorer
+from app.model_store import ModelStore
+from app.sentiment_model import SentimentAnalyzer
+
+CLASSES = np.array([0, 1, 2])
+
+# Sayısal olmayan etiketler için eşleme
+LABEL_NAMES = {
+    "negatif": 0, "negative": 0, "neg": 0,
+    "pozitif": 1, "positive": 1, "pos": 1,
+    "nötr": 2, "notr": 2, "neutral": 2
+}
+
+def label_id(label):
+    """Etiketi sınıf id'sine çevir (0/1/2 ya da isim)"""
+    if isinstance(label, str):
+        label = label.strip().lower()
+        if label in LABEL_NAMES:
+            return LABEL_NAMES[label]
+    return int(label)
+
+def parse_example(text, label):
+    """(metin, etiket id) çifti; metin ya da etiket eksik/geçersizse None"""
+    if text is None or label is None:
+        return None
+    try:
+        return str(text), label_id(label)
+    except (TypeError, ValueError):
+        return None
+
+def iter_corpus(path, chunk_size=10000, text_field="text", label_field="label", stats=None):
+    """
+    JSONL ya da CSV korpusu (metinler, etiketler) parçaları olarak oku
+    
+    Eksik alanlı, geçersiz etiketli ya da (JSONL'de) çözümlenemeyen satırlar
+    eğitimi durdurmaz, atlanır; stats sözlüğü verilirse atlanan satır sayısı
+    stats["skipped"] içinde biriktirilir.
+    """
+    skipped = 0
+    if path.endswith(".csv"):
+        for frame in pd.read_csv(path, usecols=[text_field, label_field], chunksize=chunk_size):
+            rows = frame.dropna()[[text_field, label_field]].itertuples(index=False)
+            valid = [e for e in (parse_example(t, l) for t, l in rows) if e is not None]
+            skipped += len(frame) - len(valid)
+            if valid:
+                texts, labels = zip(*valid)
+                yield list(texts), list(labels)
+    else:
+        texts, labels = [], []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    example = parse_example(record[text_field], record[label_field])
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    example = None
+                if example is None:
+                    skipped += 1
+                    continue
+                texts.append(example[0])
+                labels.append(example[1])
+                if len(texts) >= chunk_size:
+                    yield texts, labels
+                    texts, labels = [], []
+        if texts:
+            yield texts, labels
+    
+    if stats is not None:
+        stats["skipped"] = stats.get("skipped", 0) + skipped
+
+def is_holdout(text, holdout_fraction):
+    # Metin özetine göre ayırma: her epoch'ta aynı örnekler ayrılır, indeks tutulmaz
+    return zlib.crc32(text.encode("utf-8")) % 10000 < holdout_fraction * 10000
+
+class CorpusTrainer:
+    """
+    Hashing featurizer + SGDClassifier ile parça parça eğitim
+    
+    Bellek kullanımı korpus boyutundan bağımsızdır: bir parça, n_features
+    boyutlu doküman frekansı dizisi ve en fazla max_holdout ayrılmış örnek.
+    """
+    
+    def __init__(self, n_features=2 ** 20, chunk_size=20000, n_jobs=-1, holdout_fraction=0.02,
+                 max_holdout=50000, alpha=1e-6, checkpoint_dir="models/checkpoints", seed=42):
+        self.n_features = n_features
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs
+        self.holdout_fraction = holdout_fraction
+        self.max_holdout = max_holdout
+        self.checkpoint_dir = checkpoint_dir
+        self.rng = np.random.default_rng(seed)
+        
+        self.analyzer = SentimentAnalyzer(featurizer="hashing", n_features=n_features)
+        self.analyzer.model = SGDClassifier(loss="log_loss", alpha=alpha, random_state=seed)
+        self.epoch = 0
+        self.n_documents = 0
+        self.history = []
+        self._holdout_X = None
+        self._holdout_y = None
+    
+    def _split(self, texts, labels):
+        train_texts, train_labels, holdout_texts, holdout_labels = [], [], [], []
+        for text, label in zip(texts, labels):
+            if is_holdout(text, self.holdout_fraction):
+                holdout_texts.append(text)
+                holdout_labels.append(label)
+            else:
+                train_texts.append(text)
+                train_labels.append(label)
+        return train_texts, train_labels, holdout_texts, holdout_labels
+    
+    def _hash(self, texts):
+        """Ön işleme + hashing (IDF uygulanmadan ham frekanslar)"""
+        processed = self.analyzer.preprocess_batch(texts)
+        # Parçayı süreç sayısı kadar dilime böl; tek süreçte bölünmez
+        n_workers = joblib.cpu_count() if self.n_jobs == -1 else max(1, self.n_jobs)
+        shard_size = max(2000, -(-len(processed) // n_workers))
+        return self.analyzer.transform_parallel(processed, n_jobs=self.n_jobs, shard_size=shard_size,
+                                                apply_idf=False)
+    
+    def fit_idf(self, path):
+        """İlk geçiş: doküman frekanslarından IDF hesapla, ayrılmış örnekleri topla"""
+        start = time.perf_counter()
+        df = np.zeros(self.n_features, dtype=np.int64)
+        n_docs = 0
+        holdout = []
+        holdout_labels = []
+        stats = {}
+        
+        for texts, labels in iter_corpus(path, self.chunk_size, stats=stats):
+            train_texts, _, holdout_texts, held_labels = self._split(texts, labels)
+            if train_texts:
+                counts = self._hash(train_texts)
+                df += np.bincount(counts.indices, minlength=self.n_features)
+                n_docs += counts.shape[0]
+            room = self.max_holdout - len(holdout_labels)
+            if room > 0 and holdout_texts:
+                holdout.append(self._hash(holdout_texts[:room]))
+                holdout_labels.extend(held_labels[:room])
+        
+        if n_docs == 0:
+            raise ValueError(f"Korpusta eğitim örneği bulunamadı: {path}")
+        
+        # TfidfTransformer(smooth_idf=True) ile aynı formül
+        tfidf = self.analyzer.vectorizer.named_steps['idf']
+        tfidf.idf_ = np.log((1 + n_docs) / (1 + df)) + 1
+        tfidf.n_features_in_ = self.n_features
+        
+        self.n_documents = n_docs
+        if holdout:
+            self._holdout_X = tfidf.transform(sp.vstack(holdout).tocsr())
+            self._holdout_y = np.asarray(holdout_labels)
+        
+        seconds = time.perf_counter() - start
+        print(f"IDF hesaplandı: {n_docs} doküman, {len(holdout_labels)} ayrılmış örnek, "
+              f"{stats['skipped']} hatalı satır atlandı, "
+              f"{seconds:.1f} sn ({n_docs / seconds:,.0f} doküman/sn)")
+    
+    def train_epoch(self, path):
+        """Korpus üzerinde bir epoch partial_fit"""
+        tfidf = self.analyzer.vectorizer.named_steps['idf']
+        model = self.analyzer.model
+        start = time.perf_counter()
+        seen = 0
+        stats = {}
+        
+        for texts, labels in iter_corpus(path, self.chunk_size, stats=stats):
+            train_texts, train_labels, _, _ = self._split(texts, labels)
+            if not train_texts:
+                continue
+            X = tfidf.transform(self._hash(train_texts))
+            y = np.asarray(train_labels)
+            # Parça içinde karıştır; SGD sıralı etiketlere duyarlıdır
+            order = self.rng.permutation(len(y))
+            model.partial_fit(X[order], y[order], classes=CLASSES)
+            seen += len(y)
+        
+        seconds = time.perf_counter() - start
+        self.epoch += 1
+        self.analyzer.is_trained = True
+        self.analyzer.scorer = LinearScorer.from_analyzer(self.analyzer)
+        self.analyzer.model_version = None
+        
+        result = {
+            "epoch": self.epoch,
+            "documents": seen,
+            "skipped": stats["skipped"],
+            "seconds": round(seconds, 2),
+            "docs_per_second": round(seen / seconds, 1) if seconds else None,
+            "holdout_accuracy": self.evaluate()
+        }
+        self.history.append(result)
+        return result
+    
+    def evaluate(self):
+        """Ayrılmış örneklerde doğruluk"""
+        if self._holdout_X is None:
+            return None
+        predictions = self.analyzer.model.predict(self._holdout_X)
+        return float(np.mean(predictions == self._holdout_y))
+    
+    def save_checkpoint(self):
+        """Epoch sonu kontrol noktası (eğitime devam etmek için)"""
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        path = os.path.join(self.checkpoint_dir, f"epoch-{self.epoch:03d}.joblib")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump({
+            'epoch': self.epoch,
+            'n_features': self.n_features,
+            'n_documents': self.n_documents,
+            'idf': self.analyzer.vectorizer.named_steps['idf'].idf_,
+            'model': self.analyzer.model,
+            'history': self.history,
+            'holdout_X': self._holdout_X,
+            'holdout_y': self._holdout_y
+        }, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+    
+    def load_checkpoint(self, path):
+        """Kayıtlı bir kontrol noktasından devam et"""
+        state = joblib.load(path)
+        if state['n_features'] != self.n_features:
+            raise ValueError("Kontrol noktası farklı n_features ile oluşturulmuş")
+        tfidf = self.analyzer.vectorizer.named_steps['idf']
+        tfidf.idf_ = state['idf']
+        tfidf.n_features_in_ = self.n_features
+        self.analyzer.model = state['model']
+        self.epoch = state['epoch']
+        self.n_documents = state['n_documents']
+        self.history = state['history']
+        self._holdout_X = state['holdout_X']
+        self._holdout_y = state['holdout_y']
+        self.analyzer.is_trained = True
+        self.analyzer.scorer = LinearScorer.from_analyzer(self.analyzer)
+        print(f"Kontrol noktasından devam ediliyor: {path} (epoch {self.epoch})")
+    
+    def fit(self, path, epochs=3, resume=None):
+        """IDF geçişi + epoch'lar; her epoch sonunda kontrol noktası yazar"""
+        if resume:
+            self.load_checkpoint(resume)
+        else:
+            self.fit_idf(path)
+        
+        while self.epoch < epochs:
+            result = self.train_epoch(path)
+            checkpoint = self.save_checkpoint()
+            print(f"Epoch {result['epoch']}: {result['documents']} doküman "
+                  f"({result['skipped']} hatalı satır atlandı), "
+                  f"{result['docs_per_second']:,.0f} doküman/sn, "
+                  f"ayrılmış doğruluk: {result['holdout_accuracy']} -> {checkpoint}")
+        return self.analyzer
+
+def latest_checkpoint(checkpoint_dir):
+    if not os.path.isdir(checkpoint_dir):
+        return None
+    names = sorted(n for n in os.listdir(checkpoint_dir) if n.startswith("epoch-") and n.endswith(".joblib"))
+    return os.path.join(checkpoint_dir, names[-1]) if names else None
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Büyük korpusla bellek sınırlı sentiment eğitimi")
+    parser.add_argument("corpus", help="JSONL ya da CSV korpus dosyası")
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--chunk-size", type=int, default=20000)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Paralel vektörleştirme süreç sayısı")
+    parser.add_argument("--n-features", type=int, default=2 ** 20)
+    parser.add_argument("--holdout", type=float, default=0.02, help="Ayrılan örnek oranı")
+    parser.add_argument("--max-holdout", type=int, default=50000)
+    parser.add_argument("--alpha", type=float, default=1e-6, help="SGD düzenlileştirme katsayısı")
+    parser.add_argument("--checkpoint-dir", default="models/checkpoints")
+    parser.add_argument("--resume", action="store_true", help="Son kontrol noktasından devam et")
+    parser.add_argument("--model-store", default=os.getenv("MODEL_STORE_DIR", "models/sentiment"),
+                        help="Eğitim sonunda modelin yayınlanacağı depo")
+    parser.add_argument("--no-publish", action="store_true", help="Modeli depoya yayınlama")
+    parser.add_argument("--report", help="Epoch raporunun yazılacağı JSON dosyası")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    trainer = CorpusTrainer(
+        n_features=args.n_features,
+        chunk_size=args.chunk_size,
+        n_jobs=args.n_jobs,
+        holdout_fraction=args.holdout,
+        max_holdout=args.max_holdout,
+        alpha=args.alpha,
+        checkpoint_dir=args.checkpoint_dir
+    )
+    resume = latest_checkpoint(args.checkpoint_dir) if args.resume else None
+    analyzer = trainer.fit(args.corpus, epochs=args.epochs, resume=resume)
+    
+    if not args.no_publish:
+        final = trainer.history[-1] if trainer.history else {}
+        analyzer.publish_model(ModelStore(args.model_store), {
+            'source': args.corpus,
+            'accuracy': final.get('holdout_accuracy'),
+            'training_documents': trainer.n_documents,
+            'epochs': trainer.epoch
+        })
+    
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(trainer.history, f, indent=2)
+
+if __name__ == "__main__":
+    main()
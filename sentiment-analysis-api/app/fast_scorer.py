@@ -0,0 +1,190 @@
+import re
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
+
+class LinearScorer:
+    """
+    TF-IDF + doğrusal sınıflandırıcı için doğrudan skorlayıcı
+    
+    Fit edilmiş vektörleştirici ve LogisticRegression'dan dışa aktarılır.
+    Tek metin için seyrek matris kurmadan token -> id eşlemesi, IDF ağırlığı
+    ve yoğun ağırlık dizisinden sınıf logitlerini toplayıp softmax uygular.
+    Sonuçlar sklearn'ün predict_proba çıktısıyla aynıdır.
+    """
+    
+    def __init__(self, idf, coef, intercept, classes, vocabulary=None, hash_features=None,
+                 token_pattern=r"(?u)\b\w\w+\b", stop_words=(), lowercase=True,
+                 sublinear_tf=False, norm="l2", mode="multinomial", index="dict"):
+        if (vocabulary is None) == (hash_features is None):
+            raise ValueError("vocabulary ya da hash_features'tan yalnızca biri verilmeli")
+        
+        self.idf = idf
+        # (n_features, n_classes): bir token'ın tüm sınıf ağırlıkları tek satırda
+        self.coef = coef
+        self.intercept = intercept
+        self.classes = classes
+        self.vocabulary = vocabulary
+        self.hash_features = hash_features
+        self.token_pattern = token_pattern
+        self.stop_words = frozenset(stop_words)
+        self.lowercase = lowercase
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.mode = mode
+        
+        self._token_regex = re.compile(token_pattern)
+        # "dict": sözlük belleğe kopyalanır (en hızlı arama)
+        # "sorted": sıralı (bellek eşlemeli olabilir) dizide ikili arama, kopya yok
+        self._token_index = (
+            {token: i for i, token in enumerate(vocabulary.tolist())}
+            if vocabulary is not None and index == "dict" else None
+        )
+    
+    @classmethod
+    def from_analyzer(cls, analyzer):
+        """Eğitilmiş bir SentimentAnalyzer'dan skorlayıcı oluştur"""
+        model = analyzer.model
+        if analyzer.featurizer == "hashing":
+            hashing = analyzer.vectorizer.named_steps['hashing']
+            tfidf = analyzer.vectorizer.named_steps['idf']
+            if hashing.alternate_sign or hashing.norm is not None:
+                raise ValueError("Hızlı skorlama alternate_sign=False, norm=None hashing gerektirir")
+            text_params, vocabulary, hash_features = hashing, None, hashing.n_features
+        else:
+            tfidf = text_params = analyzer.vectorizer
+            # sklearn sözlüğü alfabetik sıralı tutar; yine de id'leri açıkça hizala
+            names = text_params.get_feature_names_out()
+            order = np.argsort(names, kind="stable")
+            vocabulary, hash_features = names[order], None
+        
+        if text_params.ngram_range != (1, 1) or text_params.analyzer != "word":
+            raise ValueError("Hızlı skorlama yalnızca tek kelimelik (unigram) özellikleri destekler")
+        
+        idf = np.asarray(tfidf.idf_, dtype=np.float64)
+        coef = np.asarray(model.coef_, dtype=np.float64).T
+        if vocabulary is not None:
+            idf, coef = idf[order], coef[order]
+        
+        stop_words = text_params.get_stop_words() or ()
+        return cls(
+            idf=idf,
+            coef=np.ascontiguousarray(coef),
+            intercept=np.asarray(model.intercept_, dtype=np.float64),
+            classes=np.asarray(model.classes_),
+            vocabulary=vocabulary,
+            hash_features=hash_features,
+            token_pattern=text_params.token_pattern,
+            stop_words=stop_words,
+            lowercase=text_params.lowercase,
+            sublinear_tf=tfidf.sublinear_tf,
+            norm=tfidf.norm,
+            mode=cls._probability_mode(model)
+        )
+    
+    @staticmethod
+    def _probability_mode(model):
+        # sklearn LogisticRegression.predict_proba ile aynı karar
+        if len(model.classes_) <= 2:
+            return "binary"
+        if not hasattr(model, "solver"):
+            # SGDClassifier(log_loss): sınıf başına sigmoid, toplamla normalize
+            return "ovr"
+        multi_class = getattr(model, "multi_class", "auto")
+        if multi_class == "ovr" or (multi_class in ("auto", "deprecated", "warn") and model.solver == "liblinear"):
+            return "ovr"
+        return "multinomial"
+    
+    def _feature_ids(self, text):
+        if self.lowercase:
+            text = text.lower()
+        tokens = self._token_regex.findall(text)
+        if self.stop_words:
+            tokens = [t for t in tokens if t not in self.stop_words]
+        
+        if self._token_index is not None:
+            index = self._token_index
+            ids = [index[t] for t in tokens if t in index]
+        elif self.vocabulary is not None:
+            if not tokens:
+                return []
+            tokens = np.array(tokens)
+            positions = np.searchsorted(self.vocabulary, tokens)
+            positions[positions == len(self.vocabulary)] = 0
+            ids = positions[self.vocabulary[positions] == tokens].tolist()
+        else:
+            n = self.hash_features
+            ids = []
+            for t in tokens:
+                h = murmurhash3_32(t, seed=0)
+                ids.append((2147483647 - (n - 1)) % n if h == -2147483648 else abs(h) % n)
+        return ids
+    
+    def _weights(self, ids):
+        """Bir metnin (id, tf-idf değeri) çiftleri"""
+        ids, counts = np.unique(np.asarray(ids, dtype=np.int64), return_counts=True)
+        tf = counts.astype(np.float64)
+        if self.sublinear_tf:
+            tf = np.log(tf) + 1
+        values = tf * self.idf[ids]
+        if self.norm == "l2":
+            norm = np.sqrt(values @ values)
+            if norm > 0:
+                values /= norm
+        elif self.norm == "l1":
+            norm = np.abs(values).sum()
+            if norm > 0:
+                values /= norm
+        return ids, values
+    
+    def _probabilities(self, logits):
+        if self.mode == "binary":
+            p = 1.0 / (1.0 + np.exp(-logits[..., 0]))
+            return np.stack([1 - p, p], axis=-1)
+        if self.mode == "ovr":
+            p = 1.0 / (1.0 + np.exp(-logits))
+            return p / p.sum(axis=-1, keepdims=True)
+        shifted = logits - logits.max(axis=-1, keepdims=True)
+        exp = np.exp(shifted)
+        return exp / exp.sum(axis=-1, keepdims=True)
+    
+    def predict_proba_one(self, processed_text):
+        """Tek (ön işlenmiş) metin için sınıf olasılıkları"""
+        ids = self._feature_ids(processed_text)
+        logits = self.intercept.copy()
+        if ids:
+            ids, values = self._weights(ids)
+            logits += values @ self.coef[ids]
+        return self._probabilities(logits)
+    
+    def predict_proba(self, processed_texts):
+        """Metin listesi için olasılık matrisi (tek seyrek çarpım)"""
+        return self.predict_proba_features(self.transform(processed_texts))
+    
+    def predict_proba_features(self, X):
+        """transform çıktısı (normalize TF-IDF matrisi) için olasılıklar"""
+        logits = np.asarray(X @ self.coef) + self.intercept
+        return self._probabilities(logits)
+    
+    def transform(self, processed_texts):
+        """Metin listesini normalize TF-IDF seyrek matrisine çevir"""
+        rows = []
+        ids = []
+        for i, text in enumerate(processed_texts):
+            text_ids = self._feature_ids(text)
+            ids.extend(text_ids)
+            rows.extend([i] * len(text_ids))
+        
+        # Tekrarlanan (satır, id) çiftleri toplanarak terim frekansına dönüşür
+        X = sp.csr_matrix(
+            (np.ones(len(ids)), (np.asarray(rows, dtype=np.int64), np.asarray(ids, dtype=np.int64))),
+            shape=(len(processed_texts), self.coef.shape[0])
+        )
+        X.sum_duplicates()
+        if self.sublinear_tf:
+            X.data = np.log(X.data) + 1
+        X.data *= self.idf[X.indices]
+        if self.norm:
+            X = normalize(X, norm=self.norm, copy=False)
+        return X
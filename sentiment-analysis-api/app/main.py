@@ -1,10 +1,19 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional
 import uvicorn
 from app.sentiment_model import SentimentAnalyzer
+from app.batching import MicroBatcher
+from app.model_store import ModelStore
+from app.prediction_cache import PredictionCache, DedupStats
+from app.retraining import RetrainManager
+from app.streaming import RequestStreamingResponse, iter_ndjson_lines, stream_predictions
+from app.profiling import stage_timings, profiler
+from app.parallel_scoring import ShardedScorer, resolve_processes
 import os
+import asyncio
+from functools import partial
 
 # FastAPI uygulamasını oluştur
 app = FastAPI(
@@ -35,36 +44,240 @@ class SentimentResponse(BaseModel):
     confidence: float
     prediction: int
 
+class BatchMetadata(BaseModel):
+    total_texts: int
+    unique_texts: int
+    dedup_ratio: float
+
 class BatchSentimentResponse(BaseModel):
     results: List[SentimentResponse]
+    metadata: Optional[BatchMetadata] = None
 
 class HealthResponse(BaseModel):
     status: str
     message: str
     model_loaded: bool
 
-# Global sentiment analyzer
-analyzer = SentimentAnalyzer()
+class RetrainJobResponse(BaseModel):
+    job_id: str
+    status: str
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    accuracy: Optional[float] = None
+    model_version: Optional[str] = None
+    generation: Optional[int] = None
+    error: Optional[str] = None
+
+# Global sentiment analyzer (SENTIMENT_FEATURIZER: "tfidf" ya da "hashing")
+analyzer = SentimentAnalyzer(featurizer=os.getenv("SENTIMENT_FEATURIZER", "tfidf"))
+
+# Pickle'sız, bellek eşlemeli model deposu; eski sentiment_model.pkl yalnızca
+# depo boşken bir kez içe aktarılır
+LEGACY_MODEL_PATH = os.getenv("LEGACY_MODEL_PATH", 'sentiment_model.pkl')
+model_store = ModelStore(os.getenv("MODEL_STORE_DIR", "models/sentiment"))
+
+# Tekrarlı metinler için tahmin önbelleği (PREDICTION_CACHE_SIZE=0 kapatır)
+prediction_cache = PredictionCache(max_size=int(os.getenv("PREDICTION_CACHE_SIZE", "10000")))
+
+# Servis edilen modelin her değişiminde bir artar
+model_generation = 0
+
+# Çoklu worker modunda (app/serve.py) başka bir worker'ın yayınladığı versiyona
+# geçmek için CURRENT dosyası arka planda bu aralıkla kontrol edilir
+MODEL_STORE_POLL_INTERVAL = float(os.getenv("MODEL_STORE_POLL_INTERVAL", "1.0"))
+_store_poller = None
+
+# Büyük toplu istekleri süreç havuzunda parçalara böl (PARALLEL_SCORING_PROCESSES=0 kapatır,
+# "auto" CPU'ları WORKERS arasında paylaştırır)
+parallel_scorer = ShardedScorer(
+    model_store,
+    processes=resolve_processes(
+        os.getenv("PARALLEL_SCORING_PROCESSES", "0"),
+        workers=int(os.getenv("WORKERS", "1"))
+    ),
+    min_batch_size=int(os.getenv("PARALLEL_SCORING_MIN_BATCH", "2000"))
+)
+
+def train_and_publish():
+    """Modeli eğit ve depoya yeni versiyon olarak yayınla (yalnızca başlangıçta)"""
+    accuracy = analyzer.train()
+    analyzer.publish_model(model_store, {'accuracy': accuracy})
+    prediction_cache.clear()
+    return accuracy
+
+def train_candidate():
+    """Servis edilen modele dokunmadan yeni bir analyzer eğit ve yayınla (arka plan thread'i)"""
+    candidate = SentimentAnalyzer(featurizer=analyzer.featurizer, n_features=analyzer.n_features)
+    accuracy = candidate.train()
+    candidate.publish_model(model_store, {'accuracy': accuracy})
+    return candidate, accuracy
+
+def swap_analyzer(candidate):
+    """Yeni modeli tek atama ile devreye al; devam eden istekler eski modeli bitirir"""
+    global analyzer, model_generation
+    if candidate.model_version is not None and candidate.model_version == analyzer.model_version:
+        # Aynı versiyon depo senkronizasyonuyla zaten devreye alındı
+        return model_generation
+    analyzer = candidate
+    model_generation += 1
+    prediction_cache.clear()
+    return model_generation
+
+retrainer = RetrainManager(train_candidate, swap_analyzer)
+
+def prepare_model_store():
+    """
+    Depodaki aktif modeli aç; depo boşsa eski pickle'ı içe aktar ya da eğit
+    
+    app/serve.py bunu master süreçte bir kez çağırır; fork edilen worker'lar
+    aynı versiyonu hazır devralır ve tekrar yüklemez.
+    """
+    if analyzer.is_trained and analyzer.model_version == model_store.current_version():
+        return
+    
+    # Depoda aktif versiyon varsa aç, yoksa eski pickle'ı içe aktar ya da eğit
+    try:
+        if model_store.current_version():
+            analyzer.load_from_store(model_store)
+            print("Kaydedilmiş model depodan açıldı.")
+        elif os.path.exists(LEGACY_MODEL_PATH):
+            analyzer.load_model(LEGACY_MODEL_PATH)
+            analyzer.publish_model(model_store, {'source': LEGACY_MODEL_PATH})
+            print("Eski model dosyası depoya aktarıldı.")
+        else:
+            print("Kayıtlı model bulunamadı. Yeni model eğitiliyor...")
+            train_and_publish()
+    except Exception as e:
+        print(f"Model yüklenirken hata: {e}")
+        print("Yeni model eğitiliyor...")
+        train_and_publish()
+
+def load_store_version(version):
+    """Depodaki bir versiyonu yeni bir analyzer'a aç (executor'da çalışır)"""
+    candidate = SentimentAnalyzer(featurizer=analyzer.featurizer, n_features=analyzer.n_features)
+    candidate.load_from_store(model_store, version)
+    return candidate
+
+async def sync_model_from_store():
+    """Depodaki aktif versiyon değiştiyse (başka bir worker ya da araç yayınladı) modeli aç ve devreye al"""
+    try:
+        version = model_store.current_version()
+        if version is None or version == analyzer.model_version:
+            return
+        
+        # Dosya okuma event loop'u bloklamasın; referans hazır olunca tek atamayla değiştir
+        previous = analyzer.model_version
+        candidate = await asyncio.get_running_loop().run_in_executor(None, load_store_version, version)
+        if analyzer.model_version != previous:
+            # Yükleme sürerken yeniden eğitim yeni bir versiyonu devreye aldı
+            return
+        swap_analyzer(candidate)
+        print(f"Model versiyonu değişti: {version}")
+    except Exception as e:
+        print(f"Model deposu senkronizasyon hatası: {e}")
+
+async def poll_model_store():
+    """Diğer worker'ların yayınladığı versiyonları arka planda takip et"""
+    while True:
+        await asyncio.sleep(MODEL_STORE_POLL_INTERVAL)
+        await sync_model_from_store()
+
+# NDJSON akış endpoint'i: parça boyutu ve satır başına bayt sınırı
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "256"))
+STREAM_MAX_LINE_BYTES = int(os.getenv("STREAM_MAX_LINE_BYTES", str(1024 * 1024)))
+
+def job_response(job):
+    return RetrainJobResponse(**{k: v for k, v in job.items() if not k.startswith("_")})
+
+# /debug/* endpoint'leri (aşama süreleri, örnekleyici profiler) yalnızca açıkça istenirse
+DEBUG_ENDPOINTS = os.getenv("ENABLE_DEBUG_ENDPOINTS", "false").lower() in ("1", "true", "yes")
+
+# Toplu isteklerdeki tekrar oranı (/model/info -> dedup)
+dedup_stats = DedupStats()
+
+def score_batch(texts, metadata=None):
+    """
+    Metin listesini skorla: önbellekte olanlar modele gitmez
+    
+    Hem mikro-batch kuyruğu hem /predict/batch bu fonksiyonu kullanır;
+    her çağrıda güncel analyzer ve onun model versiyonu kullanılır.
+    metadata sözlüğü verilirse tekrar oranı içine yazılır.
+    """
+    current = analyzer
+    with stage_timings.measure("preprocess", len(texts)):
+        processed_texts = current.preprocess_batch(texts)
+    unique = len(set(processed_texts))
+    dedup_stats.record(len(texts), unique)
+    if metadata is not None:
+        metadata.update(
+            total_texts=len(texts),
+            unique_texts=unique,
+            dedup_ratio=1 - unique / len(texts) if texts else 0.0
+        )
+    
+    if not prediction_cache.enabled:
+        return predict_with(current, texts, processed_texts)
+    
+    with stage_timings.measure("cache_lookup", len(texts)):
+        keys = [PredictionCache.key(text, current.model_version) for text in processed_texts]
+        cached = prediction_cache.get_many(keys)
+    
+    results = [None] * len(texts)
+    missing = []
+    for i, entry in enumerate(cached):
+        if entry is None:
+            missing.append(i)
+        else:
+            results[i] = {"text": texts[i], **entry}
+    
+    if missing:
+        scored = predict_with(current, [texts[i] for i in missing], [processed_texts[i] for i in missing])
+        new_entries = []
+        for i, result in zip(missing, scored):
+            results[i] = result
+            new_entries.append((keys[i], {k: v for k, v in result.items() if k != "text"}))
+        prediction_cache.put_many(new_entries)
+    
+    return results
+
+def predict_with(current, texts, processed_texts):
+    """Büyük batch'leri analyzer'ın model versiyonuyla süreç havuzunda skorla"""
+    proba_fn = None
+    if current.model_version is not None and parallel_scorer.should_split(len(texts)):
+        proba_fn = partial(parallel_scorer.predict_proba, current.model_version, local_scorer=current.scorer)
+    return current.predict_batch(texts, processed_texts=processed_texts, proba_fn=proba_fn)
+
+# Eşzamanlı tekil istekleri toplayan mikro-batch kuyruğu
+batcher = MicroBatcher(
+    score_batch,
+    max_batch_size=int(os.getenv("BATCH_MAX_SIZE", "64")),
+    max_wait_ms=float(os.getenv("BATCH_MAX_WAIT_MS", "5")),
+    max_workers=int(os.getenv("SCORING_WORKERS", "2"))
+)
 
 @app.on_event("startup")
 async def startup_event():
     """Uygulama başladığında modeli yükle"""
-    global analyzer
+    global model_generation, _store_poller
     
-    # Eğer kaydedilmiş model varsa yükle, yoksa eğit
-    if os.path.exists('sentiment_model.pkl'):
-        try:
-            analyzer.load_model('sentiment_model.pkl')
-            print("Kaydedilmiş model yüklendi.")
-        except Exception as e:
-            print(f"Model yüklenirken hata: {e}")
-            print("Yeni model eğitiliyor...")
-            analyzer.train()
-            analyzer.save_model('sentiment_model.pkl')
-    else:
-        print("Model dosyası bulunamadı. Yeni model eğitiliyor...")
-        analyzer.train()
-        analyzer.save_model('sentiment_model.pkl')
+    prepare_model_store()
+    await sync_model_from_store()
+    model_generation += 1
+    await batcher.start()
+    retrainer.start()
+    parallel_scorer.start()
+    _store_poller = asyncio.create_task(poll_model_store())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Uygulama kapanırken skorlama ve eğitim havuzlarını durdur"""
+    if _store_poller is not None:
+        _store_poller.cancel()
+    profiler.stop()
+    retrainer.stop()
+    await batcher.stop()
+    parallel_scorer.stop()
 
 @app.get("/", response_model=HealthResponse)
 async def root():
@@ -94,8 +307,9 @@ async def predict_sentiment(request: TextRequest):
         if not request.text.strip():
             raise HTTPException(status_code=400, detail="Metin boş olamaz")
         
-        result = analyzer.predict(request.text)
-        return SentimentResponse(**result)
+        result = await batcher.submit(request.text)
+        with stage_timings.measure("response"):
+            return SentimentResponse(**result)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Tahmin hatası: {str(e)}")
@@ -115,36 +329,126 @@ async def predict_sentiment_batch(request: BatchTextRequest):
         if not valid_texts:
             raise HTTPException(status_code=400, detail="Geçerli metin bulunamadı")
         
-        results = analyzer.predict_batch(valid_texts)
-        return BatchSentimentResponse(results=[SentimentResponse(**result) for result in results])
+        metadata = {}
+        results = await batcher.run(score_batch, valid_texts, metadata)
+        with stage_timings.measure("response", len(results)):
+            return BatchSentimentResponse(
+                results=[SentimentResponse(**result) for result in results],
+                metadata=BatchMetadata(**metadata)
+            )
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Toplu tahmin hatası: {str(e)}")
 
-@app.post("/retrain")
-async def retrain_model():
-    """Modeli yeniden eğit"""
+@app.post("/predict/stream")
+async def predict_sentiment_stream(request: Request):
+    """
+    NDJSON akışı ile duygu analizi
+    
+    Gövde satır satır okunur (her satır "metin" ya da {"text": ..., "id": ...}),
+    STREAM_CHUNK_SIZE satırlık parçalar halinde skorlanır ve sonuçlar aynı
+    sırayla NDJSON olarak akıtılır. Her girdi satırı için "line" numarası
+    ve "status" ("ok" ya da "error") içeren bir çıktı satırı döner; hatalı
+    satırlar atlanmaz, akış devam eder.
+    """
+    if not analyzer.is_trained:
+        raise HTTPException(status_code=500, detail="Model henüz eğitilmemiş")
+    
+    async def score(texts):
+        return await batcher.run(score_batch, texts)
+    
+    lines = iter_ndjson_lines(request.stream(), max_line_bytes=STREAM_MAX_LINE_BYTES)
+    return RequestStreamingResponse(
+        stream_predictions(lines, score, chunk_size=STREAM_CHUNK_SIZE),
+        media_type="application/x-ndjson"
+    )
+
+@app.post("/retrain", response_model=RetrainJobResponse)
+async def retrain_model(wait: bool = False):
+    """
+    Modeli arka planda yeniden eğit
+    
+    İş kaydı hemen döner; durum /retrain/jobs/{job_id} ile izlenir.
+    wait=true verilirse eğitim bitene kadar beklenir.
+    """
     try:
-        accuracy = analyzer.train()
-        analyzer.save_model('sentiment_model.pkl')
-        return {
-            "status": "success",
-            "message": "Model başarıyla yeniden eğitildi",
-            "accuracy": accuracy
-        }
+        job = retrainer.submit()
+        if wait:
+            await retrainer.wait(job)
+        return job_response(job)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Model eğitme hatası: {str(e)}")
 
+@app.get("/retrain/jobs", response_model=List[RetrainJobResponse])
+async def list_retrain_jobs():
+    """Son yeniden eğitim işlerini listele (en yeni önce)"""
+    return [job_response(job) for job in retrainer.jobs()]
+
+@app.get("/retrain/jobs/{job_id}", response_model=RetrainJobResponse)
+async def get_retrain_job(job_id: str):
+    """Bir yeniden eğitim işinin durumunu getir"""
+    job = retrainer.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"İş bulunamadı: {job_id}")
+    return job_response(job)
+
 @app.get("/model/info")
 async def model_info():
     """Model bilgilerini getir"""
     return {
         "is_trained": analyzer.is_trained,
-        "model_type": "LogisticRegression",
-        "vectorizer_type": "TfidfVectorizer",
-        "max_features": 5000,
-        "supported_sentiments": ["negatif", "pozitif", "nötr"]
+        "model_type": analyzer.model_type,
+        "vectorizer_type": "TfidfVectorizer" if analyzer.featurizer == "tfidf" else "HashingVectorizer+TfidfTransformer",
+        "featurizer": analyzer.featurizer,
+        "max_features": 5000 if analyzer.featurizer == "tfidf" else analyzer.n_features,
+        "supported_sentiments": ["negatif", "pozitif", "nötr"],
+        "model_version": analyzer.model_version,
+        "model_generation": model_generation,
+        "batching": batcher.stats(),
+        "cache": prediction_cache.stats(),
+        "dedup": dedup_stats.stats(),
+        "parallel_scoring": parallel_scorer.stats(),
+        "worker_pid": os.getpid()
     }
 
+def require_debug():
+    if not DEBUG_ENDPOINTS:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+@app.get("/debug/stages")
+async def debug_stages():
+    """Skorlama aşamalarının süre istatistikleri (ms)"""
+    require_debug()
+    return stage_timings.stats()
+
+@app.post("/debug/stages/reset")
+async def debug_stages_reset():
+    """Aşama istatistiklerini sıfırla"""
+    require_debug()
+    stage_timings.reset()
+    return {"status": "success"}
+
+@app.post("/debug/profiler/start")
+async def debug_profiler_start(interval_ms: float = 5.0):
+    """Örnekleyici profiler'ı başlat"""
+    require_debug()
+    if interval_ms <= 0:
+        raise HTTPException(status_code=400, detail="interval_ms pozitif olmalı")
+    profiler.start(interval_ms=interval_ms)
+    return {"status": "running", "interval_ms": profiler.interval * 1000}
+
+@app.post("/debug/profiler/stop")
+async def debug_profiler_stop(top: int = 25):
+    """Profiler'ı durdur ve raporu döndür"""
+    require_debug()
+    profiler.stop()
+    return profiler.report(top=top)
+
+@app.get("/debug/profiler")
+async def debug_profiler_report(top: int = 25):
+    """Profiler raporu (çalışırken de alınabilir)"""
+    require_debug()
+    return profiler.report(top=top)
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
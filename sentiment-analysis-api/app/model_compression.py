@@ -0,0 +1,209 @@
+"""
+Eğitim sonrası model sıkıştırma: sözlük budama ve düşük hassasiyetli ağırlıklar
+
+Kullanım:
+    python -m app.model_compression --keep-ratio 0.5 --dtype float16
+    python -m app.model_compression --min-weight 0.05 --dtype float32 --eval-data data/test.jsonl --publish
+
+Depodaki aktif model açılır, tüm sınıflardaki en büyük mutlak katsayısı
+eşiğin altında kalan sözlük girdileri atılır, IDF ve katsayılar float32 ya
+da float16 olarak yeni bir versiyona yazılır. Ardından sıkıştırılmış ve
+orijinal model aynı etiketli veride karşılaştırılır: doğruluk farkı, tahmin
+uyumu, dosya boyutu, yükleme süresi ve skorlama hızı raporlanır.
+"""
+import argparse
+import json
+import os
+import time
+import numpy as np
+from app.fast_scorer import LinearScorer
+from app.model_store import ModelStore
+from app.corpus_training import iter_corpus
+from app.sentiment_model import SentimentAnalyzer
+
+DTYPES = ("float64", "float32", "float16")
+
+def feature_importance(scorer):
+    """Her özelliğin tüm sınıflardaki en büyük mutlak katsayısı"""
+    return np.abs(np.asarray(scorer.coef, dtype=np.float64)).max(axis=1)
+
+def compress_scorer(scorer, keep_ratio=None, min_weight=None, dtype="float32"):
+    """
+    Budanmış ve düşük hassasiyetli yeni bir LinearScorer döndür
+    
+    keep_ratio: en önemli özelliklerin tutulacak oranı (0-1]
+    min_weight: en büyük mutlak katsayısı bu değerin altındaki özellikler atılır
+    
+    Budama yalnızca sözlük tabanlı (tfidf) modellerde yapılabilir; hashing
+    modelinde özellik id'leri sabit olduğundan sadece hassasiyet düşürülür.
+    Budanan token'lar artık L2 normuna katkı yapmaz, bu yüzden kalan
+    özelliklerin değerleri de hafifçe değişir.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"Desteklenmeyen dtype: {dtype} (seçenekler: {', '.join(DTYPES)})")
+    
+    keep = np.ones(scorer.coef.shape[0], dtype=bool)
+    if keep_ratio is not None or min_weight is not None:
+        if scorer.vocabulary is None:
+            raise ValueError("Hashing modelinde sözlük budanamaz; yalnızca dtype değiştirilebilir")
+        importance = feature_importance(scorer)
+        if min_weight is not None:
+            keep &= importance >= min_weight
+        if keep_ratio is not None:
+            if not 0 < keep_ratio <= 1:
+                raise ValueError("keep_ratio 0 ile 1 arasında olmalı")
+            n_keep = max(1, int(round(len(importance) * keep_ratio)))
+            top = np.argsort(-importance, kind="stable")[:n_keep]
+            ranked = np.zeros_like(keep)
+            ranked[top] = True
+            keep &= ranked
+    
+    vocabulary = None
+    if scorer.vocabulary is not None:
+        # Boolean maske sırayı korur; sözlük sıralı kalır
+        vocabulary = np.asarray(scorer.vocabulary)[keep]
+    
+    return LinearScorer(
+        idf=np.asarray(scorer.idf)[keep].astype(dtype),
+        coef=np.ascontiguousarray(np.asarray(scorer.coef)[keep].astype(dtype)),
+        intercept=np.asarray(scorer.intercept, dtype=np.float64),
+        classes=np.asarray(scorer.classes),
+        vocabulary=vocabulary,
+        hash_features=scorer.hash_features,
+        token_pattern=scorer.token_pattern,
+        stop_words=scorer.stop_words,
+        lowercase=scorer.lowercase,
+        sublinear_tf=scorer.sublinear_tf,
+        norm=scorer.norm,
+        mode=scorer.mode
+    )
+
+def directory_size(path):
+    """Bir versiyon dizinindeki dosyaların toplam boyutu (bayt)"""
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+def load_eval_data(path=None, limit=50000):
+    """Değerlendirme verisi; dosya verilmezse örnek eğitim verisi kullanılır"""
+    if path is None:
+        return SentimentAnalyzer().create_sample_data()
+    texts, labels = [], []
+    for chunk_texts, chunk_labels in iter_corpus(path):
+        texts.extend(chunk_texts)
+        labels.extend(chunk_labels)
+        if len(texts) >= limit:
+            break
+    return texts[:limit], labels[:limit]
+
+def profile_version(store, version, processed_texts, labels, repeats=5):
+    """Bir versiyonun boyut, yükleme süresi, doğruluk ve hız ölçümleri"""
+    version_dir = os.path.join(store.root, version)
+    
+    timings = {}
+    for label, mmap_mode in (("load_mmap_ms", "r"), ("load_full_ms", None)):
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            store.load(version, mmap_mode=mmap_mode)
+            best = min(best, time.perf_counter() - start)
+        timings[label] = best * 1000
+    
+    scorer, manifest = store.load(version)
+    proba = scorer.predict_proba(processed_texts)
+    predictions = scorer.classes[np.argmax(proba, axis=1)]
+    
+    best_batch = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        scorer.predict_proba(processed_texts)
+        best_batch = min(best_batch, time.perf_counter() - start)
+    
+    sample = processed_texts[:2000]
+    start = time.perf_counter()
+    for text in sample:
+        scorer.predict_proba_one(text)
+    single_seconds = time.perf_counter() - start
+    
+    return {
+        "version": version,
+        "dtype": manifest.get("dtype", "float64"),
+        "n_features": int(scorer.coef.shape[0]),
+        "size_bytes": directory_size(version_dir),
+        **timings,
+        "accuracy": float(np.mean(predictions == np.asarray(labels))),
+        "batch_texts_per_second": len(processed_texts) / best_batch,
+        "single_text_us": single_seconds / len(sample) * 1e6
+    }, proba, predictions
+
+def compare(store, baseline_version, candidate_store, candidate_version, texts, labels, repeats=5):
+    """Orijinal ve sıkıştırılmış modeli aynı veride karşılaştır"""
+    processed_texts = SentimentAnalyzer().preprocess_batch(texts)
+    baseline, base_proba, base_pred = profile_version(store, baseline_version, processed_texts, labels, repeats)
+    candidate, cand_proba, cand_pred = profile_version(
+        candidate_store, candidate_version, processed_texts, labels, repeats
+    )
+    return {
+        "eval_texts": len(texts),
+        "baseline": baseline,
+        "compressed": candidate,
+        "accuracy_delta": candidate["accuracy"] - baseline["accuracy"],
+        "prediction_agreement": float(np.mean(base_pred == cand_pred)),
+        "max_probability_diff": float(np.abs(base_proba - cand_proba).max()),
+        "size_ratio": candidate["size_bytes"] / baseline["size_bytes"],
+        "speedup": candidate["batch_texts_per_second"] / baseline["batch_texts_per_second"]
+    }
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sentiment modelini budayıp düşük hassasiyetle sakla")
+    parser.add_argument("--model-store", default=os.getenv("MODEL_STORE_DIR", "models/sentiment"),
+                        help="Orijinal modelin bulunduğu depo")
+    parser.add_argument("--version", help="Sıkıştırılacak versiyon (varsayılan: aktif versiyon)")
+    parser.add_argument("--output-store", default="models/sentiment_compressed",
+                        help="Sıkıştırılmış modelin yazılacağı depo")
+    parser.add_argument("--publish", action="store_true",
+                        help="Sıkıştırılmış modeli --model-store'a yayınlayıp aktif yap")
+    parser.add_argument("--keep-ratio", type=float, help="Tutulacak sözlük oranı (0-1]")
+    parser.add_argument("--min-weight", type=float, help="En küçük mutlak katsayı eşiği")
+    parser.add_argument("--dtype", choices=DTYPES, default="float32")
+    parser.add_argument("--eval-data", help="Karşılaştırma için JSONL ya da CSV etiketli veri")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--report", help="Karşılaştırma raporunun yazılacağı JSON dosyası")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    store = ModelStore(args.model_store)
+    source_version = args.version or store.current_version()
+    scorer, manifest = store.load(source_version)
+    
+    compressed = compress_scorer(scorer, keep_ratio=args.keep_ratio, min_weight=args.min_weight, dtype=args.dtype)
+    target = store if args.publish else ModelStore(args.output_store)
+    metadata = {
+        "preprocess_version": manifest["preprocess_version"],
+        "featurizer": manifest["featurizer"],
+        "n_features": manifest["n_features"],
+        "model_type": manifest.get("model_type", "LogisticRegression"),
+        "compressed_from": source_version,
+        "keep_ratio": args.keep_ratio,
+        "min_weight": args.min_weight
+    }
+    target_version = target.publish(compressed, metadata)
+    print(f"Özellik sayısı: {scorer.coef.shape[0]} -> {compressed.coef.shape[0]} ({args.dtype})")
+    
+    texts, labels = load_eval_data(args.eval_data)
+    report = compare(store, source_version, target, target_version, texts, labels, args.repeats)
+    
+    for name in ("baseline", "compressed"):
+        result = report[name]
+        print(f"{name:<10} {result['version']:>4} {result['dtype']:<8} özellik={result['n_features']:<7d} "
+              f"boyut={result['size_bytes'] / 1024:8.1f}KB  doğruluk={result['accuracy']:.4f}  "
+              f"yükleme(mmap/tam)={result['load_mmap_ms']:.2f}/{result['load_full_ms']:.2f}ms  "
+              f"batch={result['batch_texts_per_second']:,.0f} metin/sn  tek={result['single_text_us']:.1f}µs")
+    print(f"Doğruluk farkı: {report['accuracy_delta']:+.4f}  tahmin uyumu: {report['prediction_agreement']:.2%}  "
+          f"boyut oranı: {report['size_ratio']:.2f}  hız oranı: {report['speedup']:.2f}x")
+    
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Önbellekli özelliklerle paralel model seçimi
+
+Kullanım:
+    python -m app.model_selection --data data/reviews.jsonl --folds 5 --n-jobs -1
+    python -m app.model_selection --cache-dir models/cv_cache --report selection.json
+
+Veri StratifiedKFold ile katlara ayrılır. Her katta vektörleştirici yalnızca
+eğitim kısmına fit edilir ve eğitim/doğrulama seyrek matrisleri bir kez
+üretilip önbelleğe alınır (--cache-dir verilirse joblib.Memory ile diske,
+sonraki çalıştırmalarda da yeniden kullanılır). Ardından sınıflandırıcı ve
+düzenlileştirme ızgarasındaki her (aday, kat) çifti aynı matrislerle paralel
+olarak eğitilip doğrulanır; aday sayısı arttıkça yalnızca fit maliyeti artar.
+En iyi aday tüm veride yeniden eğitilip model deposuna yayınlanır.
+"""
+import argparse
+import json
+import os
+import time
+import numpy as np
+from joblib import Memory, Parallel, delayed
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedKFold
+from app.sentiment_model import SentimentAnalyzer, build_vectorizer, FEATURIZERS
+from app.model_store import ModelStore
+from app.corpus_training import iter_corpus
+
+def default_candidates():
+    """
+    Değerlendirilecek sınıflandırıcı ızgarası: (ad, tahminci) çiftleri
+    
+    Yalnızca LinearScorer'ın dışa aktarabildiği olasılıklı doğrusal
+    modeller (LogisticRegression, SGDClassifier(log_loss)) yer alır.
+    """
+    candidates = []
+    for C in (0.1, 1.0, 10.0, 100.0):
+        for class_weight in (None, "balanced"):
+            name = f"logreg(C={C}, class_weight={class_weight})"
+            candidates.append((name, LogisticRegression(C=C, class_weight=class_weight,
+                                                        max_iter=1000, random_state=42)))
+    for alpha in (1e-6, 1e-5, 1e-4, 1e-3):
+        name = f"sgd_log(alpha={alpha})"
+        candidates.append((name, SGDClassifier(loss="log_loss", alpha=alpha, max_iter=50,
+                                               tol=1e-4, random_state=42)))
+    return candidates
+
+def vectorize_fold(featurizer, n_features, train_texts, val_texts):
+    """Vektörleştiriciyi eğitim katına fit et; (X_train, X_val) döndür"""
+    vectorizer = build_vectorizer(featurizer, n_features)
+    return vectorizer.fit_transform(train_texts), vectorizer.transform(val_texts)
+
+def build_folds(processed_texts, labels, n_folds=5, featurizer="tfidf", n_features=2 ** 18,
+                cache_dir=None, seed=42):
+    """Her kat için seyrek matrisleri bir kez üret (isteğe bağlı disk önbelleği)"""
+    vectorize = Memory(cache_dir, verbose=0).cache(vectorize_fold) if cache_dir else vectorize_fold
+    texts = np.asarray(processed_texts, dtype=object)
+    labels = np.asarray(labels)
+    
+    folds = []
+    splitter = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed)
+    for train_idx, val_idx in splitter.split(texts, labels):
+        X_train, X_val = vectorize(featurizer, n_features, texts[train_idx].tolist(), texts[val_idx].tolist())
+        folds.append((X_train, labels[train_idx], X_val, labels[val_idx]))
+    return folds
+
+def _evaluate(candidate_index, fold_index, estimator, fold):
+    X_train, y_train, X_val, y_val = fold
+    start = time.perf_counter()
+    model = clone(estimator).fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    accuracy = accuracy_score(y_val, model.predict(X_val))
+    return candidate_index, fold_index, accuracy, fit_seconds
+
+def evaluate_candidates(candidates, folds, n_jobs=-1):
+    """Tüm (aday, kat) çiftlerini paralel değerlendir; adaylar ortalama doğruluğa göre sıralı döner"""
+    outputs = Parallel(n_jobs=n_jobs)(
+        delayed(_evaluate)(i, j, estimator, fold)
+        for i, (_, estimator) in enumerate(candidates)
+        for j, fold in enumerate(folds)
+    )
+    
+    scores = [[0.0] * len(folds) for _ in candidates]
+    fit_times = [0.0] * len(candidates)
+    for i, j, accuracy, fit_seconds in outputs:
+        scores[i][j] = accuracy
+        fit_times[i] += fit_seconds
+    
+    results = [
+        {
+            "candidate": name,
+            "params": {k: v for k, v in estimator.get_params().items() if k in ("C", "class_weight", "alpha", "loss")},
+            "mean_accuracy": float(np.mean(scores[i])),
+            "std_accuracy": float(np.std(scores[i])),
+            "fold_accuracies": scores[i],
+            "fit_seconds": fit_times[i]
+        }
+        for i, (name, estimator) in enumerate(candidates)
+    ]
+    # Eşit doğrulukta daha kararlı (düşük std) aday öne geçer
+    order = sorted(range(len(results)), key=lambda i: (-results[i]["mean_accuracy"], results[i]["std_accuracy"]))
+    return [results[i] for i in order], [candidates[i] for i in order]
+
+def select_model(texts, labels, featurizer="tfidf", n_features=2 ** 18, n_folds=5, n_jobs=-1,
+                 cache_dir=None, candidates=None):
+    """
+    Izgarayı çapraz doğrulamayla değerlendir, en iyi adayı tüm veride eğit
+    
+    (eğitilmiş SentimentAnalyzer, rapor) döndürür.
+    """
+    candidates = candidates or default_candidates()
+    analyzer = SentimentAnalyzer(featurizer=featurizer, n_features=n_features)
+    processed_texts = analyzer.preprocess_batch(texts)
+    
+    start = time.perf_counter()
+    folds = build_folds(processed_texts, labels, n_folds, featurizer, n_features, cache_dir)
+    vectorize_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    results, ranked = evaluate_candidates(candidates, folds, n_jobs)
+    evaluate_seconds = time.perf_counter() - start
+    
+    best_name, best_estimator = ranked[0]
+    analyzer.model = clone(best_estimator)
+    analyzer.train(texts, labels)
+    
+    report = {
+        "texts": len(texts),
+        "folds": n_folds,
+        "featurizer": featurizer,
+        "candidates": len(candidates),
+        "vectorize_seconds": vectorize_seconds,
+        "evaluate_seconds": evaluate_seconds,
+        "best": results[0],
+        "results": results
+    }
+    return analyzer, report
+
+def load_data(path=None):
+    """Etiketli veri; dosya verilmezse örnek eğitim verisi kullanılır"""
+    if path is None:
+        return SentimentAnalyzer().create_sample_data()
+    texts, labels = [], []
+    for chunk_texts, chunk_labels in iter_corpus(path):
+        texts.extend(chunk_texts)
+        labels.extend(chunk_labels)
+    return texts, labels
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sentiment modeli için paralel model seçimi")
+    parser.add_argument("--data", help="JSONL ya da CSV etiketli veri (varsayılan: örnek veri)")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Paralel değerlendirme süreç sayısı")
+    parser.add_argument("--featurizer", choices=FEATURIZERS, default=os.getenv("SENTIMENT_FEATURIZER", "tfidf"))
+    parser.add_argument("--n-features", type=int, default=2 ** 18, help="Hashing özellik sayısı")
+    parser.add_argument("--cache-dir", help="Kat matrislerinin saklanacağı dizin (joblib.Memory)")
+    parser.add_argument("--model-store", default=os.getenv("MODEL_STORE_DIR", "models/sentiment"),
+                        help="En iyi modelin yayınlanacağı depo")
+    parser.add_argument("--no-publish", action="store_true", help="En iyi modeli depoya yayınlama")
+    parser.add_argument("--report", help="Aday sonuçlarının yazılacağı JSON dosyası")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    texts, labels = load_data(args.data)
+    analyzer, report = select_model(
+        texts, labels,
+        featurizer=args.featurizer,
+        n_features=args.n_features,
+        n_folds=args.folds,
+        n_jobs=args.n_jobs,
+        cache_dir=args.cache_dir
+    )
+    
+    for result in report["results"]:
+        print(f"{result['candidate']:<45} doğruluk={result['mean_accuracy']:.4f} ± {result['std_accuracy']:.4f}  "
+              f"fit={result['fit_seconds']:.2f}sn")
+    print(f"Vektörleştirme: {report['vectorize_seconds']:.2f}sn ({report['folds']} kat, bir kez)  "
+          f"değerlendirme: {report['evaluate_seconds']:.2f}sn ({report['candidates']} aday)")
+    print(f"En iyi: {report['best']['candidate']} ({report['best']['mean_accuracy']:.4f})")
+    
+    if not args.no_publish:
+        analyzer.publish_model(ModelStore(args.model_store), {
+            "source": args.data or "sample_data",
+            "accuracy": report["best"]["mean_accuracy"],
+            "selected_candidate": report["best"]["candidate"],
+            "cv_folds": args.folds
+        })
+    
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
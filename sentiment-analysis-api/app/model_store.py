@@ -0,0 +1,143 @@
+import json
+import os
+import shutil
+import numpy as np
+from app.fast_scorer import LinearScorer
+
+# Dizin düzeni değiştiğinde artırılır
+FORMAT_VERSION = 1
+
+ARRAYS = ("idf", "coef", "intercept", "classes")
+
+class ModelStore:
+    """
+    Pickle kullanmayan, versiyonlu ve bellek eşlemeli model deposu
+    
+    Her versiyon ayrı bir dizindir: sıralı sözlük (unicode dizi), IDF,
+    katsayı ve sabit terimler .npy dosyası olarak, tokenizer ayarları ve
+    meta bilgiler manifest.json içinde saklanır. Diziler mmap_mode='r' ile
+    açılır; birden fazla worker aynı sayfaları işletim sisteminin sayfa
+    önbelleğinden paylaşır ve yükleme neredeyse kopyasızdır. Aktif versiyon
+    CURRENT dosyasıyla gösterilir ve atomik olarak değiştirilir.
+    """
+    
+    def __init__(self, root, keep_versions=3):
+        self.root = root
+        self.keep_versions = keep_versions
+        self.pointer_path = os.path.join(root, "CURRENT")
+        os.makedirs(root, exist_ok=True)
+    
+    def current_version(self):
+        """Aktif versiyon adını oku"""
+        try:
+            with open(self.pointer_path) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+    
+    def publish(self, scorer, metadata):
+        """Skorlayıcıyı yeni bir versiyon olarak yaz ve aktif yap"""
+        while True:
+            version = f"v{self._latest_number() + 1}"
+            tmp_dir = os.path.join(self.root, f".{version}.{os.getpid()}.tmp")
+            os.makedirs(tmp_dir, exist_ok=True)
+            
+            self._write(tmp_dir, scorer, {**metadata, "model_version": version})
+            
+            try:
+                os.rename(tmp_dir, os.path.join(self.root, version))
+                break
+            except OSError:
+                # Başka bir süreç aynı versiyonu yayınladı, tekrar dene
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        
+        tmp_pointer = f"{self.pointer_path}.{os.getpid()}.tmp"
+        with open(tmp_pointer, "w") as f:
+            f.write(version)
+        os.replace(tmp_pointer, self.pointer_path)
+        
+        self._cleanup()
+        print(f"Model depoya yayınlandı: {self.root}/{version}")
+        return version
+    
+    def load(self, version=None, mmap_mode="r"):
+        """Bir versiyonu aç; (LinearScorer, manifest) döndürür"""
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"Model deposunda aktif versiyon yok: {self.root}")
+        
+        version_dir = os.path.join(self.root, version)
+        with open(os.path.join(version_dir, "manifest.json")) as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Desteklenmeyen model formatı: {manifest.get('format_version')}")
+        
+        arrays = {
+            name: np.load(os.path.join(version_dir, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+            for name in ARRAYS
+        }
+        vocabulary = None
+        if manifest["hash_features"] is None:
+            vocabulary = np.load(os.path.join(version_dir, "vocabulary.npy"),
+                                 mmap_mode=mmap_mode, allow_pickle=False)
+        
+        scorer = LinearScorer(
+            idf=arrays["idf"],
+            coef=arrays["coef"],
+            intercept=np.array(arrays["intercept"]),
+            classes=np.array(arrays["classes"]),
+            vocabulary=vocabulary,
+            hash_features=manifest["hash_features"],
+            token_pattern=manifest["token_pattern"],
+            stop_words=manifest["stop_words"],
+            lowercase=manifest["lowercase"],
+            sublinear_tf=manifest["sublinear_tf"],
+            norm=manifest["norm"],
+            mode=manifest["mode"],
+            # Bellek eşlemeli sözlük kopyalanmaz, ikili aramayla kullanılır
+            index="sorted" if mmap_mode else "dict"
+        )
+        return scorer, manifest
+    
+    def _write(self, directory, scorer, metadata):
+        # Ağırlıklar kendi hassasiyetleriyle (float64/32/16) yazılır
+        np.save(os.path.join(directory, "idf.npy"), np.ascontiguousarray(scorer.idf))
+        np.save(os.path.join(directory, "coef.npy"), np.ascontiguousarray(scorer.coef))
+        np.save(os.path.join(directory, "intercept.npy"), np.asarray(scorer.intercept))
+        np.save(os.path.join(directory, "classes.npy"), np.asarray(scorer.classes))
+        if scorer.vocabulary is not None:
+            # Sabit genişlikli unicode dizi: pickle gerektirmez, mmap ile açılabilir
+            np.save(os.path.join(directory, "vocabulary.npy"), np.asarray(scorer.vocabulary, dtype=str))
+        
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            **metadata,
+            "hash_features": scorer.hash_features,
+            "vocabulary_size": None if scorer.vocabulary is None else len(scorer.vocabulary),
+            "dtype": str(np.asarray(scorer.coef).dtype),
+            "token_pattern": scorer.token_pattern,
+            "stop_words": sorted(scorer.stop_words),
+            "lowercase": scorer.lowercase,
+            "sublinear_tf": scorer.sublinear_tf,
+            "norm": scorer.norm,
+            "mode": scorer.mode
+        }
+        with open(os.path.join(directory, "manifest.json"), "w") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+    
+    def _versions(self):
+        return sorted(
+            (d for d in os.listdir(self.root) if d.startswith("v") and d[1:].isdigit()),
+            key=lambda d: int(d[1:])
+        )
+    
+    def _latest_number(self):
+        versions = self._versions()
+        return int(versions[-1][1:]) if versions else 0
+    
+    def _cleanup(self):
+        # Eski versiyonları sil; açık mmap'ler Linux'ta inode silinse de geçerli kalır
+        current = self.current_version()
+        for version in self._versions()[:-self.keep_versions]:
+            if version != current:
+                shutil.rmtree(os.path.join(self.root, version), ignore_errors=True)
@@ -0,0 +1,105 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from app.model_store import ModelStore
+
+# Havuz süreçlerinde açık skorlayıcılar: (depo, versiyon) -> LinearScorer
+_scorers = {}
+
+def _score_shard(store_root, version, processed_texts):
+    key = (store_root, version)
+    scorer = _scorers.get(key)
+    if scorer is None:
+        # Yeni versiyon: eskisini bırak, depodan bellek eşlemeli aç
+        _scorers.clear()
+        scorer, _ = ModelStore(store_root).load(version)
+        _scorers[key] = scorer
+    return scorer.predict_proba(processed_texts)
+
+def resolve_processes(setting, workers=1):
+    """
+    Worker başına havuz süreç sayısı
+    
+    Her worker kendi havuzunu kurduğundan toplam süreç sayısı
+    workers * processes olur; bu yüzden CPU'lar worker'lar arasında
+    paylaştırılır. "auto" bu payın tamamını kullanır, sayı verilirse paya
+    kırpılır. Pay 1 ya da daha azsa havuz kurulmaz (tek süreçlik havuz
+    worker'ın kendisinde skorlamaktan yavaştır).
+    """
+    per_worker = (os.cpu_count() or 1) // max(1, workers)
+    processes = per_worker if str(setting).strip().lower() == "auto" else min(int(setting), per_worker)
+    return processes if processes > 1 else 0
+
+class ShardedScorer:
+    """
+    Büyük batch'leri bir süreç havuzunda parçalara bölerek skorlar
+    
+    Her süreç modeli depodan mmap ile açar; dizi sayfaları servis süreciyle
+    paylaşılır, yalnızca metinler ve olasılık matrisi süreçler arasında
+    taşınır. Parçalar istekteki model versiyonuyla skorlanır, böylece
+    yeniden eğitim sırasında bir batch'in tamamı aynı modelden geçer.
+    processes=0 iken havuz kurulmaz.
+    """
+    
+    def __init__(self, store, processes=0, min_batch_size=2000):
+        self.store = store
+        self.processes = processes
+        self.min_batch_size = min_batch_size
+        self.executor = None
+        self._lock = threading.Lock()
+        
+        # İstatistikler
+        self.batches = 0
+        self.texts = 0
+    
+    @property
+    def enabled(self):
+        return self.executor is not None
+    
+    def start(self):
+        if self.processes > 0 and self.executor is None:
+            # Çok thread'li servis sürecinden fork etmek yerine temiz süreç başlat
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+    
+    def stop(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+    
+    def should_split(self, n_texts):
+        return self.enabled and n_texts >= self.min_batch_size
+    
+    def predict_proba(self, version, processed_texts, local_scorer=None):
+        """
+        Metinleri süreç sayısı kadar parçaya bölüp olasılık matrisini birleştir
+        
+        Tekrarlar ayıklandıktan sonra eşiğin altında kalan batch'ler
+        local_scorer ile aynı süreçte skorlanır.
+        """
+        if local_scorer is not None and not self.should_split(len(processed_texts)):
+            return local_scorer.predict_proba(processed_texts)
+        
+        n_shards = min(self.processes, len(processed_texts))
+        bounds = np.linspace(0, len(processed_texts), n_shards + 1).astype(int)
+        shards = [processed_texts[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        
+        futures = [self.executor.submit(_score_shard, self.store.root, version, shard) for shard in shards]
+        proba = np.vstack([future.result() for future in futures])
+        
+        with self._lock:
+            self.batches += 1
+            self.texts += len(processed_texts)
+        return proba
+    
+    def stats(self):
+        return {
+            "processes": self.processes if self.enabled else 0,
+            "min_batch_size": self.min_batch_size,
+            "batches": self.batches,
+            "texts": self.texts
+        }
@@ -0,0 +1,90 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+class PredictionCache:
+    """
+    Normalize edilmiş metin ve model versiyonuna göre anahtarlanan LRU önbellek
+    
+    Büyük/küçük harf ya da noktalama farkı olan tekrarlı metinler aynı
+    normalize çıktıya düştüğü için tek bir kayıtla karşılanır. Anahtar metnin
+    kendisi değil, (model versiyonu, normalize metin) çiftinin sabit boyutlu
+    özetidir. Skorlama thread havuzunda çalıştığı için erişim kilitlidir.
+    """
+    
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # İstatistikler
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def enabled(self):
+        return self.max_size > 0
+    
+    @staticmethod
+    def key(processed_text, model_version):
+        data = f"{model_version}\x00{processed_text}".encode("utf-8")
+        return hashlib.blake2b(data, digest_size=16).digest()
+    
+    def get_many(self, keys):
+        """Anahtar listesi için kayıtları döndür (bulunamayanlar None)"""
+        with self._lock:
+            values = []
+            for key in keys:
+                value = self._entries.get(key)
+                if value is None:
+                    self.misses += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                values.append(value)
+            return values
+    
+    def put_many(self, items):
+        """(anahtar, kayıt) çiftlerini ekle, sınır aşılırsa en eskileri at"""
+        with self._lock:
+            for key, value in items:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Tüm kayıtları sil (model değiştiğinde)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+class DedupStats:
+    """Toplu skorlamada tekrar eden (aynı normalize) metinlerin sayacı"""
+    
+    def __init__(self):
+        self.texts = 0
+        self.unique_texts = 0
+        self._lock = threading.Lock()
+    
+    def record(self, total, unique):
+        with self._lock:
+            self.texts += total
+            self.unique_texts += unique
+    
+    def stats(self):
+        return {
+            "texts": self.texts,
+            "unique_texts": self.unique_texts,
+            "dedup_ratio": 1 - self.unique_texts / self.texts if self.texts else 0.0
+        }
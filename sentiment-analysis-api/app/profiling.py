@@ -0,0 +1,163 @@
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+class StageTimings:
+    """
+    Skorlama aşamalarının (ön işleme, vektörleştirme, predict_proba, yanıt
+    oluşturma) süre istatistikleri
+    
+    Her aşama için toplam/en yüksek süre ve yüzdelikler için son örneklerden
+    oluşan sınırlı bir pencere tutulur. Ölçüm maliyeti iki perf_counter
+    çağrısıdır; thread havuzundan eşzamanlı kayıt için kilitlidir.
+    """
+    
+    def __init__(self, window=4096):
+        self.window = window
+        self._lock = threading.Lock()
+        self._stages = {}
+    
+    @contextmanager
+    def measure(self, stage, items=1):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, items)
+    
+    def record(self, stage, seconds, items=1):
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = {
+                    "calls": 0, "items": 0, "total": 0.0, "max": 0.0,
+                    "samples": deque(maxlen=self.window)
+                }
+            entry["calls"] += 1
+            entry["items"] += items
+            entry["total"] += seconds
+            entry["max"] = max(entry["max"], seconds)
+            entry["samples"].append(seconds)
+    
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+    
+    def stats(self):
+        """Aşama başına milisaniye cinsinden özet"""
+        with self._lock:
+            snapshot = {stage: dict(entry, samples=sorted(entry["samples"])) for stage, entry in self._stages.items()}
+        
+        report = {}
+        for stage, entry in snapshot.items():
+            samples = entry["samples"]
+            report[stage] = {
+                "calls": entry["calls"],
+                "items": entry["items"],
+                "total_ms": entry["total"] * 1000,
+                "mean_ms": entry["total"] / entry["calls"] * 1000,
+                "per_item_us": entry["total"] / entry["items"] * 1e6 if entry["items"] else 0.0,
+                "p50_ms": _percentile(samples, 0.50) * 1000,
+                "p95_ms": _percentile(samples, 0.95) * 1000,
+                "max_ms": entry["max"] * 1000
+            }
+        return report
+
+def _percentile(sorted_samples, q):
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, int(q * len(sorted_samples)))]
+
+class SamplingProfiler:
+    """
+    sys._current_frames ile çalışan örnekleyici profiler
+    
+    Arka plandaki thread her interval_ms'de tüm thread'lerin yığınlarını
+    okur ve "dosya:fonksiyon;..." biçimindeki yığınları sayar. Uygulama
+    koduna müdahale etmez; çalışma zamanında açılıp kapatılabilir.
+    """
+    
+    def __init__(self, interval_ms=5.0, max_depth=40):
+        if interval_ms <= 0:
+            raise ValueError("interval_ms pozitif olmalı")
+        self.interval = interval_ms / 1000.0
+        self.max_depth = max_depth
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._stacks = Counter()
+        self._functions = Counter()
+        self.samples = 0
+        self.started_at = None
+        self.stopped_at = None
+    
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self, interval_ms=None):
+        if self.running:
+            return
+        if interval_ms is not None:
+            if interval_ms <= 0:
+                raise ValueError("interval_ms pozitif olmalı")
+            self.interval = interval_ms / 1000.0
+        self._stacks.clear()
+        self._functions.clear()
+        self.samples = 0
+        self.started_at = time.time()
+        self.stopped_at = None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.stopped_at = time.time()
+    
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                self._sample(own_id)
+    
+    def _sample(self, own_id):
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+                frame = frame.f_back
+            # Boşta bekleyen thread'leri sayma
+            if stack and stack[0].split(":")[1] in ("wait", "select", "poll", "_worker", "get"):
+                continue
+            self._stacks[";".join(reversed(stack))] += 1
+            for name in set(stack):
+                self._functions[name] += 1
+        self.samples += 1
+    
+    def report(self, top=25):
+        """En sık görülen yığınlar ve fonksiyonlar (kapsayıcı örnek sayısı)"""
+        end = self.stopped_at or time.time()
+        with self._lock:
+            top_functions = self._functions.most_common(top)
+            top_stacks = self._stacks.most_common(top)
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "duration_s": end - self.started_at if self.started_at else 0.0,
+            "top_functions": [{"function": f, "samples": n} for f, n in top_functions],
+            "top_stacks": [{"stack": s, "samples": n} for s, n in top_stacks]
+        }
+
+# Uygulama genelinde paylaşılan örnekler
+stage_timings = StageTimings()
+profiler = SamplingProfiler()
@@ -0,0 +1,98 @@
+import asyncio
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+class RetrainManager:
+    """
+    Yeniden eğitimi arka planda çalıştıran iş yöneticisi
+    
+    Eğitim, servis edilen modelden bağımsız yeni bir SentimentAnalyzer
+    üzerinde ayrı bir thread'de yapılır; /predict istekleri bu sırada eski
+    modelle yanıtlanmaya devam eder. Eğitim bitince swap_fn event loop
+    üzerinde çağrılır ve yeni model tek bir atama ile devreye alınır.
+    Aynı anda yalnızca bir eğitim çalışır; bekleyen iş varken gelen istek
+    mevcut işi döndürür.
+    """
+    
+    def __init__(self, train_fn, swap_fn, max_history=20):
+        self.train_fn = train_fn
+        self.swap_fn = swap_fn
+        self.max_history = max_history
+        self.executor = None
+        self._jobs = OrderedDict()
+        self._tasks = set()
+    
+    def start(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="retrain")
+    
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        if self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+    
+    def active_job(self):
+        """Kuyrukta ya da çalışmakta olan iş (yoksa None)"""
+        for job in reversed(self._jobs.values()):
+            if job["status"] in ("queued", "running"):
+                return job
+        return None
+    
+    def submit(self):
+        """Yeni bir eğitim işi başlat ve iş kaydını döndür"""
+        job = self.active_job()
+        if job is not None:
+            return job
+        
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "accuracy": None,
+            "model_version": None,
+            "generation": None,
+            "error": None
+        }
+        self._jobs[job["job_id"]] = job
+        while len(self._jobs) > self.max_history:
+            self._jobs.popitem(last=False)
+        
+        task = asyncio.create_task(self._run(job))
+        job["_task"] = task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+    
+    async def wait(self, job):
+        """İş bitene kadar bekle"""
+        task = job.get("_task")
+        if task is not None:
+            await asyncio.shield(task)
+        return job
+    
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+    
+    def jobs(self):
+        return list(reversed(self._jobs.values()))
+    
+    async def _run(self, job):
+        loop = asyncio.get_running_loop()
+        job["status"] = "running"
+        job["started_at"] = datetime.now().isoformat()
+        try:
+            candidate, accuracy = await loop.run_in_executor(self.executor, self.train_fn)
+            job["generation"] = self.swap_fn(candidate)
+            job["accuracy"] = accuracy
+            job["model_version"] = candidate.model_version
+            job["status"] = "succeeded"
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = str(e)
+        finally:
+            job["finished_at"] = datetime.now().isoformat()
@@ -1,29 +1,97 @@
+import os
 import pickle
 import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
+import scipy.sparse as sp
+from joblib import Parallel, delayed
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer, TfidfTransformer
 from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
-import re
+from app.text_normalizer import normalize_text, normalize_batch
+from app.fast_scorer import LinearScorer
+from app.profiling import stage_timings
+
+# Ön işleme değiştiğinde artırılır; farklı sürümle eğitilmiş model yüklenmez
+PREPROCESS_VERSION = 2
+
+FEATURIZERS = ("tfidf", "hashing")
+
+def build_vectorizer(featurizer="tfidf", n_features=2 ** 18):
+    """
+    Özellik çıkarıcıyı oluştur
+    
+    "tfidf": sözlük tabanlı TfidfVectorizer (fit edilmiş sözlük gerekir)
+    "hashing": HashingVectorizer + saklanan IDF ağırlıkları; sözlük tutmaz,
+    transform durumsuzdur ve parçalar ayrı süreçlerde işlenebilir
+    """
+    if featurizer == "tfidf":
+        return TfidfVectorizer(max_features=5000, stop_words='english')
+    if featurizer == "hashing":
+        return Pipeline([
+            ('hashing', HashingVectorizer(n_features=n_features, alternate_sign=False,
+                                          norm=None, stop_words='english')),
+            ('idf', TfidfTransformer())
+        ])
+    raise ValueError(f"Bilinmeyen featurizer: {featurizer} (seçenekler: {', '.join(FEATURIZERS)})")
+
+def _hash_shard(hashing_vectorizer, texts):
+    return hashing_vectorizer.transform(texts)
 
 class SentimentAnalyzer:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(max_features=5000, stop_words='english')
+    def __init__(self, featurizer="tfidf", n_features=2 ** 18):
+        self.featurizer = featurizer
+        self.n_features = n_features
+        self.vectorizer = build_vectorizer(featurizer, n_features)
         self.model = LogisticRegression(random_state=42)
         self.is_trained = False
+        # Eğitim/yükleme sonrası sklearn modelinden dışa aktarılan hızlı skorlayıcı
+        self.scorer = None
+        # Depodaki versiyon adı (yayınlanmamış modelde None)
+        self.model_version = None
+        # Depodan açılan modelde sklearn nesnesi yoktur, sınıf adı manifest'ten gelir
+        self.stored_model_type = None
+    
+    @property
+    def model_type(self):
+        """Skorlayıcının dışa aktarıldığı sınıflandırıcının sınıf adı"""
+        if self.model is not None:
+            return type(self.model).__name__
+        return self.stored_model_type
     
     def preprocess_text(self, text):
-        """Basit metin ön işleme"""
-        if isinstance(text, str):
-            # Küçük harfe çevir
-            text = text.lower()
-            # Özel karakterleri temizle
-            text = re.sub(r'[^a-zA-Z\s]', '', text)
-            # Fazla boşlukları temizle
-            text = re.sub(r'\s+', ' ', text).strip()
-            return text
-        return ""
+        """Metin ön işleme (Türkçe harfleri koruyarak)"""
+        return normalize_text(text)
+    
+    def preprocess_batch(self, texts):
+        """Bir metin listesini tek geçişte ön işle"""
+        return normalize_batch(texts)
+    
+    def transform_parallel(self, processed_texts, n_jobs=-1, shard_size=10000, apply_idf=True):
+        """
+        Ön işlenmiş metinleri parçalara bölüp paralel süreçlerde vektörleştir
+        
+        Yalnızca hashing featurizer için süreçlere dağıtılır; sözlük tabanlı
+        TF-IDF'te her sürece sözlüğü kopyalamak kazancı yok eder. Süreçlere
+        sadece durumsuz HashingVectorizer gönderilir, IDF ağırlıkları ana
+        süreçte tek bir seyrek çarpımla uygulanır. apply_idf=False ham
+        terim frekanslarını döndürür (IDF henüz hesaplanmamışken).
+        """
+        if self.featurizer != "hashing":
+            return self.vectorizer.transform(processed_texts)
+        
+        hashing = self.vectorizer.named_steps['hashing']
+        if len(processed_texts) <= shard_size:
+            counts = hashing.transform(processed_texts)
+        else:
+            shards = [processed_texts[i:i + shard_size] for i in range(0, len(processed_texts), shard_size)]
+            counts = sp.vstack(Parallel(n_jobs=n_jobs)(
+                delayed(_hash_shard)(hashing, shard) for shard in shards
+            )).tocsr()
+        if not apply_idf:
+            return counts
+        return self.vectorizer.named_steps['idf'].transform(counts)
     
     def create_sample_data(self):
         """Örnek veri seti oluştur"""
@@ -76,8 +144,13 @@ class SentimentAnalyzer:
         if texts is None or labels is None:
             texts, labels = self.create_sample_data()
         
+        # Depodan açılan modelde sklearn nesneleri yoktur, yenilerini oluştur
+        if self.vectorizer is None or self.model is None:
+            self.vectorizer = build_vectorizer(self.featurizer, self.n_features)
+            self.model = LogisticRegression(random_state=42)
+        
         # Metinleri ön işle
-        processed_texts = [self.preprocess_text(text) for text in texts]
+        processed_texts = self.preprocess_batch(texts)
         
         # TF-IDF vektörlerini oluştur
         X = self.vectorizer.fit_transform(processed_texts)
@@ -85,13 +158,15 @@ class SentimentAnalyzer:
         # Modeli eğit
         self.model.fit(X, labels)
         self.is_trained = True
+        self.scorer = LinearScorer.from_analyzer(self)
+        self.model_version = None
         
         # Eğitim performansını değerlendir
         y_pred = self.model.predict(X)
         accuracy = accuracy_score(labels, y_pred)
         
         print(f"Model eğitildi. Doğruluk: {accuracy:.2f}")
-        print(classification_report(labels, y_pred, 
+        print(classification_report(labels, y_pred,
                                   target_names=['Negatif', 'Pozitif', 'Nötr']))
         
         return accuracy
@@ -102,9 +177,15 @@ class SentimentAnalyzer:
             raise ValueError("Model henüz eğitilmemiş!")
         
         processed_text = self.preprocess_text(text)
-        X = self.vectorizer.transform([processed_text])
-        prediction = self.model.predict(X)[0]
-        probability = np.max(self.model.predict_proba(X))
+        if self.scorer is not None:
+            # Hızlı yol: seyrek matris ve sklearn çağrısı olmadan skorla
+            probabilities = self.scorer.predict_proba_one(processed_text)
+            prediction = self.scorer.classes[np.argmax(probabilities)]
+        else:
+            X = self.vectorizer.transform([processed_text])
+            probabilities = self.model.predict_proba(X)[0]
+            prediction = self.model.classes_[np.argmax(probabilities)]
+        probability = np.max(probabilities)
         
         sentiment_map = {0: "negatif", 1: "pozitif", 2: "nötr"}
         sentiment = sentiment_map.get(prediction, "bilinmiyor")
@@ -116,43 +197,80 @@ class SentimentAnalyzer:
             "prediction": int(prediction)
         }
     
-    def predict_batch(self, texts):
-        """Birden fazla metin için tahmin yap"""
+    def predict_batch(self, texts, processed_texts=None, proba_fn=None):
+        """
+        Birden fazla metin için tahmin yap (ön işlenmiş metinler verilebilir)
+        
+        Aynı normalize metne düşen girdiler tek satıra indirilir, her benzersiz
+        metin bir kez skorlanır ve sonuç orijinal sıradaki tüm konumlara dağıtılır.
+        proba_fn verilirse benzersiz metinlerin olasılıkları onunla hesaplanır
+        (örn. süreç havuzunda parçalı skorlama).
+        """
         if not self.is_trained:
             raise ValueError("Model henüz eğitilmemiş!")
         
-        processed_texts = [self.preprocess_text(text) for text in texts]
-        X = self.vectorizer.transform(processed_texts)
-        predictions = self.model.predict(X)
-        probabilities = np.max(self.model.predict_proba(X), axis=1)
+        if processed_texts is None:
+            with stage_timings.measure("preprocess", len(texts)):
+                processed_texts = self.preprocess_batch(texts)
+        
+        unique_index = {}
+        inverse = [unique_index.setdefault(text, len(unique_index)) for text in processed_texts]
+        unique_texts = list(unique_index)
+        
+        # Aşama süreleri /debug/stages üzerinden izlenir
+        if proba_fn is not None and self.scorer is not None:
+            with stage_timings.measure("sharded_scoring", len(unique_texts)):
+                proba = proba_fn(unique_texts)
+            classes = self.scorer.classes
+        elif self.scorer is not None:
+            with stage_timings.measure("vectorize", len(unique_texts)):
+                X = self.scorer.transform(unique_texts)
+            with stage_timings.measure("predict_proba", len(unique_texts)):
+                proba = self.scorer.predict_proba_features(X)
+            classes = self.scorer.classes
+        else:
+            with stage_timings.measure("vectorize", len(unique_texts)):
+                X = self.vectorizer.transform(unique_texts)
+            with stage_timings.measure("predict_proba", len(unique_texts)):
+                proba = self.model.predict_proba(X)
+            classes = self.model.classes_
+        predictions = classes[np.argmax(proba, axis=1)]
+        probabilities = np.max(proba, axis=1)
         
         sentiment_map = {0: "negatif", 1: "pozitif", 2: "nötr"}
         
-        results = []
-        for i, (text, pred, prob) in enumerate(zip(texts, predictions, probabilities)):
-            sentiment = sentiment_map.get(pred, "bilinmiyor")
-            results.append({
-                "text": text,
-                "sentiment": sentiment,
+        unique_results = [
+            {
+                "sentiment": sentiment_map.get(pred, "bilinmiyor"),
                 "confidence": float(prob),
                 "prediction": int(pred)
-            })
+            }
+            for pred, prob in zip(predictions, probabilities)
+        ]
         
-        return results
+        return [{"text": text, **unique_results[j]} for text, j in zip(texts, inverse)]
     
     def save_model(self, filepath):
         """Modeli kaydet"""
         if not self.is_trained:
             raise ValueError("Model henüz eğitilmemiş!")
+        if self.model is None:
+            raise ValueError("Depodan açılan model pickle olarak kaydedilemez, publish_model kullanın")
         
         model_data = {
             'vectorizer': self.vectorizer,
             'model': self.model,
-            'is_trained': self.is_trained
+            'is_trained': self.is_trained,
+            'preprocess_version': PREPROCESS_VERSION,
+            'featurizer': self.featurizer,
+            'n_features': self.n_features
         }
         
-        with open(filepath, 'wb') as f:
+        # Yarım yazılmış dosya okunmasın: geçici dosyaya yaz, sonra atomik değiştir
+        tmp_path = f"{filepath}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
             pickle.dump(model_data, f)
+        os.replace(tmp_path, filepath)
         print(f"Model {filepath} dosyasına kaydedildi.")
     
     def load_model(self, filepath):
@@ -160,10 +278,54 @@ class SentimentAnalyzer:
         with open(filepath, 'rb') as f:
             model_data = pickle.load(f)
         
+        if model_data.get('preprocess_version', 1) != PREPROCESS_VERSION:
+            raise ValueError("Model farklı bir ön işleme sürümüyle eğitilmiş, yeniden eğitilmeli")
+        
         self.vectorizer = model_data['vectorizer']
         self.model = model_data['model']
         self.is_trained = model_data['is_trained']
+        self.featurizer = model_data.get('featurizer', 'tfidf')
+        self.n_features = model_data.get('n_features', 2 ** 18)
+        self.scorer = LinearScorer.from_analyzer(self)
+        self.model_version = None
         print(f"Model {filepath} dosyasından yüklendi.")
+    
+    def publish_model(self, store, metadata=None):
+        """Modeli pickle'sız dizin formatında depoya yeni versiyon olarak yaz"""
+        if not self.is_trained:
+            raise ValueError("Model henüz eğitilmemiş!")
+        
+        self.model_version = store.publish(self.scorer, {
+            **(metadata or {}),
+            'preprocess_version': PREPROCESS_VERSION,
+            'featurizer': self.featurizer,
+            'n_features': self.n_features,
+            'model_type': self.model_type
+        })
+        return self.model_version
+    
+    def load_from_store(self, store, version=None):
+        """
+        Depodaki bir versiyonu bellek eşlemeli olarak aç
+        
+        Yalnızca skorlama dizileri yüklenir; sklearn vektörleştirici ve
+        sınıflandırıcı saklanmaz, yeniden eğitimde sıfırdan oluşturulur.
+        """
+        scorer, manifest = store.load(version)
+        if manifest.get('preprocess_version', 1) != PREPROCESS_VERSION:
+            raise ValueError("Model farklı bir ön işleme sürümüyle eğitilmiş, yeniden eğitilmeli")
+        
+        self.scorer = scorer
+        self.vectorizer = None
+        self.model = None
+        self.featurizer = manifest['featurizer']
+        self.n_features = manifest['n_features']
+        self.model_version = manifest['model_version']
+        # model_type kaydından önceki versiyonlar yalnızca LogisticRegression olabilir
+        self.stored_model_type = manifest.get('model_type', 'LogisticRegression')
+        self.is_trained = True
+        print(f"Model depodan yüklendi: {manifest['model_version']}")
+        return manifest
 
 if __name__ == "__main__":
     # Model oluştur ve eğit
@@ -185,4 +347,4 @@ if __name__ == "__main__":
         print("-" * 50)
     
     # Modeli kaydet
-    analyzer.save_model('sentiment_model.pkl') 
\ No newline at end of file
+    analyzer.save_model('sentiment_model.pkl')
\ No newline at end of file
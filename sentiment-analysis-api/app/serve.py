@@ -0,0 +1,63 @@
+"""
+Production başlatıcı: modeli bir kez hazırla, N worker fork et
+
+Kullanım:
+    python -m app.serve --workers 4 --port 8000
+
+Master süreç modeli (depodan açar, eski pickle'ı içe aktarır ya da eğitir)
+bir kez hazırlar. Uygulama master'da önceden import edilir (preload);
+worker'lar fork ile kütüphane belleğini ve depodan bellek eşlemeli açılmış
+model dizilerini paylaşır. Bir worker'da /retrain tamamlandığında yeni
+versiyon depoya yayınlanır, diğer worker'lar MODEL_STORE_POLL_INTERVAL
+içinde aynı versiyona geçer.
+"""
+import argparse
+import os
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sentiment Analysis API production başlatıcı")
+    parser.add_argument("--host", default=os.getenv("API_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WORKERS", os.cpu_count() or 1)))
+    parser.add_argument("--model-store", default=os.getenv("MODEL_STORE_DIR", "models/sentiment"))
+    parser.add_argument("--timeout", type=int, default=int(os.getenv("WORKER_TIMEOUT", "120")))
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    
+    # app.main import edilmeden önce ayarlanmalı; worker sayısı skorlama
+    # havuzunun boyutunu belirler (PARALLEL_SCORING_PROCESSES)
+    os.environ["MODEL_STORE_DIR"] = args.model_store
+    os.environ["WORKERS"] = str(args.workers)
+    
+    from gunicorn.app.base import BaseApplication
+    from . import main as api
+    
+    # Modeli master'da bir kez hazırla; worker'lar hazır devralır
+    api.prepare_model_store()
+    print(f"Model deposu hazır: {args.model_store} ({api.model_store.current_version()})")
+    
+    class SentimentApplication(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+        
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            return self.application
+    
+    SentimentApplication(api.app, {
+        "bind": f"{args.host}:{args.port}",
+        "workers": args.workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "timeout": args.timeout
+    }).run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import json
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+
+class RequestStreamingResponse(StreamingResponse):
+    """
+    İstek gövdesini okurken yanıt akıtan StreamingResponse
+    
+    Standart StreamingResponse bağlantı kopmasını dinlemek için receive()
+    çağırır ve bu, gövdeden okunmamış parçaları tüketir. Burada gövde zaten
+    request.stream() ile okunduğundan kopma orada ClientDisconnect olarak
+    yakalanır.
+    """
+    
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.stream_response(send)
+        except ClientDisconnect:
+            return
+        if self.background is not None:
+            await self.background()
+
+class OversizedLine(Exception):
+    """max_line_bytes sınırını aşan satır"""
+
+async def iter_ndjson_lines(byte_stream, max_line_bytes=1024 * 1024):
+    """
+    Gelen bayt akışını satırlara böl
+    
+    Yalnızca yarım kalan son satırın parçaları bellekte tutulur; parçalar
+    listede biriktirilip satır tamamlanınca bir kez birleştirilir, böylece
+    uzun satırlar gelen parça sayısıyla karesel kopyalamaya yol açmaz. Sınırı
+    aşan satır OversizedLine nesnesi olarak bildirilir ve satır sonuna kadar
+    atlanır.
+    """
+    pieces = []
+    pending = 0
+    discarding = False
+    async for chunk in byte_stream:
+        if not chunk:
+            continue
+        parts = chunk.split(b"\n")
+        for part in parts[:-1]:
+            # Her parça bir satırı tamamlar
+            if discarding:
+                # Aşırı uzun satırın kalanı
+                discarding = False
+            else:
+                pieces.append(part)
+                line = b"".join(pieces)
+                yield line if len(line) <= max_line_bytes else OversizedLine(f"Satır {max_line_bytes} baytı aşıyor")
+            pieces = []
+            pending = 0
+        
+        tail = parts[-1]
+        if tail and not discarding:
+            pieces.append(tail)
+            pending += len(tail)
+            if pending > max_line_bytes:
+                yield OversizedLine(f"Satır {max_line_bytes} baytı aşıyor")
+                discarding = True
+                pieces = []
+                pending = 0
+    if pieces:
+        yield b"".join(pieces)
+
+def parse_line(line):
+    """
+    Bir NDJSON satırını (metin, id) çiftine çevir
+    
+    Kabul edilen biçimler: "metin" ya da {"text": "metin", "id": ...}.
+    Geçersiz satırlar için ValueError fırlatılır.
+    """
+    if isinstance(line, OversizedLine):
+        raise ValueError(str(line))
+    if not line.strip():
+        raise ValueError("empty line")
+    try:
+        record = json.loads(line)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Geçersiz JSON: {e}")
+    
+    record_id = None
+    if isinstance(record, dict):
+        record_id = record.get("id")
+        record = record.get("text")
+    if not isinstance(record, str):
+        raise ValueError("Satır bir metin ya da 'text' alanı olan bir nesne olmalı")
+    if not record.strip():
+        raise ValueError("Metin boş olamaz")
+    return record, record_id
+
+async def stream_predictions(lines, score_fn, chunk_size=256):
+    """
+    Satırları sabit boyutlu parçalar halinde skorla ve sonuçları sırayla üret
+    
+    score_fn bir metin listesi alıp aynı sırada sonuç listesi döndüren bir
+    coroutine'dir. Her girdi satırı için tek bir çıktı satırı üretilir:
+    {"line": n, "status": "ok", ...} ya da {"line": n, "status": "error",
+    "error": ...}. Boş satırlar da "empty line" hatasıyla bildirilir, böylece
+    çıktı satırları girdiyle birebir eşleşir.
+    """
+    pending = []
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        try:
+            text, record_id = parse_line(line)
+            pending.append((line_number, record_id, text, None))
+        except ValueError as e:
+            pending.append((line_number, None, None, str(e)))
+        
+        if len(pending) >= chunk_size:
+            async for output in _score_chunk(pending, score_fn):
+                yield output
+            pending = []
+    
+    if pending:
+        async for output in _score_chunk(pending, score_fn):
+            yield output
+
+async def _score_chunk(rows, score_fn):
+    texts = [text for _, _, text, error in rows if error is None]
+    results = []
+    scoring_error = None
+    if texts:
+        try:
+            results = await score_fn(texts)
+        except Exception as e:
+            scoring_error = f"Tahmin hatası: {e}"
+    
+    scored = iter(results)
+    for line_number, record_id, text, error in rows:
+        output = {"line": line_number}
+        if record_id is not None:
+            output["id"] = record_id
+        error = error or scoring_error
+        if error is None:
+            output.update(status="ok", **next(scored))
+        else:
+            output.update(status="error", error=error)
+        yield json.dumps(output, ensure_ascii=False) + "\n"
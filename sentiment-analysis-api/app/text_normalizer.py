@@ -0,0 +1,68 @@
+import unicodedata
+
+# Kelime içi kesme işaretleri silinir ("Ankara'da" -> "ankarada"), diğer
+# harf dışı karakterler boşluğa dönüşür ("iyi,kötü" -> "iyi kötü")
+APOSTROPHES = {"'", "’", "ʼ", "`"}
+
+# Toplu normalizasyonda metinleri ayırmak için kullanılan karakter
+RECORD_SEPARATOR = "\x1e"
+
+class _NormalizationTable(dict):
+    """
+    str.translate için tembel doldurulan dönüşüm tablosu
+    
+    Her kod noktası ilk görüldüğünde sınıflandırılır ve sonuç saklanır;
+    sonraki metinlerde dönüşüm tamamen C seviyesinde yapılır. Küçük harfe
+    çevirme de aynı geçişte yapılır: Türkçe'de 'I' -> 'ı' ve 'İ' -> 'i'
+    olmalıdır, str.lower() ise 'I' -> 'i' ve 'İ' -> 'i̇' üretir.
+    """
+    
+    def __init__(self, keep=()):
+        super().__init__()
+        self.update({ord("I"): "ı", ord("İ"): "i"})
+        for ch in keep:
+            self[ord(ch)] = ch
+    
+    def __missing__(self, codepoint):
+        ch = chr(codepoint)
+        if ch.isalpha():
+            value = ch.lower()
+        elif ch in APOSTROPHES or unicodedata.category(ch).startswith("M"):
+            # Tek başına kalan birleştirici işaretler kelimeyi bölmesin
+            value = None
+        else:
+            value = " "
+        self[codepoint] = value
+        return value
+
+_TABLE = _NormalizationTable()
+_BATCH_TABLE = _NormalizationTable(keep=RECORD_SEPARATOR)
+
+def _compose(text):
+    # Ayrışık biçimde gelen harfleri (c + U+0327 gibi) tek kod noktasına birleştir
+    if text.isascii() or unicodedata.is_normalized("NFC", text):
+        return text
+    return unicodedata.normalize("NFC", text)
+
+def normalize_text(text):
+    """Tek bir metni normalize et: küçük harf, harf dışı karakter temizliği, boşluk sadeleştirme"""
+    if not isinstance(text, str):
+        return ""
+    return " ".join(_compose(text).translate(_TABLE).split())
+
+def normalize_batch(texts):
+    """
+    Bir metin listesini tek translate geçişiyle normalize et
+    
+    Metinler ayırıcı karakterle birleştirilip tek seferde dönüştürülür,
+    ardından tekrar bölünür. Sonuç normalize_text ile birebir aynıdır.
+    """
+    cleaned = [text if isinstance(text, str) else "" for text in texts]
+    if not cleaned:
+        return []
+    joined = RECORD_SEPARATOR.join(cleaned)
+    if joined.count(RECORD_SEPARATOR) != len(cleaned) - 1:
+        # Ayırıcıyı içeren metin varsa önce temizle
+        joined = RECORD_SEPARATOR.join(text.replace(RECORD_SEPARATOR, " ") for text in cleaned)
+    joined = _compose(joined).translate(_BATCH_TABLE)
+    return [" ".join(part.split()) for part in joined.split(RECORD_SEPARATOR)]
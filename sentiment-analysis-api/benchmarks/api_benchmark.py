@@ -0,0 +1,203 @@
+"""
+Sentiment API yük ve aşama profili benchmark'ı
+
+Uygulamayı iki şekilde sürer:
+  inprocess: httpx ASGITransport ile aynı süreçte (ağ yok, saf uygulama maliyeti)
+  socket   : ayrı bir uvicorn sürecine yerel TCP soketi üzerinden
+
+Her (eşzamanlılık, batch boyutu) kombinasyonu için uçtan uca gecikme
+yüzdelikleri, istek/metin hızı ve /debug/stages üzerinden aşama dökümü
+(ön işleme, vektörleştirme, predict_proba, yanıt oluşturma) toplanır ve JSON
+rapora yazılır. --profile ile her koşu boyunca örnekleyici profiler açılır.
+Uygulama modeli geçici bir dizinde eğitip yayınlar; kaynak ağacındaki
+model deposuna dokunulmaz.
+
+Kullanım:
+    python benchmarks/api_benchmark.py --mode inprocess --concurrency 1,8,32 --batch-sizes 1,16,128
+    python benchmarks/api_benchmark.py --mode socket --requests 500 --profile --output report.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from featurizer_comparison import build_corpus
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def server_env(args):
+    # Model deposu ve eski model yolu geçici dizinde: servis edilen modele dokunma
+    env = dict(
+        os.environ,
+        ENABLE_DEBUG_ENDPOINTS="true",
+        MODEL_STORE_DIR=os.path.join(args.workdir, "models"),
+        LEGACY_MODEL_PATH=os.path.join(args.workdir, "sentiment_model.pkl"),
+        PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_DIR, os.environ.get("PYTHONPATH")]))
+    )
+    if not args.cache:
+        env["PREDICTION_CACHE_SIZE"] = "0"
+    return env
+
+async def run_config(client, corpus, concurrency, batch_size, n_requests, profile):
+    """Tek bir (eşzamanlılık, batch boyutu) koşusu"""
+    await client.post("/debug/stages/reset")
+    if profile:
+        await client.post("/debug/profiler/start")
+    
+    rng = random.Random(concurrency * 1000 + batch_size)
+    latencies = []
+    errors = 0
+    counter = iter(range(n_requests))
+    
+    async def worker():
+        nonlocal errors
+        for _ in counter:
+            texts = rng.sample(corpus, batch_size)
+            if batch_size == 1:
+                path, payload = "/predict", {"text": texts[0]}
+            else:
+                path, payload = "/predict/batch", {"texts": texts}
+            start = time.perf_counter()
+            response = await client.post(path, json=payload)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    
+    stages = (await client.get("/debug/stages")).json()
+    result = {
+        "concurrency": concurrency,
+        "batch_size": batch_size,
+        "requests": n_requests,
+        "errors": errors,
+        "seconds": elapsed,
+        "requests_per_second": n_requests / elapsed,
+        "texts_per_second": n_requests * batch_size / elapsed,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p95": percentile(latencies, 0.95) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+            "mean": sum(latencies) / len(latencies) * 1000
+        },
+        "stages": stages
+    }
+    # Aşamalara dağılmayan süre: framework, doğrulama, serileştirme, kuyruk bekleme
+    staged = sum(stage["total_ms"] for stage in stages.values())
+    result["unattributed_ms_per_request"] = max(0.0, result["latency_ms"]["mean"] - staged / n_requests)
+    
+    if profile:
+        result["profile"] = (await client.post("/debug/profiler/stop", params={"top": 15})).json()
+    return result
+
+async def run_inprocess(args, corpus):
+    for key, value in server_env(args).items():
+        os.environ[key] = value
+    from app import main as api
+    
+    await api.app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await sweep(client, args, corpus)
+    finally:
+        await api.app.router.shutdown()
+
+async def run_socket(args, corpus):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=args.workdir, env=server_env(args), stdout=subprocess.DEVNULL
+    )
+    try:
+        limits = httpx.Limits(max_connections=max(args.concurrency_levels))
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+            for _ in range(300):
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.1)
+            return await sweep(client, args, corpus)
+    finally:
+        server.terminate()
+        server.wait()
+
+async def sweep(client, args, corpus):
+    # Isınma: ilk istekler model/JIT önbelleklerini doldurur
+    for _ in range(20):
+        await client.post("/predict", json={"text": corpus[0]})
+    
+    results = []
+    for concurrency in args.concurrency_levels:
+        for batch_size in args.batch_size_levels:
+            result = await run_config(client, corpus, concurrency, batch_size, args.requests, args.profile)
+            results.append(result)
+            stages = result["stages"]
+            breakdown = "  ".join(
+                f"{name}={stages[name]['per_item_us']:.0f}µs" for name in
+                ("preprocess", "cache_lookup", "vectorize", "predict_proba", "response") if name in stages
+            )
+            print(f"c={concurrency:<3d} b={batch_size:<4d} {result['requests_per_second']:8.1f} req/s "
+                  f"{result['texts_per_second']:10.1f} metin/sn  p50={result['latency_ms']['p50']:7.2f}ms "
+                  f"p95={result['latency_ms']['p95']:7.2f}ms  | metin başına: {breakdown}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentiment API benchmark ve profil aracı")
+    parser.add_argument("--mode", choices=["inprocess", "socket"], default="inprocess")
+    parser.add_argument("--concurrency", default="1,8,32", help="Virgülle ayrılmış eşzamanlılık seviyeleri")
+    parser.add_argument("--batch-sizes", default="1,16,128", help="Virgülle ayrılmış batch boyutları")
+    parser.add_argument("--requests", type=int, default=300, help="Her kombinasyon için istek sayısı")
+    parser.add_argument("--corpus-size", type=int, default=5000)
+    parser.add_argument("--cache", action="store_true", help="Tahmin önbelleğini açık bırak")
+    parser.add_argument("--profile", action="store_true", help="Örnekleyici profiler'ı her koşuda çalıştır")
+    parser.add_argument("--output", default="benchmark_report.json")
+    args = parser.parse_args()
+    args.concurrency_levels = [int(v) for v in args.concurrency.split(",")]
+    args.batch_size_levels = [int(v) for v in args.batch_sizes.split(",")]
+    
+    corpus, _ = build_corpus(args.corpus_size)
+    runner = run_inprocess if args.mode == "inprocess" else run_socket
+    with tempfile.TemporaryDirectory(prefix="sentiment-bench-") as workdir:
+        args.workdir = workdir
+        results = asyncio.run(runner(args, corpus))
+    
+    report = {
+        "mode": args.mode,
+        "cache": args.cache,
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Rapor yazıldı: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+TF-IDF ve hashing featurizer karşılaştırması
+
+Örnek veriden üretilen sentetik etiketli korpus üzerinde iki featurizer'ı
+held-out doğruluk, vektörleştirme hızı (tek süreç ve paralel) ve model
+dosyası boyutu açısından karşılaştırır.
+
+Kullanım:
+    python benchmarks/featurizer_comparison.py --size 200000 --n-jobs 4
+"""
+import argparse
+import os
+import pickle
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+
+from app.sentiment_model import SentimentAnalyzer
+
+FILLER = ["bugün", "dün", "yine", "gerçekten", "sanırım", "bence", "aslında", "biraz", "hafta", "sonu",
+          "arkadaşlarla", "ailece", "ilk", "kez", "tekrar", "mağaza", "sipariş", "kargo", "fiyat", "paket"]
+
+def build_corpus(size, seed=42):
+    """Aynı sınıftan cümleleri dolgu kelimeleriyle karıştırarak etiketli korpus üret"""
+    rng = random.Random(seed)
+    texts, labels = SentimentAnalyzer().create_sample_data()
+    by_label = {}
+    for text, label in zip(texts, labels):
+        by_label.setdefault(label, []).append(text)
+    
+    corpus, targets = [], []
+    for _ in range(size):
+        label = rng.choice(list(by_label))
+        parts = rng.sample(by_label[label], rng.randint(1, 2))
+        parts += rng.sample(FILLER, rng.randint(0, 4))
+        rng.shuffle(parts)
+        corpus.append(" ".join(parts))
+        targets.append(label)
+    return corpus, targets
+
+def evaluate(featurizer, X_train, X_test, y_train, y_test, n_jobs):
+    analyzer = SentimentAnalyzer(featurizer=featurizer)
+    
+    start = time.perf_counter()
+    processed_train = analyzer.preprocess_batch(X_train)
+    X = analyzer.vectorizer.fit_transform(processed_train)
+    analyzer.model.fit(X, y_train)
+    analyzer.is_trained = True
+    train_seconds = time.perf_counter() - start
+    
+    processed_test = analyzer.preprocess_batch(X_test)
+    
+    start = time.perf_counter()
+    X_eval = analyzer.vectorizer.transform(processed_test)
+    transform_seconds = time.perf_counter() - start
+    
+    # Süreç havuzunu ısıt (ilk çağrıdaki süreç başlatma maliyeti ölçülmesin)
+    analyzer.transform_parallel(processed_test[:20000], n_jobs=n_jobs)
+    
+    start = time.perf_counter()
+    X_parallel = analyzer.transform_parallel(processed_test, n_jobs=n_jobs)
+    parallel_seconds = time.perf_counter() - start
+    assert abs(X_parallel - X_eval).max() < 1e-12
+    
+    accuracy = accuracy_score(y_test, analyzer.model.predict(X_eval))
+    vectorizer_bytes = len(pickle.dumps(analyzer.vectorizer))
+    
+    return {
+        "featurizer": featurizer,
+        "accuracy": accuracy,
+        "train_seconds": train_seconds,
+        "transform_per_sec": len(processed_test) / transform_seconds,
+        "parallel_per_sec": len(processed_test) / parallel_seconds,
+        "vectorizer_kb": vectorizer_bytes / 1024
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Featurizer karşılaştırması")
+    parser.add_argument("--size", type=int, default=200000, help="Korpus boyutu")
+    parser.add_argument("--n-jobs", type=int, default=4, help="Paralel transform süreç sayısı")
+    args = parser.parse_args()
+    
+    corpus, targets = build_corpus(args.size)
+    X_train, X_test, y_train, y_test = train_test_split(
+        corpus, targets, test_size=0.5, random_state=42, stratify=targets
+    )
+    print(f"Korpus: {len(X_train)} eğitim / {len(X_test)} test metni, CPU: {os.cpu_count()}, n_jobs: {args.n_jobs}")
+    print("-" * 88)
+    print(f"{'featurizer':10s} {'doğruluk':>9s} {'eğitim sn':>10s} {'transform/sn':>14s} "
+          f"{'paralel/sn':>14s} {'vektörizer KB':>14s}")
+    
+    for featurizer in ("tfidf", "hashing"):
+        r = evaluate(featurizer, X_train, X_test, y_train, y_test, args.n_jobs)
+        print(f"{r['featurizer']:10s} {r['accuracy']:9.4f} {r['train_seconds']:10.2f} "
+              f"{r['transform_per_sec']:14,.0f} {r['parallel_per_sec']:14,.0f} {r['vectorizer_kb']:14,.1f}")
+
+if __name__ == "__main__":
+    main()
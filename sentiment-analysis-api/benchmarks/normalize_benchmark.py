@@ -0,0 +1,88 @@
+"""
+Metin normalizasyonu benchmark'ı
+
+Eski preprocess_text (iki derlenmemiş re.sub) ile yeni normalize_text ve
+normalize_batch fonksiyonlarını büyük bir sentetik korpus üzerinde karşılaştırır.
+
+Kullanım:
+    python benchmarks/normalize_benchmark.py --size 200000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.sentiment_model import SentimentAnalyzer
+from app.text_normalizer import normalize_text, normalize_batch
+
+def legacy_preprocess_text(text):
+    """Değişiklik öncesi ön işleme (karşılaştırma için)"""
+    if isinstance(text, str):
+        text = text.lower()
+        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        text = re.sub(r'\s+', ' ', text).strip()
+        return text
+    return ""
+
+def build_corpus(size, seed=42):
+    """Örnek veriden büyük harf, noktalama ve tekrar içeren sentetik korpus üret"""
+    rng = random.Random(seed)
+    texts, _ = SentimentAnalyzer().create_sample_data()
+    variations = [str.upper, str.title, lambda t: t, lambda t: t + "!!!", lambda t: f"  {t}   (5/5) "]
+    corpus = []
+    for _ in range(size):
+        parts = rng.sample(texts, 3)
+        corpus.append(" ".join(rng.choice(variations)(p) for p in parts))
+    return corpus
+
+def timed(fn, corpus, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(corpus)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def vocabulary(texts):
+    return {token for text in texts for token in text.split()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalizasyon benchmark'ı")
+    parser.add_argument("--size", type=int, default=200000, help="Korpus boyutu (metin sayısı)")
+    parser.add_argument("--repeat", type=int, default=3, help="Tekrar sayısı (en iyi süre raporlanır)")
+    args = parser.parse_args()
+    
+    corpus = build_corpus(args.size)
+    print(f"Korpus: {len(corpus)} metin, {sum(map(len, corpus)) / 1e6:.1f}M karakter")
+    print("-" * 60)
+    
+    candidates = [
+        ("legacy re.sub (metin başına)", lambda c: [legacy_preprocess_text(t) for t in c]),
+        ("normalize_text (metin başına)", lambda c: [normalize_text(t) for t in c]),
+        ("normalize_batch (toplu)", normalize_batch),
+    ]
+    
+    baseline = None
+    outputs = {}
+    for name, fn in candidates:
+        seconds, result = timed(fn, corpus, args.repeat)
+        outputs[name] = result
+        baseline = baseline or seconds
+        print(f"{name:32s} {seconds:7.3f} sn  {len(corpus) / seconds:12,.0f} metin/sn  x{baseline / seconds:.2f}")
+    
+    print("-" * 60)
+    assert outputs["normalize_text (metin başına)"] == outputs["normalize_batch (toplu)"]
+    legacy_vocab = vocabulary(outputs["legacy re.sub (metin başına)"])
+    new_vocab = vocabulary(outputs["normalize_batch (toplu)"])
+    print(f"Sözlük boyutu: legacy={len(legacy_vocab)}  yeni={len(new_vocab)}")
+    sample = corpus[0]
+    print(f"Örnek girdi : {sample}")
+    print(f"legacy      : {legacy_preprocess_text(sample)}")
+    print(f"yeni        : {normalize_text(sample)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Tek metin skorlama gecikmesi benchmark'ı
+
+sklearn yolu (vectorizer.transform + model.predict_proba) ile doğrudan
+LinearScorer yolunu karşılaştırır ve çıktıların aynı olduğunu doğrular.
+
+Kullanım:
+    python benchmarks/scorer_latency.py --size 2000 --featurizer tfidf
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.sentiment_model import SentimentAnalyzer
+from featurizer_comparison import build_corpus
+
+def per_text_latency(fn, texts):
+    start = time.perf_counter()
+    results = [fn(text) for text in texts]
+    return (time.perf_counter() - start) / len(texts), np.vstack(results)
+
+def main():
+    parser = argparse.ArgumentParser(description="Skorlayıcı gecikme benchmark'ı")
+    parser.add_argument("--size", type=int, default=2000, help="Ölçülen metin sayısı")
+    parser.add_argument("--featurizer", default="tfidf", choices=["tfidf", "hashing"])
+    args = parser.parse_args()
+    
+    corpus, labels = build_corpus(args.size * 2)
+    analyzer = SentimentAnalyzer(featurizer=args.featurizer)
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer.train(corpus[:args.size], labels[:args.size])
+    
+    processed = analyzer.preprocess_batch(corpus[args.size:])
+    sklearn_fn = lambda t: analyzer.model.predict_proba(analyzer.vectorizer.transform([t]))
+    sklearn_time, sklearn_proba = per_text_latency(sklearn_fn, processed)
+    fast_time, fast_proba = per_text_latency(analyzer.scorer.predict_proba_one, processed)
+    
+    print(f"Featurizer: {args.featurizer}, {len(processed)} metin")
+    print("-" * 60)
+    print(f"{'sklearn predict_proba':28s} {sklearn_time * 1e6:9.1f} µs/metin")
+    print(f"{'LinearScorer':28s} {fast_time * 1e6:9.1f} µs/metin  x{sklearn_time / fast_time:.1f}")
+    print("-" * 60)
+    print(f"Maksimum olasılık farkı: {np.abs(sklearn_proba - fast_proba).max():.2e}")
+    batch_diff = np.abs(analyzer.model.predict_proba(analyzer.vectorizer.transform(processed))
+                        - analyzer.scorer.predict_proba(processed)).max()
+    print(f"Toplu skorlama farkı   : {batch_diff:.2e}")
+
+if __name__ == "__main__":
+    main()
@@ -111,6 +111,72 @@ def test_batch_prediction():
     except Exception as e:
         print(f"Hata: {e}")
 
+def test_stream_prediction():
+    """NDJSON akışlı tahmini test et"""
+    print("=== Akışlı Tahmin Testi ===")
+    
+    lines = [
+        json.dumps("Bu film harika!"),
+        json.dumps({"text": "Kötü bir deneyim.", "id": "yorum-2"}),
+        "",
+        json.dumps({"text": ""}),
+        "geçersiz json",
+        json.dumps("Normal bir gün.")
+    ]
+    
+    def body():
+        for line in lines:
+            yield (line + "\n").encode("utf-8")
+    
+    try:
+        response = requests.post(
+            f"{BASE_URL}/predict/stream",
+            data=body(),
+            headers={"Content-Type": "application/x-ndjson"},
+            stream=True
+        )
+        print(f"Status Code: {response.status_code}")
+        results = [json.loads(line) for line in response.iter_lines() if line]
+        for item in results:
+            print(f"  Satır {item['line']}: {item['status']} {item.get('sentiment', item.get('error'))}")
+        print()
+        statuses = [item["status"] for item in results]
+        # Boş satır da dahil her girdi satırı için bir çıktı satırı
+        return (response.status_code == 200
+                and [item["line"] for item in results] == list(range(1, len(lines) + 1))
+                and statuses == ["ok", "ok", "error", "error", "error", "ok"]
+                and results[2]["error"] == "empty line")
+    except Exception as e:
+        print(f"Hata: {e}")
+        return False
+
+def test_prediction_cache():
+    """Tekrarlı metinlerin önbellekten karşılandığını test et"""
+    print("=== Tahmin Önbelleği Testi ===")
+    
+    # Yalnızca büyük/küçük harf ve noktalama farkı olan metinler
+    texts = [
+        "Bu ürün gerçekten kaliteli.",
+        "BU ÜRÜN GERÇEKTEN KALİTELİ!!!",
+        "bu ürün, gerçekten kaliteli"
+    ]
+    
+    try:
+        before = requests.get(f"{BASE_URL}/model/info").json()["cache"]
+        responses = [requests.post(f"{BASE_URL}/predict", json={"text": text}).json() for text in texts]
+        after = requests.get(f"{BASE_URL}/model/info").json()["cache"]
+        
+        hits = after["hits"] - before["hits"]
+        print(f"Yeni önbellek isabeti: {hits}")
+        print(f"Toplam isabet oranı: {after['hit_rate']:.2f}")
+        same = len({(r["sentiment"], r["confidence"]) for r in responses}) == 1
+        print(f"Aynı sonuç: {same}")
+        print()
+        return same and hits >= len(texts) - 1
+    except Exception as e:
+        print(f"Hata: {e}")
+        return False
+
 def test_error_cases():
     """Hata durumlarını test et"""
     print("=== Hata Durumları Testi ===")
@@ -148,8 +214,17 @@ def test_retrain():
         response = requests.post(f"{BASE_URL}/retrain")
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.json()}")
+        
+        # Arka plan işinin bitmesini bekle
+        job_id = response.json()["job_id"]
+        for _ in range(60):
+            job = requests.get(f"{BASE_URL}/retrain/jobs/{job_id}").json()
+            if job["status"] not in ("queued", "running"):
+                break
+            time.sleep(1)
+        print(f"İş durumu: {job['status']} (versiyon: {job['model_version']}, nesil: {job['generation']})")
         print()
-        return response.status_code == 200
+        return response.status_code == 200 and job["status"] == "succeeded"
     except Exception as e:
         print(f"Hata: {e}")
         return False
@@ -171,6 +246,8 @@ def main():
     # Tahmin testleri
     test_single_prediction()
     test_batch_prediction()
+    test_stream_prediction()
+    test_prediction_cache()
     
     # Hata durumları
     test_error_cases()
@@ -181,4 +258,4 @@ def main():
     print("✅ Tüm testler tamamlandı!")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,42 @@
+import pandas as pd
+
+from app.corpus_training import iter_corpus
+
+def read_all(path, chunk_size=3):
+    stats = {}
+    texts, labels = [], []
+    for chunk_texts, chunk_labels in iter_corpus(path, chunk_size, stats=stats):
+        texts.extend(chunk_texts)
+        labels.extend(chunk_labels)
+    return texts, labels, stats["skipped"]
+
+def test_jsonl_bad_lines_are_counted_and_skipped(tmp_path):
+    """Bozuk JSON, eksik alan ve geçersiz etiketli satırlar atlanır ve sayılır"""
+    path = tmp_path / "corpus.jsonl"
+    path.write_text("\n".join([
+        '{"text": "harika bir ürün", "label": "pozitif"}',
+        '{"text": "yarım kalmış',
+        '{"text": "etiketsiz"}',
+        '',
+        '["liste"]',
+        '{"text": "ne idüğü belirsiz", "label": "bilinmiyor"}',
+        '{"text": null, "label": 1}',
+        '{"text": "berbat", "label": 0}'
+    ]), encoding="utf-8")
+    
+    texts, labels, skipped = read_all(str(path))
+    assert texts == ["harika bir ürün", "berbat"]
+    assert labels == [1, 0]
+    assert skipped == 5
+
+def test_csv_bad_rows_are_counted_and_skipped(tmp_path):
+    path = tmp_path / "corpus.csv"
+    pd.DataFrame({
+        "text": ["güzel", "kötü", None, "fena değil", "idare eder"],
+        "label": ["pos", "bilinmiyor", 1, None, 2]
+    }).to_csv(path, index=False)
+    
+    texts, labels, skipped = read_all(str(path))
+    assert texts == ["güzel", "idare eder"]
+    assert labels == [1, 2]
+    assert skipped == 3
@@ -59,6 +59,14 @@ curl -X POST "$BASE_URL/predict/batch" \
      }'
 echo -e "\n\n"
 
+# 7.1. Akışlı toplu tahmin (NDJSON)
+echo "7.1. Akışlı Toplu Tahmin:"
+printf '%s\n' '"Bu film harika!"' '' '{"text": "Kötü bir deneyim.", "id": 2}' '{"text": ""}' | \
+curl -X POST "$BASE_URL/predict/stream" \
+     -H "Content-Type: application/x-ndjson" \
+     --data-binary @-
+echo -e "\n\n"
+
 # 8. Hata testi - Boş metin
 echo "8. Hata Testi (Boş Metin):"
 curl -X POST "$BASE_URL/predict" \
@@ -68,7 +76,12 @@ echo -e "\n\n"
 
 # 9. Model yeniden eğitme
 echo "9. Model Yeniden Eğitme:"
-curl -X POST "$BASE_URL/retrain" -H "Content-Type: application/json"
+curl -X POST "$BASE_URL/retrain?wait=true" -H "Content-Type: application/json"
+echo -e "\n\n"
+
+# 10. Yeniden eğitme işleri
+echo "10. Yeniden Eğitme İşleri:"
+curl -X GET "$BASE_URL/retrain/jobs" -H "Content-Type: application/json"
 echo -e "\n\n"
 
 echo "✅ Tüm testler tamamlandı!" 
\ No newline at end of file
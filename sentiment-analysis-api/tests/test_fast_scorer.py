@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+from app.fast_scorer import LinearScorer
+from app.model_store import ModelStore
+from app.sentiment_model import SentimentAnalyzer
+
+EXTRA_TEXTS = [
+    "Bu ürün harika ama kargo berbat",
+    "hiç görülmemiş kelimelerden oluşan cümle",
+    "harika harika harika",
+    "",
+    "!!!"
+]
+
+MODELS = {
+    "binary": lambda: LogisticRegression(random_state=42),
+    "ovr": lambda: SGDClassifier(loss="log_loss", random_state=42),
+    "multinomial": lambda: LogisticRegression(random_state=42)
+}
+
+def fit_analyzer(featurizer, kind):
+    """Örnek veride vektörleştiriciyi ve verilen türde modeli eğit"""
+    analyzer = SentimentAnalyzer(featurizer=featurizer, n_features=2 ** 12)
+    texts, labels = analyzer.create_sample_data()
+    if kind == "binary":
+        texts, labels = zip(*[(t, l) for t, l in zip(texts, labels) if l != 2])
+    
+    processed = analyzer.preprocess_batch(list(texts))
+    X = analyzer.vectorizer.fit_transform(processed)
+    analyzer.model = MODELS[kind]().fit(X, list(labels))
+    analyzer.is_trained = True
+    return analyzer, processed + analyzer.preprocess_batch(EXTRA_TEXTS)
+
+def assert_matches_sklearn(analyzer, scorer, texts):
+    expected = analyzer.model.predict_proba(analyzer.vectorizer.transform(texts))
+    assert np.allclose(scorer.predict_proba(texts), expected)
+    assert np.allclose(np.stack([scorer.predict_proba_one(t) for t in texts]), expected)
+
+@pytest.mark.parametrize("featurizer", ["tfidf", "hashing"])
+@pytest.mark.parametrize("kind", ["binary", "ovr", "multinomial"])
+def test_linear_scorer_matches_predict_proba(featurizer, kind):
+    """Dışa aktarılan skorlayıcı sklearn predict_proba ile aynı olasılıkları üretir"""
+    analyzer, texts = fit_analyzer(featurizer, kind)
+    scorer = LinearScorer.from_analyzer(analyzer)
+    
+    assert scorer.mode == kind
+    assert_matches_sklearn(analyzer, scorer, texts)
+
+@pytest.mark.parametrize("featurizer", ["tfidf", "hashing"])
+@pytest.mark.parametrize("kind", ["binary", "ovr", "multinomial"])
+@pytest.mark.parametrize("mmap_mode, index", [(None, "dict"), ("r", "sorted")])
+def test_store_loaded_scorer_matches_predict_proba(tmp_path, featurizer, kind, mmap_mode, index):
+    """Depodan açılan skorlayıcı hem sözlük hem sıralı dizi aramasıyla aynı sonucu verir"""
+    analyzer, texts = fit_analyzer(featurizer, kind)
+    store = ModelStore(str(tmp_path))
+    store.publish(LinearScorer.from_analyzer(analyzer), {})
+    scorer, _ = store.load(mmap_mode=mmap_mode)
+    
+    if featurizer == "tfidf":
+        assert (scorer._token_index is None) == (index == "sorted")
+    assert_matches_sklearn(analyzer, scorer, texts)
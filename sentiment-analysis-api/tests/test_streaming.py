@@ -0,0 +1,79 @@
+import asyncio
+import importlib
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.streaming import OversizedLine, iter_ndjson_lines
+
+LEGACY_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sentiment_model.pkl")
+
+LINES = [
+    '"Bu ürün harika"',
+    '',
+    '{"text": "berbat bir deneyim", "id": 7}',
+    'geçersiz json',
+    '   ',
+    '{"id": 3}',
+    '"çok kötü"'
+]
+
+def split_lines(body, chunk_size, max_line_bytes=1024):
+    """Gövdeyi chunk_size baytlık parçalar halinde iter_ndjson_lines'a ver"""
+    async def chunks():
+        for i in range(0, len(body), chunk_size):
+            yield body[i:i + chunk_size]
+    
+    async def collect():
+        return [line async for line in iter_ndjson_lines(chunks(), max_line_bytes=max_line_bytes)]
+    return asyncio.run(collect())
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 4096])
+def test_iter_ndjson_lines_independent_of_chunking(chunk_size):
+    """Satırlar parça sınırlarından bağımsız olarak aynı bölünür"""
+    body = "\n".join(LINES).encode("utf-8")
+    assert split_lines(body, chunk_size) == body.split(b"\n")
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 100, 10000])
+def test_iter_ndjson_lines_skips_oversized_line(chunk_size):
+    """Sınırı aşan satır tek bir OversizedLine olarak bildirilir, sonraki satırlar etkilenmez"""
+    body = '"kısa"\n'.encode("utf-8") + b"x" * 5000 + b'\n"sonraki"'
+    lines = split_lines(body, chunk_size, max_line_bytes=100)
+    
+    assert len(lines) == 3
+    assert lines[0] == '"kısa"'.encode("utf-8")
+    assert isinstance(lines[1], OversizedLine)
+    assert lines[2] == b'"sonraki"'
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """Geçici model deposuyla yeniden import edilmiş app.main"""
+    monkeypatch.setenv("MODEL_STORE_DIR", str(tmp_path / "store"))
+    monkeypatch.setenv("LEGACY_MODEL_PATH", LEGACY_MODEL_PATH)
+    # Küçük parça boyutu: skorlama parçaları satır sınırlarının ortasına düşsün
+    monkeypatch.setenv("STREAM_CHUNK_SIZE", "2")
+    from app import main
+    return importlib.reload(main)
+
+def test_stream_reports_every_line_in_order(api):
+    """Boş ve hatalı satırlar arasında da her girdi satırı için sırayla bir sonuç döner"""
+    body = "\n".join(LINES).encode("utf-8")
+    
+    def chunks():
+        for i in range(0, len(body), 5):
+            yield body[i:i + 5]
+    
+    with TestClient(api.app) as client:
+        response = client.post("/predict/stream", content=chunks(),
+                               headers={"Content-Type": "application/x-ndjson"})
+    
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["line"] for r in results] == list(range(1, len(LINES) + 1))
+    assert [r["status"] for r in results] == ["ok", "error", "ok", "error", "error", "error", "ok"]
+    assert results[1]["error"] == results[4]["error"] == "empty line"
+    assert results[2]["id"] == 7
+    assert results[0]["sentiment"] == "pozitif"
+    assert results[6]["sentiment"] == "negatif"
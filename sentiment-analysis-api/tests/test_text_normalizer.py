@@ -0,0 +1,47 @@
+import unicodedata
+
+import pytest
+
+from app.text_normalizer import RECORD_SEPARATOR, normalize_batch, normalize_text
+
+TEXTS = [
+    "Bu ürün GERÇEKTEN çok güzel!",
+    "IŞIK ve İSTANBUL",
+    "Ankara'da hava güzeldi, ama yağmur yağdı...",
+    unicodedata.normalize("NFD", "Güzel, şık ve çok iyi"),
+    "̈başta kalan işaret",
+    "iyi,kötü;nötr",
+    "   ",
+    "",
+    f"ayırıcı{RECORD_SEPARATOR}içeren metin",
+    None,
+    123,
+    "😀 emoji ve 42 sayı"
+]
+
+@pytest.mark.parametrize("text, expected", [
+    ("güzel", "güzel"),
+    (unicodedata.normalize("NFD", "güzel"), "güzel"),
+    ("GÜZEL", "güzel"),
+    ("İ", "i"),
+    ("I", "ı"),
+    ("İSTANBUL", "istanbul"),
+    ("IŞIK", "ışık"),
+    ("Ankara'da", "ankarada"),
+    ("iyi,kötü", "iyi kötü")
+])
+def test_normalize_text_turkish_cases(text, expected):
+    """Türkçe büyük/küçük harf dönüşümü ve ayrışık harfler doğru normalize edilir"""
+    assert normalize_text(text) == expected
+
+def test_normalize_batch_matches_normalize_text():
+    """Toplu normalizasyon her metin için normalize_text ile birebir aynıdır"""
+    assert normalize_batch(TEXTS) == [normalize_text(text) for text in TEXTS]
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_normalize_batch_single_text(text):
+    """Tek elemanlı listede de sonuç normalize_text ile aynıdır"""
+    assert normalize_batch([text]) == [normalize_text(text)]
+
+def test_normalize_batch_empty():
+    assert normalize_batch([]) == []